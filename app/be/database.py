@@ -1,25 +1,123 @@
 """Database configuration and session management for B2Bmarket backend."""
+import functools
+import inspect
+import time
 from contextlib import contextmanager
 
 from config import get_settings
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.orm import ORMExecuteState, Session, declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from be.utils.deadline import enable_request_deadlines
+from be.utils.metrics import metrics
 
 Base = declarative_base()
+settings = get_settings()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time, timeouts and how long connections are held in `metrics`."""
+
+    # Keep pool logging under the "sqlalchemy" logger hierarchy (WARN unless echo_pool)
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+            record.info["checked_out_at"] = time.perf_counter()
+            return record
+        except exc.TimeoutError:
+            metrics.incr("db.pool.timeouts")
+            raise
+        finally:
+            metrics.observe("db.pool.wait", time.perf_counter() - start)
+
+    def _do_return_conn(self, record) -> None:
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.observe("db.pool.hold", time.perf_counter() - checked_out_at)
+        super()._do_return_conn(record)
+
+
+def pool_status(pool) -> dict:
+    """Point-in-time pool occupancy for the metrics endpoint."""
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "timeout": pool.timeout(),
+    }
+
 
 engine = create_engine(
-    get_settings().DATABASE_URL,
-    pool_size=5,
-    max_overflow=5,
-    pool_pre_ping=True,
-    echo=get_settings().DEBUG,
+    settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    echo=settings.DEBUG,
 )
 
+
+def enable_sqlite_foreign_keys(engine) -> None:
+    """SQLite ignores FOREIGN KEY / ON DELETE CASCADE unless enabled on every connection."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+enable_sqlite_foreign_keys(engine)
+enable_request_deadlines(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+class UnexpectedLazyLoad(RuntimeError):
+    """A relationship was lazy-loaded while the lazy-load guard is installed."""
+
+
+def _raise_on_lazy_load(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        return
+    state = orm_execute_state.lazy_loaded_from
+    if state is not None:
+        raise UnexpectedLazyLoad(
+            f"Unexpected lazy load from {state.class_.__name__}; "
+            "add joinedload/selectinload/noload to the route's query"
+        )
+
+
+def install_lazy_load_guard() -> None:
+    """Fail every relationship lazy load, so each route must choose its loader strategy explicitly."""
+    if not event.contains(Session, "do_orm_execute", _raise_on_lazy_load):
+        event.listen(Session, "do_orm_execute", _raise_on_lazy_load)
+
+
+if settings.ORM_LAZY_LOAD_GUARD:
+    install_lazy_load_guard()
+
+
 def get_db():
-    """FastAPI dependency for database sessions."""
+    """
+    FastAPI dependency for database sessions.
+
+    Creating the session is free: it checks out a pooled connection on its first statement only, so
+    requests rejected by validation or auth, or answered from a cache, never touch the pool. Routes
+    built with ReleaseSessionRoute give the connection back as soon as the endpoint returns.
+    """
     db = SessionLocal()
     try:
         yield db
@@ -30,6 +128,50 @@ def get_db():
         db.close()
 
 
+def _close_sessions(arguments: dict) -> None:
+    for value in arguments.values():
+        if isinstance(value, Session):
+            value.close()
+
+
+def release_sessions(endpoint):
+    """
+    Wrap a route endpoint so the sessions passed to it are closed as soon as it returns.
+
+    Dependency teardown (get_db's close) runs only after the response is serialized, and for sync
+    dependencies after waiting for a free threadpool thread; meanwhile the connection stays checked
+    out. Closing right away returns it after the endpoint's last statement. Closing ends the
+    transaction (uncommitted work is rolled back, as get_db's close would) but keeps loaded ORM
+    attributes, so returned objects still serialize; get_db's own close is then a no-op.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def release_after_async(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _close_sessions(kwargs)
+
+        return release_after_async
+
+    @functools.wraps(endpoint)
+    def release_after(*args, **kwargs):
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            _close_sessions(kwargs)
+
+    return release_after
+
+
+class ReleaseSessionRoute(APIRoute):
+    """APIRoute whose endpoint releases its DB session (connection) as soon as it returns."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, release_sessions(endpoint), **kwargs)
+
+
 @contextmanager
 def get_db_session() -> Session:
     """Context manager for database sessions (e.g. crons, scripts)."""
@@ -6,6 +6,10 @@ from be.database import get_db
 from be.models.user import User
 from be.utils.jwt import decode_token_without_verification, verify_token
 
+# Request scope key under which POST /api/batch hands its sub-requests the user (or auth error)
+# it resolved once for the whole batch
+BATCH_USER_SCOPE_KEY = "b2bmarket.batch_user"
+
 
 class CurrentUser:
     """Authenticated user from JWT. Vendor is resolved by matching user email to vendor email."""
@@ -20,6 +24,11 @@ def get_current_user(
     db: Session = Depends(get_db),
 ) -> CurrentUser:
     """Extract and validate JWT from Authorization header; return current user."""
+    resolved = request.scope.get(BATCH_USER_SCOPE_KEY)
+    if isinstance(resolved, CurrentUser):
+        return resolved
+    if isinstance(resolved, HTTPException):
+        raise HTTPException(status_code=resolved.status_code, detail=resolved.detail)
     auth = request.headers.get("Authorization")
     if not auth or not auth.startswith("Bearer "):
         raise HTTPException(
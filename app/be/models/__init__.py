@@ -2,3 +2,6 @@
 from be.models.vendor import Vendor  # noqa: F401
 from be.models.user import User  # noqa: F401
 from be.models.product import Product  # noqa: F401
+from be.models.product_tombstone import ProductTombstone  # noqa: F401
+from be.models.catalog_change import CatalogChange  # noqa: F401
+from be.models.idempotency_key import IdempotencyKey  # noqa: F401
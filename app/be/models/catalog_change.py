@@ -0,0 +1,29 @@
+"""Transactional outbox of catalog (product / vendor) changes."""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from be.database import Base
+from be.models.product import utcnow
+
+
+class CatalogChange(Base):
+    """
+    One product or vendor mutation, written in the same transaction as the mutation itself.
+
+    The id is the change feed offset: GET /api/changes/stream resumes after it.
+    """
+
+    __tablename__ = "catalog_changes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)  # "product" | "vendor"
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    action: Mapped[str] = mapped_column(String(20), nullable=False)  # "created" | "updated" | "deleted"
+    version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # row version after the change
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CatalogChange(id={self.id}, {self.entity}:{self.entity_id} {self.action})>"
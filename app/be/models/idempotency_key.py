@@ -0,0 +1,36 @@
+"""Stored responses of POST requests made with an Idempotency-Key."""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from be.database import Base
+from be.models.product import utcnow
+
+
+class IdempotencyKey(Base):
+    """
+    The response to the first request with a given Idempotency-Key, written in the same transaction
+    as the mutation it describes: a retry replays it instead of running the handler again.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # A concurrent duplicate fails on this constraint and replays the winner's response
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+        # Purging expired keys
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    scope: Mapped[str] = mapped_column(String(100), nullable=False)  # endpoint and caller, e.g. "products:42"
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)  # hash of the request body
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)  # response JSON
+    etag: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey(scope={self.scope!r}, key={self.key!r}, status={self.status_code})>"
@@ -1,18 +1,30 @@
 """Product model for B2B marketplace."""
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Numeric, String, Text, func, text
+from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
 
 from be.database import Base
 
 
+def utcnow() -> datetime:
+    """App-clock UTC timestamp for change tracking columns."""
+    return datetime.now(timezone.utc)
+
+
 class Product(Base):
     """Product offered by a vendor in the B2B marketplace."""
 
     __tablename__ = "products"
+    # Newest-first listings, overall and per vendor (migration 007)
+    __table_args__ = (
+        Index("ix_products_vendor_id_created_at_id", "vendor_id", text("created_at DESC"), text("id DESC")),
+        Index("ix_products_created_at_id", text("created_at DESC"), text("id DESC")),
+        # Delta sync: GET /api/products/changes (migration 010)
+        Index("ix_products_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
@@ -20,13 +32,24 @@ class Product(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     vendor_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("vendors.id", ondelete="CASCADE"), nullable=False, index=True
+        Integer, ForeignKey("vendors.id", ondelete="CASCADE"), nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # Bumped by every UPDATE; compared against If-Match and used as the ETag (migration 009)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default=text("1"))
+    # Set on every INSERT/UPDATE from the app clock rather than the database's now(): the delta
+    # sync cursor binds it back as a parameter, and only then is it stored in the same format
+    # (full microseconds) on every backend, so (updated_at, id) keyset comparisons are exact
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow, server_default=func.now(), nullable=False
+    )
 
-    vendor = relationship("Vendor", backref="products", lazy="joined")
+    # Lazy by default; routes that need the vendor ask for it (joinedload/noload) per query
+    # passive_deletes: deleting a vendor leaves its products to the FK's ON DELETE CASCADE
+    # instead of loading them into the session first
+    vendor = relationship("Vendor", backref=backref("products", passive_deletes=True), lazy="select")
 
     def __repr__(self) -> str:
         return f"<Product(id={self.id}, name={self.name!r}, vendor_id={self.vendor_id})>"
@@ -0,0 +1,24 @@
+"""Tombstones of deleted products, for delta sync."""
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from be.database import Base
+from be.models.product import utcnow
+
+
+class ProductTombstone(Base):
+    """A deleted product, reported by GET /api/products/changes so mirrors can delete it too."""
+
+    __tablename__ = "product_tombstones"
+    __table_args__ = (Index("ix_product_tombstones_deleted_at_product_id", "deleted_at", "product_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # No foreign keys: the product (and possibly its vendor) no longer exist
+    product_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    vendor_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ProductTombstone(product_id={self.product_id}, deleted_at={self.deleted_at})>"
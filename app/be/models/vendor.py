@@ -2,16 +2,23 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy import DateTime, Index, Integer, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from be.database import Base
+from be.models.product import utcnow
 
 
 class Vendor(Base):
     """Vendor/seller in the B2B marketplace."""
 
     __tablename__ = "vendors"
+    # Newest-first listing (migration 007)
+    __table_args__ = (
+        Index("ix_vendors_created_at_id", text("created_at DESC"), text("id DESC")),
+        # Delta sync reports a changed vendor's products again (migration 014)
+        Index("ix_vendors_updated_at", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
@@ -22,6 +29,14 @@ class Vendor(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # Bumped by every UPDATE; compared against If-Match and used as the ETag (migration 009)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default=text("1"))
+    # App clock, like Product.updated_at: delta sync reports the vendor's products again when it changes
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow, server_default=func.now(), nullable=False
+    )
+    # Set while DELETE /api/vendors/{id}?async=true runs, so a stopped job is resumed (migration 013)
+    deleting_since: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     def __repr__(self) -> str:
         return f"<Vendor(id={self.id}, name={self.name!r})>"
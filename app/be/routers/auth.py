@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from config import get_settings
-from be.database import get_db
+from be.database import ReleaseSessionRoute, get_db
 from be.models.user import User
 from be.models.vendor import Vendor
 from be.schemas.auth import (
@@ -17,12 +17,12 @@ from be.schemas.auth import (
     VerifyTokenRequest,
     VerifyTokenResponse,
 )
+from be.utils.invalidation import invalidation_bus
 from be.utils.jwt import create_access_token, create_refresh_token, verify_token, decode_token_without_verification
 from be.utils.password import verify_password, generate_salt
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=ReleaseSessionRoute)
 log = logging.getLogger(__name__)
-settings = get_settings()
 
 
 @router.post("/login", response_model=LoginResponse, status_code=status.HTTP_200_OK)
@@ -49,7 +49,7 @@ def login(body: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
             )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Database error: {str(db_error)}" if settings.DEBUG else "Database connection error",
+                detail=f"Database error: {str(db_error)}" if get_settings().DEBUG else "Database connection error",
             )
 
         if not user:
@@ -100,6 +100,8 @@ def login(body: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
             db.add(user)
             db.commit()
             db.refresh(user)
+            # Tokens signed with the old salt are now invalid: every worker drops what it holds for the user
+            invalidation_bus.publish("user", [user.id])
         except Exception as db_update_error:
             log.error(f"❌ Database update error: {type(db_update_error).__name__}: {str(db_update_error)}", exc_info=True)
             db.rollback()
@@ -148,7 +150,7 @@ def login(body: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Login error: {str(e)}" if settings.DEBUG else "An error occurred during login",
+            detail=f"Login error: {str(e)}" if get_settings().DEBUG else "An error occurred during login",
         )
 
 
@@ -0,0 +1,219 @@
+"""Batch endpoint: several API calls in one round trip."""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.types import Message, Scope
+
+from be.database import ReleaseSessionRoute, get_db
+from be.dependencies import BATCH_USER_SCOPE_KEY, get_current_user
+from be.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest
+from be.utils.admission import ADMISSION_SCOPE_KEY
+from be.utils.deadline import DEADLINE_SCOPE_KEY, DeadlineExceeded, scope_deadline
+from be.utils.fast_json import RawJSONResponse, dump
+from be.utils.metrics import metrics
+from config import get_settings
+
+router = APIRouter(prefix="/batch", tags=["Batch"], route_class=ReleaseSessionRoute)
+log = logging.getLogger(__name__)
+
+# Not dispatchable from a batch: batches themselves and long-lived streams
+EXCLUDED_PREFIXES = ("/api/batch", "/api/changes/stream")
+
+# Sub-requests that only read, and so may run concurrently
+READ_METHODS = ("GET", "HEAD")
+
+# Batch request headers every sub-request inherits (its own headers win, except Authorization)
+INHERITED_HEADERS = ("accept-language", "user-agent", "x-forwarded-for")
+
+# Response headers that describe the sub-response's transport rather than its content
+_DROPPED_RESPONSE_HEADERS = ("content-length", "content-type")
+
+
+def _check_path(sub: BatchSubRequest) -> None:
+    if not sub.path.startswith("/api/") or sub.path.startswith(EXCLUDED_PREFIXES):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Path not allowed in a batch: {sub.path}",
+        )
+    if "authorization" in (name.lower() for name in sub.headers):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sub-requests use the batch's Authorization header",
+        )
+
+
+def _resolve_user(request: Request, db: Session) -> Any:
+    """The batch's user, or the HTTPException its credentials raise (raised again by each sub-request that needs auth)."""
+    try:
+        return get_current_user(request, db)
+    except HTTPException as e:
+        return e
+    finally:
+        # Sub-requests open their own sessions: don't hold this one's connection while they run
+        db.close()
+
+
+def _sub_scope(request: Request, sub: BatchSubRequest, body: bytes, user: Any) -> Scope:
+    parent = request.scope
+    url = urlsplit(sub.path)
+    headers: List[Tuple[bytes, bytes]] = [
+        (name, value) for name, value in parent["headers"] if name.decode("latin-1") in INHERITED_HEADERS
+    ]
+    own = {name.lower() for name in sub.headers}
+    headers = [(name, value) for name, value in headers if name.decode("latin-1") not in own]
+    headers += [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in sub.headers.items()]
+    auth = request.headers.get("authorization")
+    if auth is not None:
+        headers.append((b"authorization", auth.encode("latin-1")))
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        key: parent[key]
+        for key in ("asgi", "http_version", "scheme", "server", "client", "root_path", "app", DEADLINE_SCOPE_KEY)
+        if key in parent
+    }
+    if "state" in parent:
+        # Like the server does per request: lifespan state, but no sharing of request state
+        scope["state"] = dict(parent["state"])
+    scope.update(
+        type="http",
+        method=sub.method,
+        path=url.path,
+        raw_path=url.path.encode(),
+        query_string=url.query.encode(),
+        headers=headers,
+    )
+    if "starlette.exception_handlers" in parent:
+        scope["starlette.exception_handlers"] = parent["starlette.exception_handlers"]
+    if user is not None:
+        scope[BATCH_USER_SCOPE_KEY] = user
+    return scope
+
+
+def _encode_response(sub_id: str, status_code: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> bytes:
+    """One sub-response as JSON; JSON bodies are embedded as they are, without a parse / dump round trip."""
+    content_type = ""
+    header_map: Dict[str, str] = {}
+    for name, value in headers:
+        name, value = name.decode("latin-1"), value.decode("latin-1")
+        if name == "content-type":
+            content_type = value
+        if name not in _DROPPED_RESPONSE_HEADERS:
+            header_map[name] = value
+    if not body:
+        encoded_body = b"null"
+    elif content_type.startswith("application/json"):
+        encoded_body = body
+    else:
+        encoded_body = dump(body.decode("utf-8", errors="replace"))
+    return (
+        b'{"id":' + dump(sub_id) + b',"status":' + str(status_code).encode()
+        + b',"headers":' + dump(header_map) + b',"body":' + encoded_body + b"}"
+    )
+
+
+def _error_response(sub_id: str, status_code: int, error: Dict[str, Any]) -> bytes:
+    return _encode_response(sub_id, status_code, [(b"content-type", b"application/json")], dump(error))
+
+
+async def _dispatch(request: Request, sub: BatchSubRequest, sub_id: str, user: Any) -> bytes:
+    """
+    Run one sub-request through the app's routes and encode its response. The middleware stack is
+    skipped, so the sub-request is admitted here by its own route class, within the batch's deadline.
+    """
+    body = dump(sub.body) if sub.body is not None else b""
+    scope = _sub_scope(request, sub, body, user)
+    request_sent = False
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    headers: List[Tuple[bytes, bytes]] = []
+    chunks: List[bytes] = []
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status_code, headers
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    with scope_deadline(scope) as deadline:
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None and remaining <= 0:
+            # Out of time before it started: don't queue or run it
+            metrics.incr("deadline.exceeded")
+            exceeded = DeadlineExceeded()
+            return _error_response(sub_id, exceeded.status_code, {"detail": exceeded.detail})
+        admission = request.scope.get(ADMISSION_SCOPE_KEY)
+        try:
+            if admission is not None:
+                await admission.admit(scope, receive, send, request.app.router)
+            else:
+                await request.app.router(scope, receive, send)
+        except Exception as exc:
+            log.error(f"❌ Error in batch on {sub.method} {sub.path}: {type(exc).__name__}: {str(exc)}", exc_info=True)
+            error = {
+                "detail": "Internal server error",
+                "error": str(exc) if get_settings().DEBUG else "An error occurred",
+            }
+            return _error_response(sub_id, status.HTTP_500_INTERNAL_SERVER_ERROR, error)
+    return _encode_response(sub_id, status_code, headers, b"".join(chunks))
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(body: BatchRequest, request: Request, db: Session = Depends(get_db)) -> RawJSONResponse:
+    """
+    Run several API calls in one round trip, e.g. everything a dashboard needs to boot.
+
+    Each sub-request goes through the same routes, validation and error handling as a direct call,
+    and its response comes back as `{"id", "status", "headers", "body"}`, in request order; a failed
+    sub-request does not fail the batch. Consecutive reads (GET / HEAD) run concurrently, at most
+    BATCH_MAX_CONCURRENCY at a time; any other method waits for the calls before it and runs alone,
+    so writes keep their order relative to everything else. Each sub-request is admitted by its own
+    route class (a shed one answers 503) and shares the batch's deadline. The batch's Authorization
+    header is resolved once and applies to every sub-request.
+    """
+    settings = get_settings()
+    if len(body.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many requests in batch (max {settings.BATCH_MAX_REQUESTS})",
+        )
+    for sub in body.requests:
+        _check_path(sub)
+    user: Optional[Any] = None
+    if request.headers.get("authorization") is not None:
+        user = await run_in_threadpool(_resolve_user, request, db)
+    metrics.incr("batch.requests")
+    metrics.incr("batch.subrequests", len(body.requests))
+
+    ids = [sub.id if sub.id is not None else str(position) for position, sub in enumerate(body.requests)]
+    responses: List[Optional[bytes]] = [None] * len(body.requests)
+    limit = asyncio.Semaphore(max(settings.BATCH_MAX_CONCURRENCY, 1))
+
+    async def run(position: int) -> None:
+        async with limit:
+            responses[position] = await _dispatch(request, body.requests[position], ids[position], user)
+
+    reads: List[int] = []
+    for position, sub in enumerate(body.requests):
+        if sub.method in READ_METHODS:
+            reads.append(position)
+            continue
+        await asyncio.gather(*(run(read) for read in reads))
+        reads = []
+        await run(position)
+    await asyncio.gather(*(run(read) for read in reads))
+    log.info(f"📦 Batch of {len(body.requests)} requests done")
+    return RawJSONResponse(b'{"responses":[' + b",".join(responses) + b"]}")
@@ -0,0 +1,58 @@
+"""Catalog change feed (Server-Sent Events) for B2B marketplace."""
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from be.database import ReleaseSessionRoute, get_db
+from be.utils.change_feed import change_feed
+
+router = APIRouter(prefix="/changes", tags=["Changes"], route_class=ReleaseSessionRoute)
+log = logging.getLogger(__name__)
+
+
+def format_event(event: dict) -> str:
+    """One SSE message: the outbox offset as id (for Last-Event-ID), `<entity>.<action>` as event type."""
+    return f"id: {event['offset']}\nevent: {event['entity']}.{event['action']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}},
+)
+async def stream_changes(
+    after: Optional[int] = Query(None, ge=0, description="Resume after this offset (last event id received)"),
+    last_event_id: Optional[str] = Header(None, description="Set by EventSource on reconnect; wins over `after`"),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Stream product and vendor changes as Server-Sent Events, e.g. `event: product.updated` with
+    `data: {"offset", "entity", "id", "action", "version", "at"}`.
+
+    Without an offset the stream starts with changes made from now on. The request session is only
+    used to find the database; the stream itself holds no connection between polls.
+    """
+    if last_event_id is not None:
+        if not last_event_id.isdigit():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Last-Event-ID")
+        after = int(last_event_id)
+    log.info(f"📡 Change feed subscriber connected (after={after})")
+    events = await change_feed.subscribe(db.get_bind(), after)
+
+    async def _messages():
+        try:
+            async for event in events:
+                yield format_event(event) if event is not None else ": keep-alive\n\n"
+        finally:
+            await events.aclose()
+            log.info("📡 Change feed subscriber disconnected")
+
+    return StreamingResponse(
+        _messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -3,10 +3,10 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from be.database import get_db
+from be.database import ReleaseSessionRoute, get_db
 from be.schemas.health import HealthResponse
 
-router = APIRouter(prefix="/health", tags=["Health"])
+router = APIRouter(prefix="/health", tags=["Health"], route_class=ReleaseSessionRoute)
 
 
 @router.get("/", response_model=HealthResponse)
@@ -0,0 +1,20 @@
+"""Metrics endpoint for B2Bmarket API."""
+from anyio import to_thread
+from fastapi import APIRouter
+
+from be.database import engine, pool_status
+from be.schemas.metrics import MetricsResponse
+from be.utils.metrics import metrics
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/", response_model=MetricsResponse)
+async def get_metrics() -> MetricsResponse:
+    """Return this worker's counters, timings, DB pool and threadpool occupancy."""
+    limiter = to_thread.current_default_thread_limiter()
+    return MetricsResponse(
+        **metrics.snapshot(),
+        pool=pool_status(engine.pool),
+        threadpool={"total": limiter.total_tokens, "borrowed": limiter.borrowed_tokens},
+    )
@@ -1,32 +1,194 @@
 """Product API for B2B marketplace."""
 import logging
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import bindparam, column, func, literal, select, tuple_, union_all, update, values
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 
-from be.database import get_db
+from be.database import ReleaseSessionRoute, get_db
 from be.dependencies import CurrentUser, get_current_user
-from be.models.product import Product
+from be.models.product import Product, utcnow
+from be.models.product_tombstone import ProductTombstone
 from be.models.vendor import Vendor
-from be.schemas.product import ProductCreate, ProductResponse, ProductUpdate
+from be.schemas.product import (
+    PriceUpdateItem,
+    PriceUpdateResponse,
+    PriceUpdateResult,
+    ProductBatchResponse,
+    ProductChangesResponse,
+    ProductCreate,
+    ProductIdsRequest,
+    ProductResponse,
+    ProductTombstoneResponse,
+    ProductUpdate,
+)
+from be.utils.etag import check_if_match, if_match_versions, make_etag, not_modified, raise_precondition_failed
+from be.utils.fast_json import RawJSONResponse, dump, dump_row, join_fragments
+from be.utils.idempotency import idempotent_request, remember_response, replay_response, save_response
+from be.utils.invalidation import invalidation_bus
+from be.utils.outbox import record_change, record_changes_from
+from be.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_change_cursor,
+    encode_change_cursor,
+)
+from be.utils.response_cache import cached_fragments, response_cache, tagged_fragments
+from be.utils.single_flight import single_flight
+from be.utils.tombstones import record_product_deletions
+from config import get_settings
 
-router = APIRouter(prefix="/products", tags=["Products"])
+router = APIRouter(prefix="/products", tags=["Products"], route_class=ReleaseSessionRoute)
 log = logging.getLogger(__name__)
 
 
-def _get_product_or_404(product_id: int, db: Session) -> Product:
-    """Get product by ID or raise 404."""
-    product = db.query(Product).filter(Product.id == product_id).first()
+# Only vendor.name is rendered (and vendor.version tags it), so join just those columns; routes that
+# don't render a product skip it
+WITH_VENDOR_NAME = joinedload(Product.vendor).load_only(Vendor.name, Vendor.version)
+
+# Version of the product's vendor, which is part of the product's ETag since vendor_name is rendered
+PRODUCT_VENDOR_VERSION = select(Vendor.version).where(Vendor.id == Product.vendor_id).scalar_subquery()
+
+# ProductResponse fields for UPDATE ... RETURNING; vendor_name is read for the row's new vendor_id
+PRODUCT_RESPONSE_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.sku,
+    Product.description,
+    Product.price,
+    Product.vendor_id,
+    select(Vendor.name).where(Vendor.id == Product.vendor_id).scalar_subquery().label("vendor_name"),
+    Product.created_at,
+    Product.updated_at,
+    Product.version,
+)
+
+
+# ProductResponse fields, in order, for listings serialized by be.utils.fast_json (vendor joined)
+PRODUCT_LIST_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.sku,
+    Product.description,
+    Product.price,
+    Product.vendor_id,
+    Vendor.name.label("vendor_name"),
+    Product.created_at,
+    Product.updated_at,
+    Product.version,
+)
+
+
+# What a serialized product depends on, read before using the response cache: the product's own
+# version and its vendor's (vendor_name is rendered); (id, version, vendor version) per row
+PRODUCT_CACHE_KEY_COLUMNS = (Product.id, Product.version, Vendor.version)
+
+
+def _product_keys(q):
+    """`q` (a select of PRODUCT_CACHE_KEY_COLUMNS) joined to the vendor."""
+    return q.join(Vendor, Vendor.id == Product.vendor_id)
+
+
+def _load_product_fragments(db: Session, ids: List[int]):
+    """Serialize the given products (one IN query) as (id, cache tag, JSON bytes)."""
+    rows = db.execute(
+        _product_keys(select(*PRODUCT_LIST_COLUMNS, Vendor.version.label("vendor_version"))).where(
+            Product.id.in_(ids)
+        )
+    ).mappings()
+    for row in rows:
+        row = dict(row)
+        vendor_version = row.pop("vendor_version")
+        yield row["id"], (row["version"], vendor_version), dump_row(row)
+
+
+def _product_fragments(db: Session, keys) -> Dict[int, bytes]:
+    """Serialized ProductResponse per (id, version, vendor version) row: from the cache, misses loaded."""
+    return cached_fragments(
+        "product",
+        [(id, (version, vendor_version)) for id, version, vendor_version in keys],
+        lambda ids: _load_product_fragments(db, ids),
+    )
+
+
+def _forget_products(ids: Optional[List[int]]) -> None:
+    """Drop written products' cached bodies and let later reads start fresh fetches (None: all products)."""
+    response_cache.invalidate("product", ids)
+    if ids is None:
+        single_flight.forget("product")
+    else:
+        for id in ids:
+            single_flight.forget("product", id)
+    single_flight.forget("product_list")
+
+
+# Writes in any worker reach this worker's caches through the invalidation bus
+invalidation_bus.subscribe("product", _forget_products)
+
+
+def _invalidate_products(ids: List[int]) -> None:
+    """After commit: invalidate the written products in every worker."""
+    invalidation_bus.publish("product", ids)
+
+
+def _fetch_product(db: Session, product_id: int) -> Optional[Tuple[Tuple[int, int], bytes]]:
+    """((version, vendor version), serialized ProductResponse) of a product, or None when it does not exist."""
+    key = db.execute(_product_keys(select(*PRODUCT_CACHE_KEY_COLUMNS)).where(Product.id == product_id)).first()
+    if key is None:
+        return None
+    # On a cache miss the body is read again: its ETag is the versions of that read, and the product
+    # is missing when it was deleted in between
+    _, version, vendor_version = key
+    return tagged_fragments(
+        "product", [(product_id, (version, vendor_version))], lambda ids: _load_product_fragments(db, ids)
+    ).get(product_id)
+
+
+def _fetch_product_list(db: Session, vendor_id: Optional[int]) -> Tuple[int, bytes]:
+    """(row count, JSON array of ProductResponse) for the newest-first listing."""
+    # Only the cache keys are read for every row; bodies come from the response cache, and
+    # misses are loaded as plain rows and serialized straight to JSON bytes
+    q = _product_keys(select(*PRODUCT_CACHE_KEY_COLUMNS)).order_by(Product.created_at.desc(), Product.id.desc())
+    if vendor_id is not None:
+        q = q.where(Product.vendor_id == vendor_id)
+    keys = db.execute(q).all()
+    fragments = _product_fragments(db, keys)
+    return len(keys), join_fragments(fragments[key[0]] for key in keys if key[0] in fragments)
+
+
+def _get_product_or_404(product_id: int, db: Session, *options) -> Product:
+    """Get product by ID (with optional loader options) or raise 404."""
+    product = db.query(Product).options(*options).filter(Product.id == product_id).first()
     if not product:
         log.warning(f"⚠️ Product not found: product_id={product_id}")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     return product
 
 
-def _product_to_response(product: Product) -> ProductResponse:
-    """Build ProductResponse from Product model (with joined vendor)."""
+def _get_caller_vendor_or_403(current_user: CurrentUser, db: Session) -> Vendor:
+    """Vendor of the logged-in user (matched by user email == vendor email) or raise 403."""
+    vendor = (
+        db.query(Vendor)
+        .filter(func.lower(Vendor.email) == current_user.email.lower())
+        .first()
+    )
+    if not vendor:
+        log.warning(f"⚠️ No vendor with matching email: user_id={current_user.id}, email={current_user.email}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only vendor accounts can manage products. No vendor found with your email.",
+        )
+    return vendor
+
+
+def _product_to_response(product: Product, vendor: Optional[Vendor] = None) -> ProductResponse:
+    """Build ProductResponse from Product model (vendor joined via WITH_VENDOR_NAME, or passed in)."""
+    vendor = vendor or product.vendor
     return ProductResponse(
         id=product.id,
         name=product.name,
@@ -34,25 +196,170 @@ def _product_to_response(product: Product) -> ProductResponse:
         description=product.description,
         price=product.price,
         vendor_id=product.vendor_id,
-        vendor_name=product.vendor.name if product.vendor else None,
+        vendor_name=vendor.name if vendor else None,
         created_at=product.created_at,
+        updated_at=product.updated_at,
+        version=product.version,
+    )
+
+
+def _list_product_changes(
+    db: Session,
+    response: Response,
+    vendor_id: Optional[int],
+    updated_since: Optional[datetime],
+    cursor: Optional[str],
+    limit: int,
+    safety_lag: float,
+) -> ProductChangesResponse:
+    """
+    One page of product changes (writes, vendor changes and deletions), oldest first.
+
+    Products (by updated_at), products of changed vendors (by the vendor's updated_at, since the
+    body renders the vendor's name) and tombstones (by deleted_at) are merged into one stream and
+    walked by keyset on (changed_at, id, deleted), so each page is a single query over the indexes
+    plus one IN query for the changed products' current state. A product changed again later
+    moves forward in the stream and is reported again.
+
+    Timestamps come from the app clock before commit, so a write can commit after a later one has
+    been served. Only changes older than safety_lag seconds are served: the cursor never passes a
+    write whose transaction commits within that time.
+    """
+    horizon = utcnow() - timedelta(seconds=safety_lag)
+    updated = select(
+        Product.updated_at.label("changed_at"),
+        Product.id.label("id"),
+        literal(0).label("deleted"),
+        Product.vendor_id.label("vendor_id"),
+    ).where(Product.updated_at <= horizon)
+    # A product written after its vendor's change is already reported (with the new vendor) above
+    vendor_changed = (
+        select(Vendor.updated_at, Product.id, literal(0), Product.vendor_id)
+        .join(Vendor, Vendor.id == Product.vendor_id)
+        .where(Vendor.updated_at <= horizon, Product.updated_at < Vendor.updated_at)
+    )
+    deleted = select(
+        ProductTombstone.deleted_at, ProductTombstone.product_id, literal(1), ProductTombstone.vendor_id
+    ).where(ProductTombstone.deleted_at <= horizon)
+    if cursor:
+        after = decode_change_cursor(cursor)
+        # Range per branch so each walks its timestamp index; the exact tuple compare is below
+        updated = updated.where(Product.updated_at >= after[0])
+        vendor_changed = vendor_changed.where(Vendor.updated_at >= after[0])
+        deleted = deleted.where(ProductTombstone.deleted_at >= after[0])
+    else:
+        if updated_since.tzinfo is None:
+            updated_since = updated_since.replace(tzinfo=timezone.utc)
+        updated_since = updated_since.astimezone(timezone.utc)
+        updated = updated.where(Product.updated_at > updated_since)
+        vendor_changed = vendor_changed.where(Vendor.updated_at > updated_since)
+        deleted = deleted.where(ProductTombstone.deleted_at > updated_since)
+    if vendor_id is not None:
+        updated = updated.where(Product.vendor_id == vendor_id)
+        vendor_changed = vendor_changed.where(Product.vendor_id == vendor_id)
+        deleted = deleted.where(ProductTombstone.vendor_id == vendor_id)
+    changes = union_all(updated, vendor_changed, deleted).subquery()
+    query = select(changes).order_by(changes.c.changed_at, changes.c.id, changes.c.deleted)
+    if cursor:
+        query = query.where(tuple_(changes.c.changed_at, changes.c.id, changes.c.deleted) > tuple_(*after))
+    rows = db.execute(query.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # A product's own write and its vendor's change can land in the same page
+    product_ids = list(dict.fromkeys(row.id for row in rows if not row.deleted))
+    products = {}
+    if product_ids:
+        products = {
+            p.id: p for p in db.query(Product).options(WITH_VENDOR_NAME).filter(Product.id.in_(product_ids))
+        }
+    next_cursor = encode_change_cursor(rows[-1].changed_at, rows[-1].id, rows[-1].deleted) if rows else cursor
+    if has_more:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return ProductChangesResponse(
+        # A product deleted after this page was read is skipped; its tombstone comes in a later page
+        products=[_product_to_response(products[id]) for id in product_ids if id in products],
+        deleted=[
+            ProductTombstoneResponse(id=row.id, vendor_id=row.vendor_id, deleted_at=row.changed_at)
+            for row in rows
+            if row.deleted
+        ],
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
+def _parse_ids(raw: str) -> List[int]:
+    """Comma-separated positive integer IDs or raise 422."""
+    try:
+        ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        ids = []
+    if not ids or min(ids) <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be a comma-separated list of positive integers",
+        )
+    return ids
+
+
+def _get_products_by_ids(ids: List[int], db: Session, vendor_id: Optional[int] = None) -> RawJSONResponse:
+    """
+    ProductBatchResponse for an ID list: request order is kept, duplicates collapse.
+
+    One IN query reads the rows' cache keys; cached bodies are used as they are and only the
+    misses are loaded (one more IN query).
+    """
+    max_ids = get_settings().PRODUCT_BATCH_MAX_IDS
+    if len(ids) > max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"At most {max_ids} ids per request"
+        )
+    ids = list(dict.fromkeys(ids))
+    q = _product_keys(select(*PRODUCT_CACHE_KEY_COLUMNS)).where(Product.id.in_(ids))
+    if vendor_id is not None:
+        q = q.where(Product.vendor_id == vendor_id)
+    fragments = _product_fragments(db, db.execute(q).all())
+    products = [fragments[id] for id in ids if id in fragments]
+    missing = [id for id in ids if id not in fragments]
+    log.info(f"✅ Found {len(products)} product(s), {len(missing)} missing")
+    return RawJSONResponse(
+        b'{"products":' + join_fragments(products) + b',"missing":' + dump(missing) + b"}"
     )
 
 
 @router.get("/", response_model=List[ProductResponse])
 def list_products(
     vendor_id: Optional[int] = Query(None, gt=0, description="Filter by vendor ID"),
+    ids: Optional[str] = Query(None, include_in_schema=False),
+    updated_since: Optional[str] = Query(None, include_in_schema=False),
+    cursor: Optional[str] = Query(None, include_in_schema=False),
     db: Session = Depends(get_db),
 ) -> List[ProductResponse]:
-    """List all products, optionally filtered by vendor."""
+    """
+    List all products, newest first, optionally filtered by vendor.
+
+    Batch get and delta sync have their own routes; their parameters are rejected here rather than
+    silently answered with the full catalog.
+    """
+    if ids is not None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids is not supported here; use /api/products/lookup",
+        )
+    if updated_since is not None or cursor is not None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="updated_since and cursor are not supported here; use /api/products/changes",
+        )
     try:
         log.info("📋 Listing products" + (f" (vendor_id={vendor_id})" if vendor_id else ""))
-        q = db.query(Product).order_by(Product.created_at.desc())
-        if vendor_id is not None:
-            q = q.filter(Product.vendor_id == vendor_id)
-        products = q.all()
-        log.info(f"✅ Found {len(products)} product(s)")
-        return [_product_to_response(p) for p in products]
+        # Concurrent identical listings share one fetch
+        count, body = single_flight.do("product_list", vendor_id, lambda: _fetch_product_list(db, vendor_id))
+        log.info(f"✅ Found {count} product(s)")
+        return RawJSONResponse(body)
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"❌ Error listing products: {type(e).__name__}: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -61,14 +368,103 @@ def list_products(
         )
 
 
+@router.get("/changes", response_model=ProductChangesResponse)
+def list_product_changes(
+    response: Response,
+    updated_since: Optional[datetime] = Query(
+        None, description="First sync: products changed or deleted after this time (UTC if no offset)"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page or sync"),
+    vendor_id: Optional[int] = Query(None, gt=0, description="Filter by vendor ID"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    db: Session = Depends(get_db),
+) -> ProductChangesResponse:
+    """
+    Delta sync: a page of changed products and deletions, oldest first.
+
+    Start with updated_since; pass next_cursor as cursor for every later page and sync.
+    """
+    if updated_since is None and cursor is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="updated_since or cursor is required"
+        )
+    try:
+        log.info(f"🔄 Listing product changes: updated_since={updated_since}, vendor_id={vendor_id}")
+        changes = _list_product_changes(
+            db, response, vendor_id, updated_since, cursor, limit, get_settings().DELTA_SYNC_SAFETY_LAG
+        )
+        log.info(f"✅ Found {len(changes.products)} changed, {len(changes.deleted)} deleted product(s)")
+        return changes
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"❌ Error listing product changes: {type(e).__name__}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve product changes",
+        )
+
+
+@router.get("/lookup", response_model=ProductBatchResponse)
+def get_products_by_ids(
+    ids: str = Query(..., description="Comma-separated product IDs, e.g. 1,2,3 (POST for long lists)"),
+    vendor_id: Optional[int] = Query(None, gt=0, description="Filter by vendor ID"),
+    db: Session = Depends(get_db),
+) -> ProductBatchResponse:
+    """Batch get: the products in request order and the IDs that were not found."""
+    try:
+        log.info(f"📦 Batch getting products: ids={ids}")
+        return _get_products_by_ids(_parse_ids(ids), db, vendor_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"❌ Error batch getting products: {type(e).__name__}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve products",
+        )
+
+
+@router.post("/lookup", response_model=ProductBatchResponse)
+def lookup_products(body: ProductIdsRequest, db: Session = Depends(get_db)) -> ProductBatchResponse:
+    """Batch get by ID list in the request body (same as GET /api/products/lookup?ids= for long lists)."""
+    try:
+        log.info(f"📦 Batch getting products: {len(body.ids)} id(s)")
+        return _get_products_by_ids(body.ids, db, body.vendor_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"❌ Error batch getting products: {type(e).__name__}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve products",
+        )
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)) -> ProductResponse:
-    """Get a product by id."""
+def get_product(
+    product_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+) -> ProductResponse:
+    """
+    Get a product by id. Sends its version and its vendor's as ETag (the body renders the vendor's
+    name); If-None-Match with that ETag answers 304.
+
+    Only the row's cache key is read when its serialized body is in the response cache, and
+    concurrent requests for the same product share one fetch.
+    """
     try:
         log.info(f"🔍 Getting product: product_id={product_id}")
-        product = _get_product_or_404(product_id, db)
-        log.info(f"✅ Found product: product_id={product_id}, name={product.name}")
-        return _product_to_response(product)
+        found = single_flight.do("product", product_id, lambda: _fetch_product(db, product_id))
+        if found is None:
+            log.warning(f"⚠️ Product not found: product_id={product_id}")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        versions, fragment = found
+        if not_modified(if_none_match, *versions):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": make_etag(*versions)})
+        log.info(f"✅ Found product: product_id={product_id}")
+        return RawJSONResponse(fragment, headers={"ETag": make_etag(*versions)})
     except HTTPException:
         raise
     except Exception as e:
@@ -82,21 +478,17 @@ def get_product(product_id: int, db: Session = Depends(get_db)) -> ProductRespon
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=ProductResponse)
 def create_product(
     body: ProductCreate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, description="Retries with the same key replay the first response"),
 ) -> ProductResponse:
     """Create a new product. Vendor is matched by user email == vendor email."""
-    vendor = (
-        db.query(Vendor)
-        .filter(func.lower(Vendor.email) == current_user.email.lower())
-        .first()
-    )
-    if not vendor:
-        log.warning(f"⚠️ No vendor with matching email: user_id={current_user.id}, email={current_user.email}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only vendor accounts can add products. No vendor found with your email.",
-        )
+    idempotent = idempotent_request(f"products:{current_user.id}", idempotency_key, body)
+    replayed = replay_response(db, idempotent)
+    if replayed is not None:
+        return replayed
+    vendor = _get_caller_vendor_or_403(current_user, db)
     try:
         log.info(f"➕ Creating product: name={body.name}, vendor_id={vendor.id}")
         product = Product(
@@ -107,40 +499,197 @@ def create_product(
             vendor_id=vendor.id,
         )
         db.add(product)
+        db.flush()  # get product.id for the outbox entry
+        record_change(db, "product", product.id, "created", product.version)
+        if idempotent is not None:
+            product_id = product.id
+            db.refresh(product)  # server-side timestamps, for the stored response
+            body_json = _product_to_response(product, vendor).model_dump_json().encode()
+            stored = save_response(
+                db, idempotent, status.HTTP_201_CREATED, body_json, make_etag(product.version, vendor.version)
+            )
+            db.commit()
+            remember_response(idempotent, stored)
+            _invalidate_products([product_id])
+            log.info(f"✅ Product created: product_id={product_id}, name={body.name}")
+            return stored
         db.commit()
+        _invalidate_products([product.id])
         db.refresh(product)
         log.info(f"✅ Product created: product_id={product.id}, name={product.name}")
-        return _product_to_response(product)
+        response.headers["ETag"] = make_etag(product.version, vendor.version)
+        return _product_to_response(product, vendor)
     except HTTPException:
         raise
     except Exception as e:
-        log.error(f"❌ Error creating product: {type(e).__name__}: {str(e)}", exc_info=True)
         db.rollback()
+        # A concurrent request with the same key committed first: answer with its response
+        replayed = replay_response(db, idempotent)
+        if replayed is not None:
+            return replayed
+        log.error(f"❌ Error creating product: {type(e).__name__}: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create product",
         )
 
 
+def _resolve_products(db: Session, vendor_id: int, key: str, keys: List, batch_size: int) -> Dict:
+    """{key value: product id} for the vendor's products among `keys` ("id" or "sku"), one SELECT per batch."""
+    key_column = getattr(Product, key)
+    resolved = {}
+    for start in range(0, len(keys), batch_size):
+        resolved.update(
+            db.execute(
+                select(key_column, Product.id).where(
+                    key_column.in_(keys[start:start + batch_size]), Product.vendor_id == vendor_id
+                )
+            ).all()
+        )
+    return resolved
+
+
+def _reprice_batch(db: Session, vendor_id: int, prices: Dict[int, Decimal]) -> None:
+    """Set prices for one batch of the vendor's products by id (each listed once) in one UPDATE."""
+    if db.get_bind().dialect.name == "postgresql":
+        new_prices = values(
+            column("id", Product.id.type), column("price", Product.price.type), name="new_prices"
+        ).data(list(prices.items()))
+        db.execute(
+            update(Product)
+            .where(Product.id == new_prices.c.id, Product.vendor_id == vendor_id)
+            .values(price=new_prices.c.price, version=Product.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        # No UPDATE ... FROM (VALUES ...) column aliases (SQLite): one executemany UPDATE by primary key
+        products = Product.__table__
+        db.execute(
+            update(products)
+            .where(products.c.id == bindparam("product_id"))
+            .values(price=bindparam("new_price"), version=products.c.version + 1),
+            [{"product_id": id, "new_price": price} for id, price in prices.items()],
+        )
+    record_changes_from(db, "product", "updated", Product, Product.id.in_(list(prices)))
+
+
+@router.patch("/prices", response_model=PriceUpdateResponse)
+def update_prices(
+    body: List[PriceUpdateItem],
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> PriceUpdateResponse:
+    """
+    Bulk price update for the caller's vendor: `[{id|sku, price}]`, one transaction.
+
+    Skus are resolved to ids first; products are then updated in batches of BULK_PRICE_BATCH_SIZE,
+    one set-based UPDATE per batch. Entries that match no product of the vendor are reported as
+    not_found; if a product is listed more than once (by id or by sku), the last price wins.
+    """
+    settings = get_settings()
+    if len(body) > settings.BULK_PRICE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_PRICE_MAX_ITEMS} entries per request",
+        )
+    vendor = _get_caller_vendor_or_403(current_user, db)
+    try:
+        log.info(f"💲 Updating prices: {len(body)} entr(ies), vendor_id={vendor.id}")
+        batch_size = max(settings.BULK_PRICE_BATCH_SIZE, 1)
+        by_key: Dict[str, Dict] = {"id": {}, "sku": {}}
+        for item in body:
+            key = "id" if item.id is not None else "sku"
+            by_key[key][getattr(item, key)] = None
+        resolved = {key: _resolve_products(db, vendor.id, key, list(keys), batch_size) for key, keys in by_key.items()}
+        # By product id, so a product listed by id and by sku is updated once: the last entry wins
+        product_ids: List[Optional[int]] = []
+        prices: Dict[int, Decimal] = {}
+        for item in body:
+            key = "id" if item.id is not None else "sku"
+            product_id = resolved[key].get(getattr(item, key))
+            product_ids.append(product_id)
+            if product_id is not None:
+                prices[product_id] = item.price
+        entries = list(prices.items())
+        for start in range(0, len(entries), batch_size):
+            _reprice_batch(db, vendor.id, dict(entries[start:start + batch_size]))
+        db.commit()
+        _invalidate_products(list(prices))
+
+        results = [
+            PriceUpdateResult(
+                id=product_id if product_id is not None else item.id,
+                sku=item.sku,
+                price=item.price,
+                status="updated" if product_id is not None else "not_found",
+            )
+            for item, product_id in zip(body, product_ids)
+        ]
+        updated = sum(1 for r in results if r.status == "updated")
+        log.info(f"✅ Prices updated: {updated} updated, {len(results) - updated} not found, vendor_id={vendor.id}")
+        return PriceUpdateResponse(updated=updated, not_found=len(results) - updated, results=results)
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"❌ Error updating prices: {type(e).__name__}: {str(e)}", exc_info=True)
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update prices",
+        )
+
+
 @router.patch("/{product_id}", response_model=ProductResponse)
 def update_product(
-    product_id: int, body: ProductUpdate, db: Session = Depends(get_db)
+    product_id: int,
+    body: ProductUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag from a previous read; 412 if the product changed since"),
+    db: Session = Depends(get_db),
 ) -> ProductResponse:
-    """Update a product (partial)."""
+    """
+    Update a product (partial) with a single UPDATE ... RETURNING statement.
+
+    With If-Match the UPDATE is conditional on the product and vendor versions (no row locks); a
+    concurrent change in between makes it match nothing and the request answers 412.
+    """
     try:
         log.info(f"✏️ Updating product: product_id={product_id}")
-        product = _get_product_or_404(product_id, db)
         updates = body.model_dump(exclude_unset=True)
-        if "vendor_id" in updates:
-            vendor = db.query(Vendor).filter(Vendor.id == updates["vendor_id"]).first()
-            if not vendor:
+        if not updates:
+            product = _get_product_or_404(product_id, db, WITH_VENDOR_NAME)
+            check_if_match(if_match, product.version, product.vendor.version)
+            response.headers["ETag"] = make_etag(product.version, product.vendor.version)
+            return _product_to_response(product)
+        stmt = update(Product).where(Product.id == product_id)
+        expected_versions = if_match_versions(if_match)
+        if expected_versions is not None:
+            pairs = [tag for tag in expected_versions if len(tag) == 2]
+            stmt = stmt.where(tuple_(Product.version, PRODUCT_VENDOR_VERSION).in_(pairs))
+        try:
+            row = db.execute(
+                stmt.values(**updates, version=Product.version + 1)
+                .returning(*PRODUCT_RESPONSE_COLUMNS, PRODUCT_VENDOR_VERSION.label("vendor_version"))
+                .execution_options(synchronize_session=False)
+            ).first()
+        except IntegrityError:
+            db.rollback()
+            if "vendor_id" in updates and db.get(Vendor, updates["vendor_id"]) is None:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vendor not found")
-        for key, value in updates.items():
-            setattr(product, key, value)
+            raise
+        if row is None:
+            if expected_versions is not None and db.get(Product, product_id) is not None:
+                log.warning(f"⚠️ Product version conflict: product_id={product_id}, if_match={if_match}")
+                raise_precondition_failed()
+            log.warning(f"⚠️ Product not found: product_id={product_id}")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        record_change(db, "product", product_id, "updated", row.version)
         db.commit()
-        db.refresh(product)
-        log.info(f"✅ Product updated: product_id={product_id}")
-        return _product_to_response(product)
+        _invalidate_products([product_id])
+        log.info(f"✅ Product updated: product_id={product_id}, version={row.version}")
+        fields = dict(row._mapping)
+        response.headers["ETag"] = make_etag(row.version, fields.pop("vendor_version"))
+        return ProductResponse(**fields)
     except HTTPException:
         raise
     except Exception as e:
@@ -159,8 +708,10 @@ def delete_product(product_id: int, db: Session = Depends(get_db)) -> None:
         log.info(f"🗑️ Deleting product: product_id={product_id}")
         product = _get_product_or_404(product_id, db)
         product_name = product.name
+        record_product_deletions(db, Product.id == product_id)
         db.delete(product)
         db.commit()
+        _invalidate_products([product_id])
         log.info(f"✅ Product deleted: product_id={product_id}, name={product_name}")
     except HTTPException:
         raise
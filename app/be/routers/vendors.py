@@ -1,38 +1,186 @@
 """Vendor API for B2B marketplace."""
 import logging
-from typing import List
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response, status
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session, noload
 
-from be.database import get_db
+from config import get_settings
+from be.database import ReleaseSessionRoute, get_db
+from be.models.product import Product, utcnow
 from be.models.user import User
 from be.models.vendor import Vendor
-from be.schemas.vendor import VendorCreate, VendorResponse, VendorUpdate
+from be.schemas.product import VendorProductResponse
+from be.schemas.vendor import VendorCreate, VendorProductsResponse, VendorResponse, VendorUpdate
+from be.utils.etag import check_if_match, if_match_versions, make_etag, not_modified, raise_precondition_failed
+from be.utils.fast_json import RawJSONResponse, dump_row, dump_rows, join_fragments
+from be.utils.idempotency import idempotent_request, remember_response, replay_response, save_response
+from be.utils.invalidation import invalidation_bus
+from be.utils.metrics import metrics
+from be.utils.outbox import record_change
+from be.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
 from be.utils.password import generate_salt, hash_password
+from be.utils.response_cache import cached_fragments, response_cache, tagged_fragments
+from be.utils.single_flight import single_flight
+from be.utils.tombstones import record_product_deletions
 
-router = APIRouter(prefix="/vendors", tags=["Vendors"])
+router = APIRouter(prefix="/vendors", tags=["Vendors"], route_class=ReleaseSessionRoute)
 log = logging.getLogger(__name__)
 
 
-def _get_vendor_or_404(vendor_id: int, db: Session) -> Vendor:
-    """Get vendor by ID or raise 404."""
-    vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
+# VendorResponse fields, in order, for listings serialized by be.utils.fast_json
+VENDOR_LIST_COLUMNS = (
+    Vendor.id,
+    Vendor.name,
+    Vendor.first_name,
+    Vendor.last_name,
+    Vendor.email,
+    Vendor.phone_number,
+    Vendor.created_at,
+    Vendor.updated_at,
+    Vendor.version,
+)
+
+# Read per row before using the response cache; created_at is the keyset pagination column
+VENDOR_KEY_COLUMNS = (Vendor.id, Vendor.version, Vendor.created_at)
+
+
+def _load_vendor_fragments(db: Session, ids: List[int]):
+    """Serialize the given vendors (one IN query, no product count) as (id, version, JSON bytes)."""
+    for row in db.execute(select(*VENDOR_LIST_COLUMNS).where(Vendor.id.in_(ids))).mappings():
+        yield row["id"], row["version"], dump_row({**row, "product_count": None})
+
+
+def _vendor_fragments(db: Session, keys) -> Dict[int, bytes]:
+    """Serialized VendorResponse per VENDOR_KEY_COLUMNS row: from the response cache, misses loaded."""
+    return cached_fragments(
+        "vendor", [(key.id, key.version) for key in keys], lambda ids: _load_vendor_fragments(db, ids)
+    )
+
+
+def _forget_vendors(ids: Optional[List[int]]) -> None:
+    """
+    Drop written vendors' cached bodies and let later reads start fresh fetches (None: all vendors).
+    In-flight product reads are forgotten too, since products render the vendor's name (or went with it).
+    """
+    response_cache.invalidate("vendor", ids)
+    if ids is None:
+        single_flight.forget("vendor")
+    else:
+        for id in ids:
+            single_flight.forget("vendor", id)
+    single_flight.forget("product")
+    single_flight.forget("product_list")
+
+
+# Writes in any worker reach this worker's caches through the invalidation bus
+invalidation_bus.subscribe("vendor", _forget_vendors)
+
+
+def _invalidate_vendor(vendor_id: int) -> None:
+    """After commit: invalidate the vendor in every worker."""
+    invalidation_bus.publish("vendor", [vendor_id])
+
+
+def _fetch_vendor(db: Session, vendor_id: int) -> Optional[Tuple[int, bytes]]:
+    """(version, serialized VendorResponse) of a vendor, or None when it does not exist."""
+    key = db.execute(select(*VENDOR_KEY_COLUMNS).where(Vendor.id == vendor_id)).first()
+    if key is None:
+        return None
+    # On a cache miss the body is read again: its ETag is the version of that read, and the vendor
+    # is missing when it was deleted in between
+    return tagged_fragments(
+        "vendor", [(vendor_id, key.version)], lambda ids: _load_vendor_fragments(db, ids)
+    ).get(vendor_id)
+
+
+def _get_vendor_or_404(vendor_id: int, db: Session, *options) -> Vendor:
+    """Get vendor by ID (with optional loader options) or raise 404."""
+    vendor = db.query(Vendor).options(*options).filter(Vendor.id == vendor_id).first()
     if not vendor:
         log.warning(f"⚠️ Vendor not found: vendor_id={vendor_id}")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vendor not found")
     return vendor
 
 
+def _vendor_to_response(vendor: Vendor, product_count: Optional[int] = None) -> VendorResponse:
+    """Build VendorResponse from Vendor model (with optional product count)."""
+    return VendorResponse(
+        id=vendor.id,
+        name=vendor.name,
+        first_name=vendor.first_name,
+        last_name=vendor.last_name,
+        email=vendor.email,
+        phone_number=vendor.phone_number,
+        created_at=vendor.created_at,
+        updated_at=vendor.updated_at,
+        version=vendor.version,
+        product_count=product_count,
+    )
+
+
+def _prefix_pattern(prefix: str) -> str:
+    """Lower-cased LIKE pattern matching `prefix` literally (wildcards escaped)."""
+    escaped = prefix.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
 @router.get("/", response_model=List[VendorResponse])
-def list_vendors(db: Session = Depends(get_db)) -> List[Vendor]:
-    """List all vendors."""
+def list_vendors(
+    response: Response,
+    q: Optional[str] = Query(None, min_length=1, max_length=255, description="Name or email prefix (case-insensitive)"),
+    include: Optional[str] = Query(
+        None, pattern="^product_count$", description="product_count: add each vendor's product count"
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header value from the previous page"),
+    db: Session = Depends(get_db),
+) -> List[VendorResponse]:
+    """
+    List vendors newest first, one page at a time, optionally filtered by name/email prefix.
+
+    The next page's cursor is in the X-Next-Cursor header, as for GET /api/vendors/{id}/products.
+    """
     try:
-        log.info("📋 Listing all vendors")
-        vendors = db.query(Vendor).order_by(Vendor.created_at.desc()).all()
-        log.info(f"✅ Found {len(vendors)} vendor(s)")
-        return vendors
+        log.info("📋 Listing vendors" + (f" (q={q})" if q else ""))
+        # Without include, only the cache keys (and the cursor column) are read per row and bodies
+        # come from the response cache
+        query = db.query(*VENDOR_LIST_COLUMNS) if include else db.query(*VENDOR_KEY_COLUMNS)
+        if q:
+            pattern = _prefix_pattern(q)
+            query = query.filter(
+                or_(
+                    func.lower(Vendor.name).like(pattern, escape="\\"),
+                    func.lower(Vendor.email).like(pattern, escape="\\"),
+                )
+            )
+        if not include:
+            keys = paginate(query, Vendor, limit, cursor, response)
+            fragments = _vendor_fragments(db, keys)
+            log.info(f"✅ Found {len(keys)} vendor(s)")
+            return RawJSONResponse(
+                join_fragments(fragments[key.id] for key in keys if key.id in fragments),
+                headers=dict(response.headers),
+            )
+        page = paginate(query, Vendor, limit, cursor, response)
+        # include=product_count: one grouped count over the page's vendors only (vendor_id index)
+        counts = {}
+        if page:
+            counts = dict(
+                db.execute(
+                    select(Product.vendor_id, func.count())
+                    .where(Product.vendor_id.in_([row.id for row in page]))
+                    .group_by(Product.vendor_id)
+                ).all()
+            )
+        # Plain rows straight to JSON bytes: no ORM objects, no response model validation
+        rows = [{**row._mapping, "product_count": counts.get(row.id, 0)} for row in page]
+        log.info(f"✅ Found {len(rows)} vendor(s)")
+        return RawJSONResponse(dump_rows(rows), headers=dict(response.headers))
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"❌ Error listing vendors: {type(e).__name__}: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -42,13 +190,28 @@ def list_vendors(db: Session = Depends(get_db)) -> List[Vendor]:
 
 
 @router.get("/{vendor_id}", response_model=VendorResponse)
-def get_vendor(vendor_id: int, db: Session = Depends(get_db)) -> Vendor:
-    """Get a vendor by id."""
+def get_vendor(
+    vendor_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+) -> VendorResponse:
+    """
+    Get a vendor by id. Sends its version as ETag; If-None-Match with that ETag answers 304.
+
+    Only the row's version is read when its serialized body is in the response cache, and
+    concurrent requests for the same vendor share one fetch.
+    """
     try:
         log.info(f"🔍 Getting vendor: vendor_id={vendor_id}")
-        vendor = _get_vendor_or_404(vendor_id, db)
-        log.info(f"✅ Found vendor: vendor_id={vendor_id}, name={vendor.name}")
-        return vendor
+        found = single_flight.do("vendor", vendor_id, lambda: _fetch_vendor(db, vendor_id))
+        if found is None:
+            log.warning(f"⚠️ Vendor not found: vendor_id={vendor_id}")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vendor not found")
+        version, fragment = found
+        if not_modified(if_none_match, version):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": make_etag(version)})
+        log.info(f"✅ Found vendor: vendor_id={vendor_id}")
+        return RawJSONResponse(fragment, headers={"ETag": make_etag(version)})
     except HTTPException:
         raise
     except Exception as e:
@@ -59,6 +222,49 @@ def get_vendor(vendor_id: int, db: Session = Depends(get_db)) -> Vendor:
         )
 
 
+@router.get("/{vendor_id}/products", response_model=VendorProductsResponse)
+def list_vendor_products(
+    vendor_id: int,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header value from the previous page"),
+    db: Session = Depends(get_db),
+) -> VendorProductsResponse:
+    """
+    List a vendor's products newest first. The vendor is loaded once instead of joined per product.
+
+    The next page's cursor is in the X-Next-Cursor header, as for GET /api/vendors/.
+    """
+    try:
+        log.info(f"📋 Listing products for vendor: vendor_id={vendor_id}")
+        vendor = _get_vendor_or_404(vendor_id, db)
+        query = db.query(Product).options(noload(Product.vendor)).filter(Product.vendor_id == vendor_id)
+        products = paginate(query, Product, limit, cursor, response)
+        log.info(f"✅ Found {len(products)} product(s) for vendor_id={vendor_id}")
+        return VendorProductsResponse(
+            vendor=_vendor_to_response(vendor),
+            products=[
+                VendorProductResponse(
+                    id=p.id,
+                    name=p.name,
+                    sku=p.sku,
+                    description=p.description,
+                    price=p.price,
+                    created_at=p.created_at,
+                )
+                for p in products
+            ],
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"❌ Error listing products for vendor {vendor_id}: {type(e).__name__}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve vendor products",
+        )
+
+
 def _create_user_for_vendor(vendor: Vendor, db: Session) -> None:
     """Create a login user for the vendor when vendor has email. Password = hashed(vendor.email)."""
     if not vendor.email or not vendor.email.strip():
@@ -82,8 +288,21 @@ def _create_user_for_vendor(vendor: Vendor, db: Session) -> None:
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=VendorResponse)
-def create_vendor(body: VendorCreate, db: Session = Depends(get_db)) -> Vendor:
+def create_vendor(
+    body: VendorCreate,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, description="Retries with the same key replay the first response"),
+) -> Vendor:
     """Create a new vendor. If vendor has email, a login user is created (password = vendor email)."""
+    # Vendor sign-up is unauthenticated, so keys are scoped to the client address instead of a user:
+    # callers behind one address (a proxy not forwarding X-Forwarded-For) still share a key space
+    client = request.client.host if request.client else "-"
+    idempotent = idempotent_request(f"vendors:{client}", idempotency_key, body)
+    replayed = replay_response(db, idempotent)
+    if replayed is not None:
+        return replayed
     try:
         log.info(f"➕ Creating vendor: name={body.name}")
         vendor = Vendor(
@@ -95,14 +314,31 @@ def create_vendor(body: VendorCreate, db: Session = Depends(get_db)) -> Vendor:
         )
         db.add(vendor)
         db.flush()  # get vendor.id before commit
+        record_change(db, "vendor", vendor.id, "created", vendor.version)
         _create_user_for_vendor(vendor, db)
+        if idempotent is not None:
+            vendor_id = vendor.id
+            db.refresh(vendor)  # server-side timestamps, for the stored response
+            body_json = _vendor_to_response(vendor).model_dump_json().encode()
+            stored = save_response(db, idempotent, status.HTTP_201_CREATED, body_json, make_etag(vendor.version))
+            db.commit()
+            remember_response(idempotent, stored)
+            log.info(f"✅ Vendor created successfully: vendor_id={vendor_id}, name={body.name}")
+            return stored
         db.commit()
         db.refresh(vendor)
         log.info(f"✅ Vendor created successfully: vendor_id={vendor.id}, name={vendor.name}")
+        response.headers["ETag"] = make_etag(vendor.version)
         return vendor
+    except HTTPException:
+        raise
     except Exception as e:
-        log.error(f"❌ Error creating vendor: {type(e).__name__}: {str(e)}", exc_info=True)
         db.rollback()
+        # A concurrent request with the same key committed first: answer with its response
+        replayed = replay_response(db, idempotent)
+        if replayed is not None:
+            return replayed
+        log.error(f"❌ Error creating vendor: {type(e).__name__}: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create vendor",
@@ -110,28 +346,49 @@ def create_vendor(body: VendorCreate, db: Session = Depends(get_db)) -> Vendor:
 
 
 @router.patch("/{vendor_id}", response_model=VendorResponse)
-def update_vendor(vendor_id: int, body: VendorUpdate, db: Session = Depends(get_db)) -> Vendor:
-    """Update a vendor (partial)."""
+def update_vendor(
+    vendor_id: int,
+    body: VendorUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag from a previous read; 412 if the vendor changed since"),
+    db: Session = Depends(get_db),
+) -> VendorResponse:
+    """
+    Update a vendor (partial) with a single UPDATE ... RETURNING statement. Null fields are ignored.
+
+    With If-Match the UPDATE is conditional on the row version; a concurrent change answers 412.
+    """
     try:
-        log.info(f"✏️ Updating vendor: vendor_id={vendor_id}, updates={body.model_dump(exclude_unset=True)}")
-        vendor = _get_vendor_or_404(vendor_id, db)
-        old_name = vendor.name
-        
-        if body.name is not None:
-            vendor.name = body.name
-        if body.first_name is not None:
-            vendor.first_name = body.first_name
-        if body.last_name is not None:
-            vendor.last_name = body.last_name
-        if body.email is not None:
-            vendor.email = body.email
-        if body.phone_number is not None:
-            vendor.phone_number = body.phone_number
-        
+        updates = {key: value for key, value in body.model_dump(exclude_unset=True).items() if value is not None}
+        log.info(f"✏️ Updating vendor: vendor_id={vendor_id}, updates={updates}")
+        if not updates:
+            vendor = _get_vendor_or_404(vendor_id, db)
+            check_if_match(if_match, vendor.version)
+            response.headers["ETag"] = make_etag(vendor.version)
+            return _vendor_to_response(vendor)
+        stmt = update(Vendor).where(Vendor.id == vendor_id)
+        expected_versions = if_match_versions(if_match)
+        if expected_versions is not None:
+            stmt = stmt.where(Vendor.version.in_([tag[0] for tag in expected_versions if len(tag) == 1]))
+        vendor = db.scalars(
+            stmt.values(**updates, version=Vendor.version + 1)
+            .returning(Vendor)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if vendor is None:
+            if expected_versions is not None and db.get(Vendor, vendor_id) is not None:
+                log.warning(f"⚠️ Vendor version conflict: vendor_id={vendor_id}, if_match={if_match}")
+                raise_precondition_failed()
+            log.warning(f"⚠️ Vendor not found: vendor_id={vendor_id}")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vendor not found")
+        # Build the response before commit() expires the instance (which would cost a re-SELECT)
+        vendor_response = _vendor_to_response(vendor)
+        record_change(db, "vendor", vendor_id, "updated", vendor_response.version)
         db.commit()
-        db.refresh(vendor)
-        log.info(f"✅ Vendor updated: vendor_id={vendor_id}, old_name={old_name}, new_name={vendor.name}")
-        return vendor
+        _invalidate_vendor(vendor_id)
+        log.info(f"✅ Vendor updated: vendor_id={vendor_id}, version={vendor_response.version}")
+        response.headers["ETag"] = make_etag(vendor_response.version)
+        return vendor_response
     except HTTPException:
         raise
     except Exception as e:
@@ -143,16 +400,132 @@ def update_vendor(vendor_id: int, body: VendorUpdate, db: Session = Depends(get_
         )
 
 
-@router.delete("/{vendor_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_vendor(vendor_id: int, db: Session = Depends(get_db)) -> None:
-    """Delete a vendor."""
+def _delete_vendor_in_batches(vendor_id: int, bind, batch_size: int, stamp: datetime) -> None:
+    """
+    Delete a vendor's products in small committed batches (short lock times), then the vendor.
+
+    Committed batches stay deleted when the job stops (error, restart); the vendor keeps its
+    deleting_since mark, so resume_vendor_deletes() or another DELETE continues with the rest.
+    `stamp` is the job's lease on the mark: each batch first renews it, in the batch's transaction,
+    and the job stops once another job has taken the mark over, so two jobs never delete together.
+    """
+    deleted_total = 0
     try:
+        with Session(bind=bind) as db:
+            while True:
+                stamp = _mark_deleting(db, vendor_id, stamp)
+                if stamp is None:
+                    metrics.incr("vendors.delete.superseded")
+                    log.info(f"⏭️ Batched vendor delete taken over or done elsewhere: vendor_id={vendor_id}")
+                    return
+                batch = db.scalars(select(Product.id).where(Product.vendor_id == vendor_id).limit(batch_size)).all()
+                if len(batch) < batch_size:
+                    break
+                record_product_deletions(db, Product.id.in_(batch))
+                db.execute(delete(Product).where(Product.id.in_(batch)).execution_options(synchronize_session=False))
+                db.commit()
+                deleted_total += len(batch)
+            # The last (short) batch goes by the cascade, with the vendor, in the renewed transaction
+            record_product_deletions(db, Product.vendor_id == vendor_id)
+            db.execute(delete(Vendor).where(Vendor.id == vendor_id).execution_options(synchronize_session=False))
+            record_change(db, "vendor", vendor_id, "deleted")
+            db.commit()
+            deleted_total += len(batch)
+        _invalidate_vendor(vendor_id)
+        metrics.incr("vendors.delete.batched")
+        log.info(f"✅ Vendor deleted in batches: vendor_id={vendor_id}, products={deleted_total}")
+    except Exception as e:
+        metrics.incr("vendors.delete.failed")
+        log.error(
+            f"❌ Error batch-deleting vendor {vendor_id} after {deleted_total} product(s), to be resumed: "
+            f"{type(e).__name__}: {str(e)}",
+            exc_info=True,
+        )
+
+
+def _mark_deleting(db: Session, vendor_id: int, seen: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Stamp deleting_since (only if it is still `seen`, when given), leaving updated_at alone.
+    Returns the new stamp, or None when no row changed.
+    """
+    stamp = utcnow()
+    q = update(Vendor).where(Vendor.id == vendor_id)
+    if seen is not None:
+        q = q.where(Vendor.deleting_since == seen)
+    result = db.execute(
+        q.values(deleting_since=stamp, updated_at=Vendor.updated_at).execution_options(synchronize_session=False)
+    )
+    return stamp if result.rowcount > 0 else None
+
+
+def resume_vendor_deletes(bind, batch_size: int, lease: float) -> int:
+    """
+    At startup: finish the batched vendor deletes whose job stopped; returns how many.
+
+    A running job renews its mark every batch, so only marks older than `lease` seconds are taken
+    over; workers starting together race on the same compare-and-set and one of them wins.
+    """
+    try:
+        with Session(bind=bind) as db:
+            pending = db.execute(
+                select(Vendor.id, Vendor.deleting_since).where(
+                    Vendor.deleting_since < utcnow() - timedelta(seconds=lease)
+                )
+            ).all()
+            claimed = [(vendor_id, _mark_deleting(db, vendor_id, since)) for vendor_id, since in pending]
+            db.commit()
+    except Exception as e:
+        log.error(f"❌ Error resuming vendor deletes: {type(e).__name__}: {str(e)}", exc_info=True)
+        return 0
+    claimed = [(vendor_id, stamp) for vendor_id, stamp in claimed if stamp is not None]
+    for vendor_id, stamp in claimed:
+        log.info(f"🗑️ Resuming batched vendor delete: vendor_id={vendor_id}")
+        _delete_vendor_in_batches(vendor_id, bind, batch_size, stamp)
+    return len(claimed)
+
+
+@router.delete(
+    "/{vendor_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"description": "Batched delete scheduled (async=true)"}},
+)
+def delete_vendor(
+    vendor_id: int,
+    background_tasks: BackgroundTasks,
+    run_async: bool = Query(
+        False, alias="async", description="Return 202 and delete the vendor's products in background batches"
+    ),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Delete a vendor. Its products are removed by the database (ON DELETE CASCADE), never loaded."""
+    try:
+        if run_async:
+            log.info(f"🗑️ Scheduling batched vendor delete: vendor_id={vendor_id}")
+            # Committed before the job starts, so the delete is resumed if the job stops; a job
+            # already running for the vendor loses its lease and stops at its next batch
+            stamp = _mark_deleting(db, vendor_id)
+            if stamp is None:
+                log.warning(f"⚠️ Vendor not found: vendor_id={vendor_id}")
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vendor not found")
+            db.commit()
+            background_tasks.add_task(
+                _delete_vendor_in_batches, vendor_id, db.get_bind(), get_settings().VENDOR_DELETE_BATCH_SIZE, stamp
+            )
+            return Response(status_code=status.HTTP_202_ACCEPTED)
         log.info(f"🗑️ Deleting vendor: vendor_id={vendor_id}")
-        vendor = _get_vendor_or_404(vendor_id, db)
-        vendor_name = vendor.name
-        db.delete(vendor)
+        # The products go by ON DELETE CASCADE; tombstone them first, in the same transaction
+        record_product_deletions(db, Product.vendor_id == vendor_id)
+        result = db.execute(
+            delete(Vendor).where(Vendor.id == vendor_id).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            log.warning(f"⚠️ Vendor not found: vendor_id={vendor_id}")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vendor not found")
+        record_change(db, "vendor", vendor_id, "deleted")
         db.commit()
-        log.info(f"✅ Vendor deleted: vendor_id={vendor_id}, name={vendor_name}")
+        _invalidate_vendor(vendor_id)
+        log.info(f"✅ Vendor deleted: vendor_id={vendor_id}")
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,39 @@
+"""Pydantic schemas for batch API."""
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class BatchSubRequest(BaseModel):
+    """One API call inside POST /api/batch."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    id: Optional[str] = Field(None, description="Echoed in the matching response; defaults to the position")
+    method: Literal["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., description="API path with optional query string, e.g. /api/products/?vendor_id=1")
+    headers: Dict[str, str] = Field(default_factory=dict, description="Extra headers, e.g. If-None-Match")
+    body: Optional[Any] = Field(None, description="JSON request body")
+
+
+class BatchRequest(BaseModel):
+    """Request body for POST /api/batch."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+
+class BatchSubResponse(BaseModel):
+    """Result of one sub-request."""
+
+    id: str
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = Field(None, description="JSON body, text for other content types, null when empty")
+
+
+class BatchResponse(BaseModel):
+    """Response body for POST /api/batch: one entry per sub-request, in request order."""
+
+    responses: List[BatchSubResponse]
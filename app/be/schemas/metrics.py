@@ -0,0 +1,26 @@
+"""Pydantic schemas for metrics API."""
+from typing import Dict
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class TimingStats(BaseModel):
+    """Summary of recorded durations in seconds."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    count: int = Field(..., description="Number of samples")
+    total: float = Field(..., description="Sum of all samples")
+    max: float = Field(..., description="Slowest sample")
+    avg: float = Field(..., description="Mean sample")
+
+
+class MetricsResponse(BaseModel):
+    """Response body for GET /api/metrics/ (values are per worker process)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    counters: Dict[str, int] = Field(default_factory=dict, description="Monotonic counters")
+    timings: Dict[str, TimingStats] = Field(default_factory=dict, description="Duration summaries")
+    pool: Dict[str, float] = Field(default_factory=dict, description="DB connection pool occupancy")
+    threadpool: Dict[str, float] = Field(default_factory=dict, description="Sync handler thread limiter")
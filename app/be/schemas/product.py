@@ -1,9 +1,9 @@
 """Pydantic schemas for Product API."""
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class ProductCreate(BaseModel):
@@ -42,3 +42,98 @@ class ProductResponse(BaseModel):
     vendor_id: int = Field(..., description="Vendor ID")
     vendor_name: Optional[str] = Field(None, description="Vendor company name")
     created_at: datetime = Field(..., description="Creation timestamp")
+    updated_at: datetime = Field(..., description="Last modification timestamp")
+    version: int = Field(..., description="Row version, bumped on every update (also the ETag)")
+
+
+class ProductIdsRequest(BaseModel):
+    """Request body for POST /api/products/lookup (batch get for lists too long for a URL)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    ids: List[int] = Field(..., min_length=1, description="Product IDs, in the order to return them")
+    vendor_id: Optional[int] = Field(None, gt=0, description="Filter by vendor ID")
+
+
+class ProductBatchResponse(BaseModel):
+    """Response body for a batch get by id list."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    products: List[ProductResponse] = Field(..., description="Found products, in request order")
+    missing: List[int] = Field(..., description="Requested IDs with no product")
+
+
+class ProductTombstoneResponse(BaseModel):
+    """A deleted product in a delta sync page."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    id: int = Field(..., description="ID of the deleted product")
+    vendor_id: int = Field(..., description="Vendor the product belonged to")
+    deleted_at: datetime = Field(..., description="Deletion timestamp")
+
+
+class ProductChangesResponse(BaseModel):
+    """Response body for GET /api/products/changes (delta sync), oldest change first."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    products: List[ProductResponse] = Field(..., description="Products created or updated since the cursor")
+    deleted: List[ProductTombstoneResponse] = Field(..., description="Products deleted since the cursor")
+    next_cursor: Optional[str] = Field(
+        None, description="Resume point: pass as cursor for the next page, or later for the next sync"
+    )
+    has_more: bool = Field(..., description="More changes are available right away")
+
+
+class VendorProductResponse(BaseModel):
+    """Product row in GET /api/vendors/{id}/products (vendor fields are in the response header block)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    id: int = Field(..., description="Product ID")
+    name: str = Field(..., description="Product name")
+    sku: Optional[str] = Field(None, description="Stock keeping unit")
+    description: Optional[str] = Field(None, description="Product description")
+    price: Decimal = Field(..., description="Unit price")
+    created_at: datetime = Field(..., description="Creation timestamp")
+
+
+class PriceUpdateItem(BaseModel):
+    """One entry of a bulk price update; the product is identified by exactly one of id / sku."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    id: Optional[int] = Field(None, gt=0, description="Product ID")
+    sku: Optional[str] = Field(None, min_length=1, max_length=100, description="Stock keeping unit")
+    price: Decimal = Field(..., ge=0, description="New unit price")
+
+    @model_validator(mode="after")
+    def _one_key(self) -> "PriceUpdateItem":
+        if (self.id is None) == (self.sku is None):
+            raise ValueError("Give exactly one of id or sku")
+        return self
+
+
+class PriceUpdateResult(BaseModel):
+    """Outcome of one bulk price update entry, in request order."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    id: Optional[int] = Field(None, description="Product ID (as requested, or resolved from sku)")
+    sku: Optional[str] = Field(None, description="Stock keeping unit (as requested)")
+    price: Decimal = Field(..., description="Requested unit price")
+    status: Literal["updated", "not_found"] = Field(
+        ..., description="not_found: no such product in the caller's vendor catalog"
+    )
+
+
+class PriceUpdateResponse(BaseModel):
+    """Response body for PATCH /api/products/prices."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    updated: int = Field(..., description="Number of entries applied")
+    not_found: int = Field(..., description="Number of entries that matched no product of the vendor")
+    results: List[PriceUpdateResult] = Field(..., description="Per-entry outcomes, in request order")
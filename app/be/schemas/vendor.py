@@ -1,9 +1,11 @@
 """Pydantic schemas for Vendor API."""
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from be.schemas.product import VendorProductResponse
+
 
 class VendorCreate(BaseModel):
     """Request body for creating a vendor."""
@@ -41,3 +43,17 @@ class VendorResponse(BaseModel):
     email: Optional[str] = Field(None, description="Email address")
     phone_number: Optional[str] = Field(None, description="Phone number")
     created_at: datetime = Field(..., description="Creation timestamp")
+    updated_at: datetime = Field(..., description="Last modification timestamp")
+    version: int = Field(..., description="Row version, bumped on every update (also the ETag)")
+    product_count: Optional[int] = Field(
+        None, description="Number of products (only with include=product_count on the list endpoint)"
+    )
+
+
+class VendorProductsResponse(BaseModel):
+    """Response body for GET /api/vendors/{id}/products: the vendor once, then a page of its products."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    vendor: VendorResponse = Field(..., description="Vendor the products belong to")
+    products: List[VendorProductResponse] = Field(..., description="Products, newest first")
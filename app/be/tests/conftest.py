@@ -1,27 +1,38 @@
 """Pytest fixtures for B2Bmarket backend TDD."""
 import os
+import shutil
 import sys
-from typing import Generator, Any
+import tempfile
+from typing import Any, Generator, List
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
 # Ensure app and config are importable
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from be.database import Base, get_db
-from be.routers import auth, health, ping, vendors, products
+from be.database import Base, enable_sqlite_foreign_keys, get_db, install_lazy_load_guard
+from be.utils.deadline import enable_request_deadlines
+from be.utils.idempotency import idempotency_cache
+from be.routers import auth, batch, changes, health, metrics, ping, vendors, products
+from be.utils.response_cache import response_cache
 from config import get_settings
 
-# Use SQLite for tests so TDD works without Postgres
+# Use SQLite for tests so TDD works without Postgres. A relative path (the default) would depend on
+# the working directory and leave the file in the tree, so that goes to a per-run temp directory.
+TEST_DB_DIR = tempfile.mkdtemp(prefix="b2bmarket-tests-")
 TEST_DATABASE_URL = get_settings().DATABASE_UT_URL
-if TEST_DATABASE_URL.startswith("postgresql"):
-    TEST_DATABASE_URL = "sqlite:///./test_b2bmarket.db"
+if TEST_DATABASE_URL.startswith("postgresql") or TEST_DATABASE_URL.startswith("sqlite:///./"):
+    TEST_DATABASE_URL = f"sqlite:///{os.path.join(TEST_DB_DIR, 'test_b2bmarket.db')}"
 engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+enable_sqlite_foreign_keys(engine)
+enable_request_deadlines(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Any relationship lazy load fails the request: routes must pick their loader strategies explicitly
+install_lazy_load_guard()
 
 
 def create_test_app() -> FastAPI:
@@ -29,16 +40,30 @@ def create_test_app() -> FastAPI:
     app = FastAPI()
     app.include_router(ping.router, prefix="/api")
     app.include_router(health.router, prefix="/api")
+    app.include_router(metrics.router, prefix="/api")
     app.include_router(auth.router, prefix="/api")
     app.include_router(vendors.router, prefix="/api")
     app.include_router(products.router, prefix="/api")
+    app.include_router(changes.router, prefix="/api")
+    app.include_router(batch.router, prefix="/api")
     return app
 
 
+@pytest.fixture(scope="session", autouse=True)
+def test_db_dir() -> Generator[str, Any, None]:
+    """Remove the temporary test database when the run ends."""
+    yield TEST_DB_DIR
+    engine.dispose()
+    shutil.rmtree(TEST_DB_DIR, ignore_errors=True)
+
+
 @pytest.fixture(scope="function")
 def app() -> Generator[FastAPI, Any, None]:
     """Create app and fresh DB for each test."""
     Base.metadata.create_all(engine)
+    # Ids and versions restart with every fresh schema, so cached bodies would look current
+    response_cache.clear()
+    idempotency_cache.clear()
     _app = create_test_app()
     yield _app
     Base.metadata.drop_all(engine)
@@ -70,3 +95,18 @@ def client(app: FastAPI, db_session: Session) -> Generator[TestClient, Any, None
     app.dependency_overrides[get_db] = _get_test_db
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture
+def recorded_statements() -> Generator[List[str], Any, None]:
+    """Verbs (SELECT, UPDATE, ...) of the SQL statements run on the test engine; clear it to start counting."""
+    statements: List[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
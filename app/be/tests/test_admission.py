@@ -0,0 +1,112 @@
+"""TDD tests for admission control (per-route-class limits and load shedding)."""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from be.utils.admission import AdmissionLimiter, AdmissionMiddleware, route_class
+from be.utils.metrics import metrics
+from config import get_settings
+
+
+def test_route_class() -> None:
+    """Requests are limited by class; health, ping, metrics and the SSE feed are exempt."""
+    assert route_class("POST", "/api/auth/login") == "auth"
+    assert route_class("GET", "/api/products/42") == "read"
+    assert route_class("GET", "/api/products/lookup") == "read"
+    assert route_class("GET", "/api/products/changes") == "read"
+    assert route_class("GET", "/api/products/") == "export"
+    assert route_class("POST", "/api/products/lookup") == "read"
+    assert route_class("PATCH", "/api/vendors/1") == "write"
+    for path in ("/api/health/", "/api/ping/", "/api/metrics/", "/api/changes/stream", "/docs"):
+        assert route_class("GET", path) is None
+
+
+def test_limiter_queues_then_sheds() -> None:
+    """Past the limit requests queue in order; past the queue they are shed at once."""
+
+    async def scenario():
+        limiter = AdmissionLimiter("read", limit=1, queue_size=1, queue_timeout=5)
+        assert await limiter.acquire() is None
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        shed = await limiter.acquire()
+        limiter.release(0.01)
+        return shed, await queued, limiter.active
+
+    shed, queued, active = asyncio.run(scenario())
+    assert shed >= 1
+    assert queued is None
+    assert active == 1
+
+
+def test_limiter_sheds_when_expected_wait_exceeds_deadline() -> None:
+    """With slow recent requests, a request that cannot make the queue deadline is shed right away."""
+
+    async def scenario():
+        limiter = AdmissionLimiter("export", limit=1, queue_size=10, queue_timeout=1.0)
+        assert await limiter.acquire() is None
+        limiter.release(3.0)  # the class takes ~3 s per request
+        assert await limiter.acquire() is None
+        return await limiter.acquire()
+
+    assert asyncio.run(scenario()) == 3.0
+
+
+def test_limiter_queue_timeout() -> None:
+    """A queued request that is not admitted within the queue timeout gets a Retry-After."""
+
+    async def scenario():
+        limiter = AdmissionLimiter("write", limit=1, queue_size=10, queue_timeout=0.05)
+        assert await limiter.acquire() is None
+        retry_after = await limiter.acquire()
+        limiter.release(0.01)
+        return retry_after, limiter.active
+
+    retry_after, active = asyncio.run(scenario())
+    assert retry_after >= 1
+    assert active == 0
+
+
+def test_middleware_sheds_with_503(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Overloaded classes answer 503 + Retry-After; other classes and exempt routes are unaffected."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "ADMISSION_WRITE_LIMIT", 1)
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZE", 0)
+    metrics.reset()
+
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.post("/api/vendors/")
+    async def slow_write():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/api/vendors/")
+    async def read():
+        return []
+
+    @app.get("/api/ping/")
+    async def ping():
+        return {"pong": True}
+
+    app.add_middleware(AdmissionMiddleware)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.post("/api/vendors/"))
+            await asyncio.sleep(0.05)
+            shed = await client.post("/api/vendors/")
+            others = [await client.get("/api/vendors/"), await client.get("/api/ping/")]
+            release.set()
+            return (await first), shed, others
+
+    first, shed, others = asyncio.run(scenario())
+    assert first.status_code == 200
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "1"
+    assert [r.status_code for r in others] == [200, 200]
+    assert metrics.counter("admission.write.shed") == 1
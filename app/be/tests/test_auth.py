@@ -1,6 +1,7 @@
 """TDD tests for B2Bmarket Authentication API."""
 import pytest
 from fastapi.testclient import TestClient
+from be.utils.invalidation import invalidation_bus
 from be.utils.password import hash_password
 from be.models.user import User
 
@@ -115,3 +116,28 @@ def test_verify_token(client: TestClient, db_session) -> None:
     data = response.json()
     assert data["valid"] is True
     assert data["user"]["email"] == "test@example.com"
+
+
+def test_deactivated_user_rejected_at_once(client: TestClient, db_session) -> None:
+    """A user deactivated after login is refused on the very next authenticated request."""
+    client.post("/api/vendors/", json={"name": "Shop", "email": "shop@example.com"})
+    login = client.post("/api/auth/login", json={"email": "shop@example.com", "password": "shop@example.com"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert client.post("/api/products/", json={"name": "A", "price": "1"}, headers=headers).status_code == 201
+
+    db_session.query(User).filter(User.email == "shop@example.com").update({"active": False})
+    db_session.commit()
+    response = client.post("/api/products/", json={"name": "B", "price": "1"}, headers=headers)
+    assert response.status_code == 403
+
+
+def test_login_publishes_user_invalidation(client: TestClient, db_session, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A login rotates the user's token salt and tells every worker through the invalidation bus."""
+    user = User(email="test@example.com", password_hash=hash_password("password123"), active=True, status="ACTIVE")
+    db_session.add(user)
+    db_session.commit()
+    published = []
+    monkeypatch.setattr(invalidation_bus, "publish", lambda kind, ids: published.append((kind, list(ids))))
+    response = client.post("/api/auth/login", json={"email": "test@example.com", "password": "password123"})
+    assert response.status_code == 200
+    assert published == [("user", [user.id])]
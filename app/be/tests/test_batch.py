@@ -0,0 +1,177 @@
+"""TDD tests for B2Bmarket batch endpoint (POST /api/batch)."""
+import asyncio
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from be.routers import batch
+from be.utils.admission import AdmissionMiddleware, route_class
+from be.utils.deadline import TIMEOUT_HEADER, DeadlineMiddleware, remaining_time
+from be.utils.jwt import create_access_token
+from be.utils.metrics import metrics
+from config import get_settings
+
+VENDOR_EMAIL = "shop@example.com"
+
+
+@pytest.fixture(autouse=True)
+def sequential_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Sub-requests share the test session, which must not be used from two threads at once."""
+    monkeypatch.setattr(get_settings(), "BATCH_MAX_CONCURRENCY", 1)
+
+
+@pytest.fixture
+def auth_headers(client: TestClient) -> dict:
+    """Authorization header for a vendor's user (password = vendor email)."""
+    assert client.post("/api/vendors/", json={"name": "Shop", "email": VENDOR_EMAIL}).status_code == 201
+    login = client.post("/api/auth/login", json={"email": VENDOR_EMAIL, "password": VENDOR_EMAIL})
+    assert login.status_code == 200
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_batch_returns_responses_in_order(client: TestClient, auth_headers: dict) -> None:
+    """Reads and writes run in order; each sub-response carries its id, status, headers and body."""
+    response = client.post(
+        "/api/batch",
+        json={
+            "requests": [
+                {
+                    "id": "create",
+                    "method": "POST",
+                    "path": "/api/products/",
+                    "body": {"name": "Widget", "price": "9.99"},
+                },
+                {"id": "list", "path": "/api/products/?limit=10"},
+                {"path": "/api/vendors/999"},
+                {"id": "ping", "path": "/api/ping/"},
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    created, listing, missing, ping = response.json()["responses"]
+    assert (created["id"], created["status"]) == ("create", 201)
+    assert created["body"]["name"] == "Widget"
+    assert listing["status"] == 200
+    assert [p["id"] for p in listing["body"]] == [created["body"]["id"]]
+    assert (missing["id"], missing["status"]) == ("2", 404)
+    assert missing["body"] == {"detail": "Vendor not found"}
+    assert ping["body"] == {"status": "ok"}
+
+
+def test_batch_resolves_auth_once(client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The batch's token is checked once; sub-requests needing auth share the result, good or bad."""
+    calls = []
+    resolve = batch.get_current_user
+
+    def counting_resolve(request, db):
+        calls.append(request.url.path)
+        return resolve(request, db)
+
+    monkeypatch.setattr(batch, "get_current_user", counting_resolve)
+    product = {"method": "POST", "path": "/api/products/", "body": {"name": "Widget", "price": "1"}}
+    response = client.post("/api/batch", json={"requests": [product, product]}, headers=auth_headers)
+    assert [r["status"] for r in response.json()["responses"]] == [201, 201]
+    assert calls == ["/api/batch"]
+
+    bad = {"Authorization": f"Bearer {create_access_token({'sub': 'nobody@example.com', 'user_id': 999}, 'salt')}"}
+    response = client.post("/api/batch", json={"requests": [product, {"path": "/api/ping/"}]}, headers=bad)
+    assert [r["status"] for r in response.json()["responses"]] == [401, 200]
+
+
+def test_batch_rejects_unsupported_requests(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Nested batches, streams, non-API paths, per-call credentials and oversized batches are refused."""
+    for sub in (
+        {"path": "/api/batch"},
+        {"path": "/api/changes/stream"},
+        {"path": "/docs"},
+        {"path": "/api/ping/", "headers": {"Authorization": "Bearer x"}},
+    ):
+        assert client.post("/api/batch", json={"requests": [sub]}).status_code == 400
+    monkeypatch.setattr(get_settings(), "BATCH_MAX_REQUESTS", 2)
+    response = client.post("/api/batch", json={"requests": [{"path": "/api/ping/"}] * 3})
+    assert response.status_code == 400
+
+
+def test_batch_runs_reads_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Consecutive reads overlap up to BATCH_MAX_CONCURRENCY; a write waits for them and runs alone."""
+    monkeypatch.setattr(get_settings(), "BATCH_MAX_CONCURRENCY", 2)
+    events = []
+    running = 0
+    peak = 0
+    probe = APIRouter()
+
+    @probe.api_route("/probe/{name}", methods=["GET", "POST"])
+    async def probe_call(name: str):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        events.append(f"start {name}")
+        await asyncio.sleep(0.05)
+        events.append(f"end {name}")
+        running -= 1
+        return {"name": name}
+
+    app = FastAPI()
+    app.include_router(probe, prefix="/api")
+    app.include_router(batch.router, prefix="/api")
+    calls = [{"path": "/api/probe/r1"}, {"path": "/api/probe/r2"}, {"path": "/api/probe/r3"}]
+    calls += [{"method": "POST", "path": "/api/probe/w"}, {"path": "/api/probe/r4"}]
+    with TestClient(app) as c:
+        response = c.post("/api/batch", json={"requests": calls})
+    assert [r["body"]["name"] for r in response.json()["responses"]] == ["r1", "r2", "r3", "w", "r4"]
+    assert peak == 2
+    assert events.index("start w") > max(events.index(f"end {name}") for name in ("r1", "r2", "r3"))
+    assert events.index("start r4") > events.index("end w")
+
+
+def _probe_app(*middleware) -> FastAPI:
+    """App with the batch router and GET/POST /api/probe/{name}: waits `wait` seconds, reports its time left."""
+    probe = APIRouter()
+
+    @probe.api_route("/probe/{name}", methods=["GET", "POST"])
+    async def probe_call(name: str, wait: float = 0):
+        time_left = remaining_time()
+        await asyncio.sleep(wait)
+        return {"name": name, "time_left": time_left}
+
+    app = FastAPI()
+    app.include_router(probe, prefix="/api")
+    app.include_router(batch.router, prefix="/api")
+    for cls in middleware:
+        app.add_middleware(cls)
+    return app
+
+
+def test_batch_admits_each_subrequest(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The batch itself is not limited; each sub-request is admitted (or shed) by its own route class."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "BATCH_MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "ADMISSION_READ_LIMIT", 1)
+    monkeypatch.setattr(settings, "ADMISSION_WRITE_LIMIT", 1)
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZE", 0)
+    assert route_class("POST", "/api/batch") is None
+    metrics.reset()
+    calls = [{"path": "/api/probe/r1?wait=0.05"}, {"path": "/api/probe/r2"}]
+    calls.append({"method": "POST", "path": "/api/probe/w"})
+    with TestClient(_probe_app(AdmissionMiddleware)) as c:
+        response = c.post("/api/batch", json={"requests": calls})
+    assert response.status_code == 200
+    r1, r2, w = response.json()["responses"]
+    assert (r1["status"], r2["status"], w["status"]) == (200, 503, 200)
+    assert r2["headers"]["retry-after"] == "1"
+    assert metrics.counter("admission.read.shed") == 1
+    assert metrics.counter("admission.write.admitted") == 1
+
+
+def test_batch_subrequests_share_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Sub-requests run within the batch's deadline; those left when it has passed answer 504 unrun."""
+    calls = [{"method": "POST", "path": "/api/probe/slow?wait=0.2"}, {"path": "/api/probe/late"}]
+    with TestClient(_probe_app(DeadlineMiddleware)) as c:
+        response = c.post("/api/batch", json={"requests": calls}, headers={TIMEOUT_HEADER: "0.1"})
+        fast = c.post("/api/batch", json={"requests": [{"path": "/api/probe/a"}]}, headers={TIMEOUT_HEADER: "5"})
+    slow, late = response.json()["responses"]
+    assert slow["status"] == 200 and 0 < slow["body"]["time_left"] <= 0.1
+    assert late["status"] == 504
+    assert 4 < fast.json()["responses"][0]["body"]["time_left"] <= 5
@@ -0,0 +1,126 @@
+"""TDD tests for the catalog change outbox and SSE change feed."""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from be.models.catalog_change import CatalogChange
+from be.routers.changes import format_event
+from be.tests.conftest import engine
+from be.utils.change_feed import ChangeFeed
+from be.utils.metrics import metrics
+from config import get_settings
+
+
+def _changes(db_session: Session) -> list:
+    return [
+        (c.entity, c.entity_id, c.action)
+        for c in db_session.query(CatalogChange).order_by(CatalogChange.id)
+    ]
+
+
+def test_mutations_write_outbox(client: TestClient, db_session: Session) -> None:
+    """Every product/vendor mutation appends to catalog_changes in its own transaction."""
+    vendor = client.post("/api/vendors/", json={"name": "Shop", "email": "shop@example.com"}).json()
+    client.patch(f"/api/vendors/{vendor['id']}", json={"name": "Shop 2"})
+    login = client.post("/api/auth/login", json={"email": "shop@example.com", "password": "shop@example.com"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    product = client.post("/api/products/", json={"name": "P", "sku": "S", "price": "1"}, headers=headers).json()
+    client.patch(f"/api/products/{product['id']}", json={"name": "P2"})
+    client.patch("/api/products/prices", json=[{"sku": "S", "price": "2"}], headers=headers)
+    assert client.delete(f"/api/vendors/{vendor['id']}").status_code == 204
+
+    assert _changes(db_session) == [
+        ("vendor", vendor["id"], "created"),
+        ("vendor", vendor["id"], "updated"),
+        ("product", product["id"], "created"),
+        ("product", product["id"], "updated"),
+        ("product", product["id"], "updated"),
+        ("product", product["id"], "deleted"),
+        ("vendor", vendor["id"], "deleted"),
+    ]
+
+
+def _append(n: int) -> None:
+    with Session(bind=engine) as db:
+        db.execute(insert(CatalogChange), [{"entity": "product", "entity_id": i, "action": "updated"} for i in range(n)])
+        db.commit()
+
+
+async def _take(stream, n: int) -> list:
+    events = []
+    while len(events) < n:
+        event = await asyncio.wait_for(stream.__anext__(), 5)
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def test_change_feed_fans_out_one_poll(app: FastAPI, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Two subscribers get every change while the feed runs one outbox query per poll."""
+    monkeypatch.setattr(get_settings(), "CHANGE_FEED_POLL_INTERVAL", 0.01)
+    queries = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM catalog_changes" in statement:
+            queries.append(statement)
+
+    async def scenario():
+        feed = ChangeFeed()
+        first = await feed.subscribe(engine)
+        second = await feed.subscribe(engine)
+        polls_before = metrics.counter("changes.feed.polls")
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            _append(3)
+            got = await _take(first, 3), await _take(second, 3)
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+            polls = metrics.counter("changes.feed.polls") - polls_before
+            await first.aclose()
+            await second.aclose()
+            await feed.stop()
+        return got, polls
+
+    (a, b), polls = asyncio.run(scenario())
+    assert [e["offset"] for e in a] == [e["offset"] for e in b] == [1, 2, 3]
+    assert len(queries) <= polls + 1  # one query per poll (+ one still in flight), not per subscriber
+
+
+def test_change_feed_resumes_after_offset(app: FastAPI, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A subscriber with an offset first replays the outbox after it, then follows the live feed."""
+    monkeypatch.setattr(get_settings(), "CHANGE_FEED_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(get_settings(), "CHANGE_FEED_BATCH_SIZE", 2)
+    _append(5)
+
+    async def scenario():
+        feed = ChangeFeed()
+        stream = await feed.subscribe(engine, after=1)
+        try:
+            replayed = await _take(stream, 4)
+            _append(1)
+            live = await _take(stream, 1)
+        finally:
+            await stream.aclose()
+            await feed.stop()
+        return replayed, live
+
+    replayed, live = asyncio.run(scenario())
+    assert [e["offset"] for e in replayed] == [2, 3, 4, 5]
+    assert [e["offset"] for e in live] == [6]
+
+
+def test_format_event() -> None:
+    """SSE messages carry the offset as id and entity.action as the event type."""
+    message = format_event({"offset": 7, "entity": "vendor", "id": 3, "action": "deleted", "version": None})
+    assert message.startswith("id: 7\nevent: vendor.deleted\ndata: {")
+    assert message.endswith("\n\n")
+
+
+def test_stream_rejects_bad_last_event_id(client: TestClient) -> None:
+    """A non-numeric Last-Event-ID is a 400, not a silent restart from now."""
+    response = client.get("/api/changes/stream", headers={"Last-Event-ID": "abc"})
+    assert response.status_code == 400
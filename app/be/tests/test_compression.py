@@ -0,0 +1,116 @@
+"""TDD tests for HTTP response compression and the compressed body cache."""
+import asyncio
+from typing import Any, Generator, Optional
+
+import pytest
+from fastapi import FastAPI, Header, Response
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from be.database import get_db
+from be.utils.compression import CompressionMiddleware, compressed_cache, negotiate_encoding
+from be.utils.etag import if_match_versions, make_etag, not_modified
+from be.utils.metrics import metrics
+
+
+@pytest.fixture
+def client(app: FastAPI, db_session: Session) -> Generator[TestClient, Any, None]:
+    """Test app behind CompressionMiddleware."""
+    app.add_middleware(CompressionMiddleware)
+    app.dependency_overrides[get_db] = lambda: db_session
+    compressed_cache.clear()
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def vendors(client: TestClient) -> None:
+    """Enough vendors for a listing above COMPRESSION_MIN_SIZE."""
+    for i in range(8):
+        client.post("/api/vendors/", json={"name": f"Vendor {i}", "email": f"vendor{i}@example.com"})
+
+
+def test_negotiate_encoding() -> None:
+    """q-values are honoured and unsupported codings ignored."""
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding("") is None
+
+
+def test_large_list_is_gzipped(client: TestClient, vendors: None) -> None:
+    """A listing above the threshold is gzipped for clients that accept it, and varies on it."""
+    plain = client.get("/api/vendors/", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/api/vendors/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in plain.headers
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["vary"] == "Accept-Encoding"
+    assert int(zipped.headers["content-length"]) < len(plain.content)
+    assert zipped.json() == plain.json()
+
+
+def test_small_body_is_not_compressed(client: TestClient) -> None:
+    """Bodies under COMPRESSION_MIN_SIZE are sent as they are."""
+    response = client.get("/api/ping/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_body_is_cached(client: TestClient, vendors: None) -> None:
+    """The same payload is compressed once; later hits reuse the compressed bytes."""
+    metrics.reset()
+    first = client.get("/api/vendors/", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/api/vendors/", headers={"Accept-Encoding": "gzip"})
+    assert metrics.counter("compression.cache.misses") == 1
+    assert metrics.counter("compression.cache.hits") == 1
+    assert second.json() == first.json()
+    assert len(compressed_cache) == 1
+
+
+def test_compressed_representation_has_own_etag(app: FastAPI, client: TestClient) -> None:
+    """A gzipped body gets an encoded ETag; revalidating with it answers 304 with the same tag."""
+
+    @app.get("/api/big")
+    def big(response: Response, if_none_match: Optional[str] = Header(None)):
+        if not_modified(if_none_match, 7):
+            return Response(status_code=304, headers={"ETag": make_etag(7)})
+        response.headers["ETag"] = make_etag(7)
+        return {"data": "x" * 2048}
+
+    plain = client.get("/api/big", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/api/big", headers={"Accept-Encoding": "gzip"})
+    assert plain.headers["etag"] == '"7"'
+    assert zipped.headers["etag"] == '"7-gzip"'
+    revalidated = client.get("/api/big", headers={"Accept-Encoding": "gzip", "If-None-Match": '"7-gzip"'})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == '"7-gzip"'
+    assert revalidated.headers["vary"] == "Accept-Encoding"
+    assert if_match_versions('"7-gzip"') == [(7,)]
+    assert if_match_versions('"7.2-gzip", "7-deflate"') == [(7, 2)]
+
+
+def test_small_json_varies_on_accept_encoding(client: TestClient) -> None:
+    """Uncompressed JSON still varies on Accept-Encoding, as a larger body would be compressed."""
+    response = client.get("/api/ping/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize("content_type", ["text/event-stream", "application/json"])
+def test_stream_starts_before_first_body(content_type: str) -> None:
+    """SSE and other responses without Content-Length are started at once, not held for a body."""
+    sent = []
+
+    async def stream(scope, receive, send) -> None:
+        headers = [(b"content-type", content_type.encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        # The client has the headers before the (slow) first event
+        assert [message["type"] for message in sent] == ["http.response.start"]
+        await send({"type": "http.response.body", "body": b"x" * 4096, "more_body": False})
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(stream)(scope, None, send))
+    assert sent[1]["body"] == b"x" * 4096
+    assert b"content-encoding" not in dict(sent[0]["headers"])
@@ -0,0 +1,78 @@
+"""TDD tests for per-request deadlines propagated to database statements."""
+import time
+from typing import Any, Generator
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from be.database import get_db
+from be.utils.deadline import DeadlineMiddleware, request_timeout
+from be.utils.metrics import metrics
+from config import get_settings
+
+# Runs for many seconds on SQLite unless interrupted
+SLOW_QUERY = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1000000000) "
+    "SELECT count(*) FROM c"
+)
+
+
+@pytest.fixture
+def client(app: FastAPI, db_session: Session) -> Generator[TestClient, Any, None]:
+    """Test app behind DeadlineMiddleware, plus a route with a pathological query."""
+    router = APIRouter()
+
+    @router.get("/api/slow")
+    def slow(db: Session = Depends(get_db)) -> dict:
+        # Same error handling as the API routers: unexpected errors become 500
+        try:
+            return {"count": db.execute(text(SLOW_QUERY)).scalar()}
+        except HTTPException:
+            raise
+        except Exception:
+            raise HTTPException(status_code=500, detail="Failed")
+
+    app.include_router(router)
+    app.add_middleware(DeadlineMiddleware)
+    app.dependency_overrides[get_db] = lambda: db_session
+    with TestClient(app) as c:
+        yield c
+
+
+def test_request_timeout_header(monkeypatch: pytest.MonkeyPatch) -> None:
+    """X-Request-Timeout overrides REQUEST_TIMEOUT up to REQUEST_TIMEOUT_MAX; bad values are ignored."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT", 30.0)
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_MAX", 60.0)
+    assert request_timeout(None) == 30.0
+    assert request_timeout("2.5") == 2.5
+    assert request_timeout("600") == 60.0
+    assert request_timeout("soon") == 30.0
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT", 0)
+    assert request_timeout(None) is None
+
+
+def test_slow_query_interrupted_with_504(client: TestClient) -> None:
+    """A statement running past the request deadline is interrupted and answered 504."""
+    metrics.reset()
+    started = time.monotonic()
+    response = client.get("/api/slow", headers={"X-Request-Timeout": "0.2"})
+    assert response.status_code == 504
+    assert time.monotonic() - started < 5
+    assert metrics.counter("deadline.exceeded") == 1
+
+
+def test_expired_deadline_skips_database(client: TestClient) -> None:
+    """A request whose deadline passed before its first transaction gets 504 without querying."""
+    response = client.get("/api/products/", headers={"X-Request-Timeout": "0.000001"})
+    assert response.status_code == 504
+
+
+def test_deadline_cleared_after_response(client: TestClient) -> None:
+    """Normal requests are unaffected, and later requests on the same connection are not interrupted."""
+    assert client.get("/api/products/", headers={"X-Request-Timeout": "0.5"}).status_code == 200
+    time.sleep(0.6)
+    assert client.get("/api/products/").status_code == 200
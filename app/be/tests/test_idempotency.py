@@ -0,0 +1,148 @@
+"""TDD tests for B2Bmarket Idempotency-Key support on POST /api/products and /api/vendors."""
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from be.models.idempotency_key import IdempotencyKey
+from be.models.product import Product, utcnow
+from be.models.vendor import Vendor
+from be.routers import vendors
+from be.utils.idempotency import idempotency_cache
+from config import get_settings
+
+VENDOR_EMAIL = "shop@example.com"
+
+
+def _count(db: Session, model) -> int:
+    return db.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_vendor_retry_replays_without_rerunning(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A retried POST /api/vendors/ returns the stored response: no second vendor, no second bcrypt hash."""
+    hashes = []
+    hash_password = vendors.hash_password
+    monkeypatch.setattr(vendors, "hash_password", lambda value: hashes.append(value) or hash_password(value))
+    body = {"name": "Shop", "email": VENDOR_EMAIL}
+    headers = {"Idempotency-Key": "vendor-1"}
+
+    first = client.post("/api/vendors/", json=body, headers=headers)
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+    idempotency_cache.clear()  # replay from the table, as another worker would
+    retry = client.post("/api/vendors/", json=body, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert retry.headers["ETag"] == first.headers["ETag"]
+    assert len(hashes) == 1
+    assert _count(db_session, Vendor) == 1
+
+    # Without a key every POST creates a vendor, as before
+    assert client.post("/api/vendors/", json={"name": "Other"}).status_code == 201
+    assert client.post("/api/vendors/", json={"name": "Other"}).status_code == 201
+    assert _count(db_session, Vendor) == 3
+
+
+def test_key_reused_for_different_request(client: TestClient) -> None:
+    """The same key with another body is refused; keys are 1 to 255 characters."""
+    headers = {"Idempotency-Key": "vendor-1"}
+    assert client.post("/api/vendors/", json={"name": "Shop"}, headers=headers).status_code == 201
+    response = client.post("/api/vendors/", json={"name": "Other shop"}, headers=headers)
+    assert response.status_code == 422
+    too_long = {"Idempotency-Key": "x" * 256}
+    assert client.post("/api/vendors/", json={"name": "Shop"}, headers=too_long).status_code == 400
+
+
+def test_vendor_keys_are_per_client(app: FastAPI, client: TestClient) -> None:
+    """Unauthenticated sign-ups scope keys by client address: another caller's key does not collide."""
+    headers = {"Idempotency-Key": "signup-1"}
+    assert client.post("/api/vendors/", json={"name": "Shop"}, headers=headers).status_code == 201
+    with TestClient(app, client=("203.0.113.7", 50000)) as other:
+        response = other.post("/api/vendors/", json={"name": "Other shop"}, headers=headers)
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+
+
+def test_product_keys_are_per_user(client: TestClient, db_session: Session) -> None:
+    """POST /api/products/ replays per caller: another vendor's user may use the same key."""
+    tokens = []
+    for email in (VENDOR_EMAIL, "other@example.com"):
+        assert client.post("/api/vendors/", json={"name": email, "email": email}).status_code == 201
+        login = client.post("/api/auth/login", json={"email": email, "password": email})
+        tokens.append({"Authorization": f"Bearer {login.json()['access_token']}", "Idempotency-Key": "p-1"})
+    body = {"name": "Widget", "price": "9.99"}
+
+    first = client.post("/api/products/", json=body, headers=tokens[0])
+    retry = client.post("/api/products/", json=body, headers=tokens[0])
+    other = client.post("/api/products/", json=body, headers=tokens[1])
+    assert first.status_code == retry.status_code == other.status_code == 201
+    assert retry.json() == first.json()
+    assert other.json()["id"] != first.json()["id"]
+    assert _count(db_session, Product) == 2
+
+
+def test_concurrent_duplicate_replays_winner(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A duplicate that lost the race on the unique key rolls back and answers with the stored response."""
+    headers = {"Idempotency-Key": "vendor-1"}
+    first = client.post("/api/vendors/", json={"name": "Shop"}, headers=headers)
+    checks = []
+    replay_response = vendors.replay_response
+
+    def replay_after_race(db, request):
+        # The duplicate's first check ran before the winner committed
+        checks.append(request)
+        return replay_response(db, request) if len(checks) > 1 else None
+
+    monkeypatch.setattr(vendors, "replay_response", replay_after_race)
+    duplicate = client.post("/api/vendors/", json={"name": "Shop"}, headers=headers)
+    assert duplicate.status_code == 201
+    assert duplicate.json() == first.json()
+    assert len(checks) == 2
+
+
+def test_expired_key_runs_again(client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    """After IDEMPOTENCY_TTL a key no longer replays and may be used again."""
+    headers = {"Idempotency-Key": "vendor-1"}
+    first = client.post("/api/vendors/", json={"name": "Shop"}, headers=headers)
+    monkeypatch.setattr(get_settings(), "IDEMPOTENCY_TTL", 0.0)
+    idempotency_cache.clear()
+    again = client.post("/api/vendors/", json={"name": "Shop"}, headers=headers)
+    assert again.status_code == 201
+    assert again.json()["id"] != first.json()["id"]
+    assert _count(db_session, IdempotencyKey) == 1
+
+
+def test_cached_replay_keeps_original_lifetime(
+    client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A stored response loaded from the table is cached only for what is left of its TTL."""
+    headers = {"Idempotency-Key": "vendor-1"}
+    client.post("/api/vendors/", json={"name": "Shop"}, headers=headers)
+    db_session.execute(
+        update(IdempotencyKey).values(created_at=utcnow() - timedelta(seconds=get_settings().IDEMPOTENCY_TTL - 60))
+    )
+    idempotency_cache.clear()
+    puts = []
+    put = idempotency_cache.put
+    monkeypatch.setattr(idempotency_cache, "put", lambda *args: puts.append(args[-1]) or put(*args))
+    retry = client.post("/api/vendors/", json={"name": "Shop"}, headers=headers)
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert len(puts) == 1 and 0 < puts[0] <= 60
+
+
+def test_expired_keys_are_purged_on_write(client: TestClient, db_session: Session) -> None:
+    """Storing a response also deletes expired keys of other requests."""
+    for i in range(3):
+        client.post("/api/vendors/", json={"name": f"Shop {i}"}, headers={"Idempotency-Key": f"old-{i}"})
+    db_session.execute(
+        update(IdempotencyKey).values(created_at=utcnow() - timedelta(seconds=get_settings().IDEMPOTENCY_TTL + 1))
+    )
+    db_session.commit()
+    client.post("/api/vendors/", json={"name": "New"}, headers={"Idempotency-Key": "new"})
+    assert db_session.scalars(select(IdempotencyKey.key)).all() == ["new"]
@@ -0,0 +1,56 @@
+"""Query plan tests: listing queries are served by index scans without a sort step."""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from be.models.product import Product
+from be.models.vendor import Vendor
+
+NUM_VENDORS = 50
+NUM_PRODUCTS = 2000  # enough for ANALYZE statistics to favour the indexes
+
+
+def _seed(db: Session) -> None:
+    now = datetime.now(timezone.utc)
+    db.execute(
+        insert(Vendor),
+        [{"id": v, "name": f"Vendor {v}", "created_at": now - timedelta(minutes=v)} for v in range(1, NUM_VENDORS + 1)],
+    )
+    db.execute(
+        insert(Product),
+        [
+            {
+                "name": f"Product {i}",
+                "price": 10,
+                "vendor_id": i % NUM_VENDORS + 1,
+                "created_at": now - timedelta(seconds=i // 3),  # ties exercise the id tiebreak
+            }
+            for i in range(NUM_PRODUCTS)
+        ],
+    )
+    db.execute(text("ANALYZE"))
+
+
+def _plan(db: Session, query) -> str:
+    sql = query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_listing_queries_use_indexes_without_sort(db_session: Session) -> None:
+    """Product (all / per vendor) and vendor listings walk an index in order; no temp B-tree sort."""
+    _seed(db_session)
+    queries = {
+        "ix_products_created_at_id": db_session.query(Product).order_by(
+            Product.created_at.desc(), Product.id.desc()
+        ),
+        "ix_products_vendor_id_created_at_id": db_session.query(Product)
+        .order_by(Product.created_at.desc(), Product.id.desc())
+        .filter(Product.vendor_id == 7),
+        "ix_vendors_created_at_id": db_session.query(Vendor).order_by(Vendor.created_at.desc(), Vendor.id.desc()),
+    }
+    for index_name, query in queries.items():
+        plan = _plan(db_session, query)
+        assert index_name in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
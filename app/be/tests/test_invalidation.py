@@ -0,0 +1,57 @@
+"""TDD tests for the cross-worker cache invalidation bus."""
+import threading
+from pathlib import Path
+
+import pytest
+
+from be.tests.conftest import engine
+from be.utils.invalidation import InvalidationBus
+from be.utils.metrics import metrics
+from config import get_settings
+
+
+@pytest.fixture
+def two_workers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Two buses talking over the unix-socket backend, as two workers of one host would."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "INVALIDATION_BUS", "unix")
+    # Short path: unix socket paths are limited to ~100 bytes
+    monkeypatch.setattr(settings, "INVALIDATION_SOCKET_DIR", str(tmp_path))
+    buses = [InvalidationBus(), InvalidationBus()]
+    for bus in buses:
+        bus.start(engine)
+    yield buses
+    for bus in buses:
+        bus.stop()
+
+
+def test_invalidation_reaches_other_worker(two_workers) -> None:
+    """A publish runs local handlers at once and the other worker's handlers when the message arrives."""
+    metrics.reset()
+    first, second = two_workers
+    seen = {"first": [], "second": []}
+    arrived = threading.Event()
+    first.subscribe("product", seen["first"].append)
+
+    def _on_second(ids):
+        seen["second"].append(ids)
+        arrived.set()
+
+    second.subscribe("product", _on_second)
+    first.publish("product", [1, 2])
+
+    assert arrived.wait(5)
+    assert seen == {"first": [[1, 2]], "second": [[1, 2]]}
+    assert metrics.counter("invalidation.published") == 1
+    assert metrics.counter("invalidation.received") == 1
+    assert metrics.snapshot()["timings"]["invalidation.delay"]["count"] == 1
+
+
+def test_invalidation_bus_local_only_by_default() -> None:
+    """Without a backend (SQLite, single worker) publish still invalidates this worker."""
+    bus, seen = InvalidationBus(), []
+    bus.start(engine)
+    bus.subscribe("vendor", seen.append)
+    bus.publish("vendor", [3])
+    bus.stop()
+    assert seen == [[3]]
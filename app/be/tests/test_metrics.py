@@ -0,0 +1,72 @@
+"""TDD tests for B2Bmarket metrics API and pool instrumentation."""
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Query
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.orm import Session
+
+from be.database import InstrumentedQueuePool, ReleaseSessionRoute
+from be.utils.metrics import metrics
+
+
+def test_metrics_returns_200(client: TestClient) -> None:
+    """GET /api/metrics/ returns counters, timings and pool occupancy."""
+    response = client.get("/api/metrics/")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"counters", "timings", "pool", "threadpool"} <= set(data)
+    assert "size" in data["pool"]
+
+
+def test_pool_records_wait_and_timeouts(tmp_path) -> None:
+    """An exhausted pool times out and both the wait and the timeout are recorded."""
+    metrics.reset()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+    engine.dispose()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["db.pool.timeouts"] == 1
+    assert snapshot["timings"]["db.pool.wait"]["count"] == 2
+    assert snapshot["timings"]["db.pool.wait"]["max"] >= 0.05
+
+
+def test_session_released_when_endpoint_returns(tmp_path) -> None:
+    """The connection goes back to the pool when the endpoint returns, not at dependency teardown."""
+    metrics.reset()
+    engine = create_engine(f"sqlite:///{tmp_path / 'release.db'}", poolclass=InstrumentedQueuePool)
+    at_teardown = []
+
+    def _get_db():
+        db = Session(bind=engine)
+        try:
+            yield db
+        finally:
+            at_teardown.append(engine.pool.checkedout())
+            db.close()
+
+    router = APIRouter(route_class=ReleaseSessionRoute)
+
+    @router.get("/rows")
+    def rows(n: int = Query(..., ge=1), db: Session = Depends(_get_db)) -> dict:
+        return {"value": db.execute(text("SELECT :n"), {"n": n}).scalar()}
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        assert client.get("/rows", params={"n": 7}).json() == {"value": 7}
+        assert client.get("/rows", params={"n": 0}).status_code == 422
+    engine.dispose()
+
+    # The 422 request got a session too, but never checked out a connection
+    assert at_teardown == [0, 0]
+    assert metrics.snapshot()["timings"]["db.pool.hold"]["count"] == 1
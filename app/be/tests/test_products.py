@@ -0,0 +1,388 @@
+"""TDD tests for B2Bmarket Products API."""
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from be.database import UnexpectedLazyLoad
+from be.routers import products
+from be.models.product import Product
+from be.models.vendor import Vendor
+from be.schemas.product import ProductResponse
+from config import get_settings
+
+VENDOR_EMAIL = "shop@example.com"
+
+
+@pytest.fixture
+def vendor_id(client: TestClient) -> int:
+    """Vendor with a login user (password = vendor email)."""
+    response = client.post("/api/vendors/", json={"name": "Shop", "email": VENDOR_EMAIL})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.fixture
+def auth_headers(client: TestClient, vendor_id: int) -> dict:
+    """Authorization header for the vendor's user."""
+    login = client.post("/api/auth/login", json={"email": VENDOR_EMAIL, "password": VENDOR_EMAIL})
+    assert login.status_code == 200
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _create(client: TestClient, headers: dict, **fields) -> dict:
+    body = {"name": "Widget", "price": "9.99", **fields}
+    response = client.post("/api/products/", json=body, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_create_product(client: TestClient, vendor_id: int, auth_headers: dict) -> None:
+    """POST /api/products/ creates a product for the caller's vendor."""
+    data = _create(client, auth_headers, sku="W-1")
+    assert data["vendor_id"] == vendor_id
+    assert data["vendor_name"] == "Shop"
+    assert data["sku"] == "W-1"
+
+
+def test_create_product_requires_auth(client: TestClient) -> None:
+    """POST /api/products/ without a token returns 401."""
+    response = client.post("/api/products/", json={"name": "Widget", "price": "1"})
+    assert response.status_code == 401
+
+
+def test_list_and_get_products(client: TestClient, vendor_id: int, auth_headers: dict) -> None:
+    """GET /api/products/ and /api/products/{id} include the vendor name."""
+    created = _create(client, auth_headers)
+    listing = client.get("/api/products/", params={"vendor_id": vendor_id})
+    assert listing.status_code == 200
+    assert [p["id"] for p in listing.json()] == [created["id"]]
+    assert listing.json()[0]["vendor_name"] == "Shop"
+    detail = client.get(f"/api/products/{created['id']}")
+    assert detail.status_code == 200
+    assert detail.json()["vendor_name"] == "Shop"
+
+
+def test_update_product(client: TestClient, auth_headers: dict) -> None:
+    """PATCH /api/products/{id} updates fields and returns the product."""
+    created = _create(client, auth_headers)
+    response = client.patch(f"/api/products/{created['id']}", json={"price": "12.50"})
+    assert response.status_code == 200
+    assert response.json()["price"] == "12.50"
+    assert response.json()["vendor_name"] == "Shop"
+
+
+def test_update_product_404(client: TestClient) -> None:
+    """PATCH /api/products/{id} returns 404 when not found."""
+    response = client.patch("/api/products/99999", json={"name": "X"})
+    assert response.status_code == 404
+
+
+def test_delete_product(client: TestClient, auth_headers: dict) -> None:
+    """DELETE /api/products/{id} removes the product."""
+    created = _create(client, auth_headers)
+    assert client.delete(f"/api/products/{created['id']}").status_code == 204
+    assert client.get(f"/api/products/{created['id']}").status_code == 404
+
+
+def test_lazy_load_guard(db_session) -> None:
+    """Relationship lazy loads raise in tests, so routes must choose loader strategies explicitly."""
+    vendor = Vendor(name="V")
+    db_session.add(vendor)
+    db_session.flush()
+    db_session.add(Product(name="P", price=1, vendor_id=vendor.id))
+    db_session.commit()
+    db_session.expunge_all()
+    product = db_session.query(Product).first()
+    with pytest.raises(UnexpectedLazyLoad):
+        product.vendor
+
+
+def test_list_products_fast_json_matches_schema(client: TestClient, auth_headers: dict) -> None:
+    """The fast listing path emits exactly ProductResponse's fields, in order, and the same values."""
+    from pydantic import TypeAdapter
+
+    created = _create(client, auth_headers, sku="F-1", description="Ünïcode")
+    listing = client.get("/api/products/")
+    assert listing.headers["content-type"] == "application/json"
+    row = listing.json()[0]
+    assert list(row) == list(ProductResponse.model_fields)
+    assert row == created
+    TypeAdapter(List[ProductResponse]).validate_json(listing.content)
+
+
+def test_update_product_single_statement(
+    client: TestClient, auth_headers: dict, recorded_statements: List[str]
+) -> None:
+    """PATCH /api/products/{id} runs one UPDATE ... RETURNING (plus its outbox INSERT) and no SELECT."""
+    created = _create(client, auth_headers)
+    recorded_statements.clear()
+    response = client.patch(f"/api/products/{created['id']}", json={"name": "Renamed"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    assert response.json()["vendor_name"] == "Shop"
+    assert recorded_statements == ["UPDATE", "INSERT"]
+
+
+def test_update_product_unknown_vendor(client: TestClient, auth_headers: dict) -> None:
+    """PATCH /api/products/{id} with a non-existent vendor_id returns 404."""
+    created = _create(client, auth_headers)
+    response = client.patch(f"/api/products/{created['id']}", json={"vendor_id": 99999})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Vendor not found"
+
+
+def test_update_product_if_match(client: TestClient, auth_headers: dict) -> None:
+    """Two writers holding the same ETag: the first wins, the second gets 412 instead of overwriting."""
+    created = _create(client, auth_headers)
+    etag = client.get(f"/api/products/{created['id']}").headers["ETag"]
+    first = client.patch(f"/api/products/{created['id']}", json={"price": "1"}, headers={"If-Match": etag})
+    assert first.status_code == 200
+    assert first.json()["version"] == created["version"] + 1
+    second = client.patch(f"/api/products/{created['id']}", json={"price": "2"}, headers={"If-Match": etag})
+    assert second.status_code == 412
+    assert client.get(f"/api/products/{created['id']}").json()["price"] == "1.00"
+    retry = client.patch(
+        f"/api/products/{created['id']}", json={"price": "2"}, headers={"If-Match": first.headers["ETag"]}
+    )
+    assert retry.status_code == 200
+    assert retry.json()["price"] == "2.00"
+
+
+def test_bulk_price_update(client: TestClient, vendor_id: int, auth_headers: dict) -> None:
+    """PATCH /api/products/prices applies id- and sku-keyed prices and reports per-entry outcomes."""
+    by_id = _create(client, auth_headers, sku="A-1")
+    by_sku = _create(client, auth_headers, sku="B-1")
+    client.post("/api/vendors/", json={"name": "Other", "email": "other@example.com"})
+    login = client.post("/api/auth/login", json={"email": "other@example.com", "password": "other@example.com"})
+    foreign = _create(client, {"Authorization": f"Bearer {login.json()['access_token']}"}, sku="X-1", price="5")
+
+    response = client.patch(
+        "/api/products/prices",
+        json=[
+            {"id": by_id["id"], "price": "1.50"},
+            {"sku": "B-1", "price": "2.25"},
+            {"id": foreign["id"], "price": "0"},
+            {"sku": "missing", "price": "3"},
+        ],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert (data["updated"], data["not_found"]) == (2, 2)
+    assert [r["status"] for r in data["results"]] == ["updated", "updated", "not_found", "not_found"]
+    assert data["results"][1]["id"] == by_sku["id"]
+    assert client.get(f"/api/products/{by_id['id']}").json()["price"] == "1.50"
+    assert client.get(f"/api/products/{by_id['id']}").json()["version"] == by_id["version"] + 1
+    assert client.get(f"/api/products/{by_sku['id']}").json()["price"] == "2.25"
+    assert client.get(f"/api/products/{foreign['id']}").json()["price"] == "5.00"
+
+
+def test_bulk_price_update_one_statement_per_batch(
+    client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch, recorded_statements: List[str]
+) -> None:
+    """Entries are applied in BULK_PRICE_BATCH_SIZE chunks, not one UPDATE per product."""
+
+    monkeypatch.setattr(get_settings(), "BULK_PRICE_BATCH_SIZE", 2)
+    ids = [_create(client, auth_headers)["id"] for _ in range(5)]
+    recorded_statements.clear()
+    response = client.patch("/api/products/prices", json=[{"id": i, "price": "7"} for i in ids], headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["updated"] == 5
+    assert recorded_statements.count("UPDATE") == 3
+
+
+def test_bulk_price_update_same_product_by_id_and_sku(
+    client: TestClient, auth_headers: dict, recorded_statements: List[str]
+) -> None:
+    """A product given by id and by sku is updated once, with the last entry's price."""
+    created = _create(client, auth_headers, sku="S-1")
+    recorded_statements.clear()
+    response = client.patch(
+        "/api/products/prices",
+        json=[{"id": created["id"], "price": "1"}, {"sku": "S-1", "price": "2"}],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert [r["id"] for r in response.json()["results"]] == [created["id"], created["id"]]
+    assert recorded_statements.count("UPDATE") == 1
+    product = client.get(f"/api/products/{created['id']}").json()
+    assert (product["price"], product["version"]) == ("2.00", created["version"] + 1)
+
+
+def test_bulk_price_update_validation(client: TestClient, auth_headers: dict) -> None:
+    """Each entry needs exactly one of id / sku."""
+    response = client.patch(
+        "/api/products/prices", json=[{"id": 1, "sku": "A", "price": "1"}], headers=auth_headers
+    )
+    assert response.status_code == 422
+    response = client.patch("/api/products/prices", json=[{"price": "1"}], headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_delta_sync(
+    client: TestClient, vendor_id: int, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """updated_since + cursor pages through writes and deletions, oldest first, then resumes."""
+    monkeypatch.setattr(get_settings(), "DELTA_SYNC_SAFETY_LAG", 0.0)
+    a = _create(client, auth_headers, sku="D-1")
+    b = _create(client, auth_headers, sku="D-2")
+    c = _create(client, auth_headers, sku="D-3")
+
+    first = client.get("/api/products/changes", params={"updated_since": "2000-01-01T00:00:00Z", "limit": 2})
+    assert first.status_code == 200, first.text
+    page = first.json()
+    assert [p["id"] for p in page["products"]] == [a["id"], b["id"]]
+    assert page["has_more"] is True
+    assert first.headers["X-Next-Cursor"] == page["next_cursor"]
+    second = client.get("/api/products/changes", params={"cursor": page["next_cursor"], "limit": 2}).json()
+    assert [p["id"] for p in second["products"]] == [c["id"]]
+    assert second["has_more"] is False
+
+    # Later sync from the saved cursor: only the update and the deletion
+    client.patch(f"/api/products/{a['id']}", json={"price": "3"})
+    assert client.delete(f"/api/products/{b['id']}").status_code == 204
+    later = client.get("/api/products/changes", params={"cursor": second["next_cursor"]}).json()
+    assert [p["id"] for p in later["products"]] == [a["id"]]
+    assert later["products"][0]["price"] == "3.00"
+    assert [(d["id"], d["vendor_id"]) for d in later["deleted"]] == [(b["id"], vendor_id)]
+    idle = client.get("/api/products/changes", params={"cursor": later["next_cursor"]}).json()
+    assert (idle["products"], idle["deleted"], idle["next_cursor"]) == ([], [], later["next_cursor"])
+
+
+def test_delta_sync_vendor_delete_tombstones(
+    client: TestClient, vendor_id: int, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Products removed by a vendor delete (FK cascade) are reported as deletions."""
+    monkeypatch.setattr(get_settings(), "DELTA_SYNC_SAFETY_LAG", 0.0)
+    created = _create(client, auth_headers)
+    since = created["updated_at"]
+    assert client.delete(f"/api/vendors/{vendor_id}").status_code == 204
+    changes = client.get("/api/products/changes", params={"updated_since": since}).json()
+    assert [d["id"] for d in changes["deleted"]] == [created["id"]]
+
+
+def test_delta_sync_vendor_rename(
+    client: TestClient, vendor_id: int, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A vendor rename reports its products again, with the new vendor name, once."""
+    monkeypatch.setattr(get_settings(), "DELTA_SYNC_SAFETY_LAG", 0.0)
+    created = _create(client, auth_headers)
+    synced = client.get("/api/products/changes", params={"updated_since": "2000-01-01T00:00:00Z"}).json()
+    client.patch(f"/api/vendors/{vendor_id}", json={"name": "Renamed Shop"})
+    changes = client.get("/api/products/changes", params={"cursor": synced["next_cursor"]}).json()
+    assert [(p["id"], p["vendor_name"]) for p in changes["products"]] == [(created["id"], "Renamed Shop")]
+    client.patch(f"/api/products/{created['id']}", json={"price": "3"})
+    later = client.get("/api/products/changes", params={"cursor": changes["next_cursor"]}).json()
+    assert [p["id"] for p in later["products"]] == [created["id"]]
+
+
+def test_delta_sync_safety_lag(client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Changes younger than DELTA_SYNC_SAFETY_LAG are held back, so a late commit cannot be skipped."""
+    monkeypatch.setattr(get_settings(), "DELTA_SYNC_SAFETY_LAG", 60.0)
+    created = _create(client, auth_headers)
+    params = {"updated_since": "2000-01-01T00:00:00Z"}
+    assert client.get("/api/products/changes", params=params).json()["products"] == []
+    monkeypatch.setattr(get_settings(), "DELTA_SYNC_SAFETY_LAG", 0.0)
+    assert [p["id"] for p in client.get("/api/products/changes", params=params).json()["products"]] == [created["id"]]
+
+
+def test_batch_get_products(client: TestClient, auth_headers: dict) -> None:
+    """GET /api/products/lookup?ids= returns products in request order and reports missing ids."""
+    a = _create(client, auth_headers)
+    b = _create(client, auth_headers)
+    response = client.get("/api/products/lookup", params={"ids": f"{b['id']},99999,{a['id']},{b['id']}"})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert [p["id"] for p in data["products"]] == [b["id"], a["id"]]
+    assert data["products"][0]["vendor_name"] == "Shop"
+    assert data["missing"] == [99999]
+    posted = client.post("/api/products/lookup", json={"ids": [a["id"], 99999]})
+    assert posted.status_code == 200
+    assert [p["id"] for p in posted.json()["products"]] == [a["id"]]
+    assert posted.json()["missing"] == [99999]
+
+
+def test_batch_get_products_vendor_filter(client: TestClient, vendor_id: int, auth_headers: dict) -> None:
+    """GET and POST /api/products/lookup both take vendor_id; other vendors' products are missing."""
+    a = _create(client, auth_headers)
+    params = {"ids": str(a["id"]), "vendor_id": vendor_id + 1}
+    assert client.get("/api/products/lookup", params=params).json()["missing"] == [a["id"]]
+    posted = client.post("/api/products/lookup", json={"ids": [a["id"]], "vendor_id": vendor_id + 1})
+    assert posted.json()["missing"] == [a["id"]]
+    posted = client.post("/api/products/lookup", json={"ids": [a["id"]], "vendor_id": vendor_id})
+    assert [p["id"] for p in posted.json()["products"]] == [a["id"]]
+
+
+def test_batch_get_products_one_query(client: TestClient, auth_headers: dict, recorded_statements: List[str]) -> None:
+    """The batch get reads all cache keys in one SELECT and loads all misses in one more."""
+    ids = [_create(client, auth_headers)["id"] for _ in range(5)]
+    recorded_statements.clear()
+    cold = client.get("/api/products/lookup", params={"ids": ",".join(map(str, ids))})
+    cold_statements, recorded_statements[:] = list(recorded_statements), []
+    warm = client.get("/api/products/lookup", params={"ids": ",".join(map(str, ids))})
+    assert len(cold.json()["products"]) == 5
+    assert warm.content == cold.content
+    assert cold_statements == ["SELECT", "SELECT"]
+    assert recorded_statements == ["SELECT"]
+
+
+def test_batch_get_products_invalid_ids(client: TestClient) -> None:
+    """Non-numeric or missing ids are rejected with 422."""
+    assert client.get("/api/products/lookup", params={"ids": "1,x"}).status_code == 422
+    assert client.get("/api/products/lookup").status_code == 422
+
+
+def test_delta_sync_requires_start(client: TestClient) -> None:
+    """GET /api/products/changes needs updated_since or cursor; the plain listing rejects both and ids."""
+    assert client.get("/api/products/changes").status_code == 422
+    for params in ({"updated_since": "2000-01-01T00:00:00Z"}, {"cursor": "x"}, {"ids": "1,2"}):
+        assert client.get("/api/products/", params=params).status_code == 422
+
+
+def test_cached_product_follows_writes(client: TestClient, vendor_id: int, auth_headers: dict) -> None:
+    """Cached product bodies are never served stale: product and vendor writes change the cache key."""
+    created = _create(client, auth_headers)
+    assert client.get(f"/api/products/{created['id']}").json()["price"] == "9.99"
+    client.patch(f"/api/products/{created['id']}", json={"price": "12.50"})
+    client.patch(f"/api/vendors/{vendor_id}", json={"name": "Renamed Shop"})
+    product = client.get(f"/api/products/{created['id']}")
+    assert product.json()["price"] == "12.50"
+    assert product.json()["vendor_name"] == "Renamed Shop"
+    assert client.get("/api/products/").json()[0]["vendor_name"] == "Renamed Shop"
+
+
+def test_product_etag_matches_body(
+    client: TestClient, db_session: Session, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A write between the cache-key read and a cache miss's load: the ETag is the version of the body sent."""
+    created = _create(client, auth_headers)
+    load = products._load_product_fragments
+
+    def load_after_write(db, ids):
+        db_session.execute(update(Product).values(version=Product.version + 1, price="12.50"))
+        return load(db, ids)
+
+    monkeypatch.setattr(products, "_load_product_fragments", load_after_write)
+    product = client.get(f"/api/products/{created['id']}")
+    assert product.json()["price"] == "12.50"
+    assert product.headers["ETag"] == f'"{product.json()["version"]}.1"' == f'"{created["version"] + 1}.1"'
+
+
+def test_product_etag_follows_vendor(client: TestClient, vendor_id: int, auth_headers: dict) -> None:
+    """The product body renders its vendor's name, so a vendor rename changes the product's ETag."""
+    created = _create(client, auth_headers)
+    url = f"/api/products/{created['id']}"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    client.patch(f"/api/vendors/{vendor_id}", json={"name": "Renamed Shop"})
+    fresh = client.get(url, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["vendor_name"] == "Renamed Shop"
+    assert fresh.headers["ETag"] != etag
+    assert client.patch(url, json={"price": "1"}, headers={"If-Match": etag}).status_code == 412
+    updated = client.patch(url, json={"price": "1"}, headers={"If-Match": fresh.headers["ETag"]})
+    assert updated.status_code == 200
+    assert client.get(url).headers["ETag"] == updated.headers["ETag"]
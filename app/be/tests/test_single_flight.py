@@ -0,0 +1,94 @@
+"""TDD tests for request coalescing (single-flight) of identical concurrent reads."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from be.utils.metrics import metrics
+from be.utils.single_flight import SingleFlight
+
+
+def _slow_fetch(calls: list, started: threading.Event, release: threading.Event, value=b"body"):
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return value
+
+    return fetch
+
+
+def _run_waiters(flight: SingleFlight, count: int, fetch, **kwargs) -> list:
+    """Start `count` callers of the same key; return their futures (the first one leads)."""
+    pool = ThreadPoolExecutor(max_workers=count)
+    futures = [pool.submit(flight.do, "product", 1, fetch, **kwargs)]
+    time.sleep(0.05)
+    futures += [pool.submit(flight.do, "product", 1, fetch, **kwargs) for _ in range(count - 1)]
+    pool.shutdown(wait=False)
+    return futures
+
+
+def test_concurrent_calls_share_one_fetch() -> None:
+    """Identical concurrent calls run the fetch once and all get its result."""
+    metrics.reset()
+    flight, calls, started, release = SingleFlight(), [], threading.Event(), threading.Event()
+    futures = _run_waiters(flight, 10, _slow_fetch(calls, started, release), timeout=5)
+    assert started.wait(5)
+    time.sleep(0.05)
+    release.set()
+    assert [f.result(5) for f in futures] == [b"body"] * 10
+    assert len(calls) == 1
+    assert metrics.counter("singleflight.product.fetches") == 1
+    assert metrics.counter("singleflight.product.coalesced") == 9
+    assert len(flight) == 0
+
+
+def test_waiter_timeout_fetches_itself() -> None:
+    """A waiter that times out runs its own fetch instead of waiting for a slow one."""
+    metrics.reset()
+    flight, calls, started, release = SingleFlight(), [], threading.Event(), threading.Event()
+    fetch = _slow_fetch(calls, started, release)
+    leader = _run_waiters(flight, 1, fetch, timeout=5)[0]
+    assert started.wait(5)
+    assert flight.do("product", 1, lambda: b"own", timeout=0.05) == b"own"
+    release.set()
+    assert leader.result(5) == b"body"
+    assert metrics.counter("singleflight.product.timeouts") == 1
+
+
+def test_error_is_shared_and_forget_starts_new_fetch() -> None:
+    """Waiters get the shared fetch's error; after forget() the next caller fetches anew."""
+    flight, started, release = SingleFlight(), threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("db down")
+
+    futures = _run_waiters(flight, 2, failing, timeout=5)
+    assert started.wait(5)
+    time.sleep(0.05)
+    flight.forget("product", 1)
+    assert flight.do("product", 1, lambda: b"fresh", timeout=5) == b"fresh"
+    release.set()
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(5)
+
+
+def test_product_reads_coalesce_and_follow_writes(client: TestClient) -> None:
+    """GET /api/products/{id} goes through the single-flight layer and still sees committed writes."""
+    metrics.reset()
+    vendor = client.post("/api/vendors/", json={"name": "Shop", "email": "shop@example.com"}).json()
+    login = client.post("/api/auth/login", json={"email": "shop@example.com", "password": "shop@example.com"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    product = client.post("/api/products/", json={"name": "P", "price": "1"}, headers=headers).json()
+    assert client.get(f"/api/products/{product['id']}").json()["name"] == "P"
+    client.patch(f"/api/products/{product['id']}", json={"name": "P2"})
+    assert client.get(f"/api/products/{product['id']}").json()["name"] == "P2"
+    assert client.get(f"/api/vendors/{vendor['id']}").json()["name"] == "Shop"
+    assert client.get("/api/products/999999").status_code == 404
+    assert metrics.counter("singleflight.product.fetches") == 3
+    assert metrics.counter("singleflight.vendor.fetches") == 1
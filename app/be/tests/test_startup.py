@@ -0,0 +1,40 @@
+"""TDD tests for B2Bmarket cold-start cost."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[2]
+BENCHMARK = APP_DIR / "scripts" / "startup_benchmark.py"
+
+# Only needed by login/token/password code paths; importing main must not load them
+LAZY_MODULES = ("jose", "passlib", "cryptography")
+
+
+def _env() -> dict:
+    """Child environment pointing the app at the test database, so startup needs no Postgres."""
+    from be.tests.conftest import TEST_DATABASE_URL
+
+    return {**os.environ, "DATABASE_URL": TEST_DATABASE_URL}
+
+
+def test_heavy_dependencies_load_lazily() -> None:
+    """Importing main:app leaves JWT and password-hashing libraries unloaded."""
+    code = f"import sys, main; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=APP_DIR, env=_env(), capture_output=True, text=True
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
+
+
+def test_cold_start_within_budget() -> None:
+    """Import time and time-to-first-response for main:app stay under the benchmark budgets."""
+    proc = subprocess.run(
+        [sys.executable, str(BENCHMARK), "--runs", "3"],
+        cwd=APP_DIR,
+        env=_env(),
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
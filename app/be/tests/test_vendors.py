@@ -1,6 +1,16 @@
 """TDD tests for B2Bmarket Vendors API."""
+from typing import List
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from be.models.product import Product
+from be.models.vendor import Vendor
+from be.routers import vendors
+from be.utils.metrics import metrics
+from be.utils.pagination import DEFAULT_PAGE_SIZE
+from config import get_settings
 
 
 def test_list_vendors_empty(client: TestClient) -> None:
@@ -56,6 +66,8 @@ def test_update_vendor(client: TestClient) -> None:
     response = client.patch(f"/api/vendors/{vid}", json={"name": "New Name"})
     assert response.status_code == 200
     assert response.json()["name"] == "New Name"
+    # App clock at full precision, like products (the database's now() has whole seconds on SQLite)
+    assert response.json()["updated_at"] > create.json()["updated_at"]
 
 
 def test_update_vendor_404(client: TestClient) -> None:
@@ -64,6 +76,31 @@ def test_update_vendor_404(client: TestClient) -> None:
     assert response.status_code == 404
 
 
+def test_update_vendor_if_match(client: TestClient) -> None:
+    """PATCH with a stale If-Match answers 412; the current ETag applies and bumps the version."""
+    created = client.post("/api/vendors/", json={"name": "Acme"})
+    etag = created.headers["ETag"]
+    assert etag == '"1"'
+    first = client.patch(f"/api/vendors/{created.json()['id']}", json={"name": "A1"}, headers={"If-Match": etag})
+    assert first.status_code == 200
+    assert first.json()["version"] == 2
+    assert first.headers["ETag"] == '"2"'
+    stale = client.patch(f"/api/vendors/{created.json()['id']}", json={"name": "A2"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert client.get(f"/api/vendors/{created.json()['id']}").json()["name"] == "A1"
+    missing = client.patch("/api/vendors/99999", json={"name": "X"}, headers={"If-Match": etag})
+    assert missing.status_code == 404
+
+
+def test_get_vendor_if_none_match(client: TestClient) -> None:
+    """GET /api/vendors/{id} with the current ETag answers 304 without a body."""
+    vendor_id = client.post("/api/vendors/", json={"name": "Acme"}).json()["id"]
+    etag = client.get(f"/api/vendors/{vendor_id}").headers["ETag"]
+    response = client.get(f"/api/vendors/{vendor_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
 def test_delete_vendor(client: TestClient) -> None:
     """DELETE /api/vendors/{id} removes the vendor and returns 204."""
     create = client.post("/api/vendors/", json={"name": "To Delete"})
@@ -79,3 +116,205 @@ def test_delete_vendor_404(client: TestClient) -> None:
     """DELETE /api/vendors/{id} returns 404 when not found."""
     response = client.delete("/api/vendors/99999")
     assert response.status_code == 404
+
+
+def test_list_vendors_paginates_with_cursor(client: TestClient) -> None:
+    """GET /api/vendors/?limit= returns pages linked by the X-Next-Cursor header."""
+    for i in range(5):
+        client.post("/api/vendors/", json={"name": f"Vendor {i}"})
+    seen = []
+    response = client.get("/api/vendors/", params={"limit": 2})
+    while True:
+        assert response.status_code == 200
+        seen.extend(v["id"] for v in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = client.get("/api/vendors/", params={"limit": 2, "cursor": cursor})
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_list_vendors_default_page_size(client: TestClient, db_session) -> None:
+    """Without limit GET /api/vendors/ (with or without a cursor) returns a default-sized page."""
+    db_session.add_all([Vendor(name=f"Vendor {i}") for i in range(2 * DEFAULT_PAGE_SIZE + 1)])
+    db_session.commit()
+    response = client.get("/api/vendors/")
+    assert len(response.json()) == DEFAULT_PAGE_SIZE
+    response = client.get("/api/vendors/", params={"cursor": response.headers["X-Next-Cursor"]})
+    assert len(response.json()) == DEFAULT_PAGE_SIZE
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_list_vendors_invalid_cursor(client: TestClient) -> None:
+    """GET /api/vendors/ returns 400 for a malformed cursor."""
+    response = client.get("/api/vendors/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_list_vendors_prefix_search(client: TestClient) -> None:
+    """GET /api/vendors/?q= matches name or email prefixes case-insensitively."""
+    client.post("/api/vendors/", json={"name": "Acme Corp"})
+    client.post("/api/vendors/", json={"name": "Globex", "email": "sales@acme.example"})
+    client.post("/api/vendors/", json={"name": "Initech"})
+    names = {v["name"] for v in client.get("/api/vendors/", params={"q": "acm"}).json()}
+    assert names == {"Acme Corp"}
+    names = {v["name"] for v in client.get("/api/vendors/", params={"q": "SALES@"}).json()}
+    assert names == {"Globex"}
+    assert client.get("/api/vendors/", params={"q": "%"}).json() == []
+
+
+def test_list_vendors_include_product_count(client: TestClient, db_session) -> None:
+    """GET /api/vendors/?include=product_count adds per-vendor product counts."""
+    one = client.post("/api/vendors/", json={"name": "One"}).json()["id"]
+    two = client.post("/api/vendors/", json={"name": "Two"}).json()["id"]
+    db_session.add_all([Product(name=f"P{i}", price=1, vendor_id=one) for i in range(3)])
+    db_session.commit()
+
+    counts = {v["id"]: v["product_count"] for v in client.get("/api/vendors/?include=product_count").json()}
+    assert counts == {one: 3, two: 0}
+    page = client.get("/api/vendors/", params={"include": "product_count", "limit": 1})
+    assert [v["product_count"] for v in page.json()] == [0]
+    rest = client.get("/api/vendors/", params={"include": "product_count", "cursor": page.headers["X-Next-Cursor"]})
+    assert [v["product_count"] for v in rest.json()] == [3]
+    assert client.get("/api/vendors/").json()[0]["product_count"] is None
+
+
+def test_list_vendors_product_count_only_counts_page(client: TestClient, db_session) -> None:
+    """include=product_count counts only the page's vendors' products, in one extra query."""
+    old = client.post("/api/vendors/", json={"name": "Old"}).json()["id"]
+    new = client.post("/api/vendors/", json={"name": "New"}).json()["id"]
+    db_session.add_all([Product(name=f"P{i}", price=1, vendor_id=vid) for vid in (old, new) for i in range(2)])
+    db_session.commit()
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(db_session.get_bind().engine, "before_cursor_execute", record)
+    try:
+        page = client.get("/api/vendors/", params={"include": "product_count", "limit": 1}).json()
+    finally:
+        event.remove(db_session.get_bind().engine, "before_cursor_execute", record)
+    assert [(v["id"], v["product_count"]) for v in page] == [(new, 2)]
+    count = [sql for sql in statements if "count(" in sql.lower()]
+    assert len(count) == 1 and "IN (" in count[0], statements
+
+
+def test_list_vendor_products(client: TestClient, db_session) -> None:
+    """GET /api/vendors/{id}/products returns the vendor once and its products without vendor fields."""
+    vid = client.post("/api/vendors/", json={"name": "Shop"}).json()["id"]
+    other = client.post("/api/vendors/", json={"name": "Other"}).json()["id"]
+    db_session.add_all([Product(name=f"P{i}", price=i, vendor_id=vid) for i in range(3)])
+    db_session.add(Product(name="Elsewhere", price=1, vendor_id=other))
+    db_session.commit()
+
+    response = client.get(f"/api/vendors/{vid}/products", params={"limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["vendor"]["name"] == "Shop"
+    assert len(data["products"]) == 2
+    assert "vendor_name" not in data["products"][0]
+    assert "next_cursor" not in data
+
+    rest = client.get(f"/api/vendors/{vid}/products", params={"cursor": response.headers["X-Next-Cursor"]})
+    assert len(rest.json()["products"]) == 1
+    assert "X-Next-Cursor" not in rest.headers
+
+
+def test_list_vendor_products_404(client: TestClient) -> None:
+    """GET /api/vendors/{id}/products returns 404 for an unknown vendor."""
+    response = client.get("/api/vendors/99999/products")
+    assert response.status_code == 404
+
+
+def _add_products(db_session, vendor_id: int, count: int) -> None:
+    db_session.add_all([Product(name=f"P{i}", price=1, vendor_id=vendor_id) for i in range(count)])
+    db_session.commit()
+
+
+def _product_count(db_session, vendor_id: int) -> int:
+    return db_session.query(Product).filter(Product.vendor_id == vendor_id).count()
+
+
+def test_delete_vendor_cascades_products(client: TestClient, db_session) -> None:
+    """DELETE /api/vendors/{id} removes the vendor's products through the FK cascade."""
+    vid = client.post("/api/vendors/", json={"name": "With Products"}).json()["id"]
+    _add_products(db_session, vid, 3)
+    db_session.expunge_all()
+    assert client.delete(f"/api/vendors/{vid}").status_code == 204
+    assert _product_count(db_session, vid) == 0
+
+
+def test_delete_vendor_async_in_batches(
+    client: TestClient, db_session, monkeypatch, recorded_statements: List[str]
+) -> None:
+    """DELETE /api/vendors/{id}?async=true returns 202 and deletes products in batches, never loading them."""
+    monkeypatch.setattr(get_settings(), "VENDOR_DELETE_BATCH_SIZE", 2)
+    vid = client.post("/api/vendors/", json={"name": "Big Catalog"}).json()["id"]
+    _add_products(db_session, vid, 5)
+    db_session.expunge_all()
+    loaded = []
+
+    def on_load(product, context):
+        loaded.append(product)
+
+    event.listen(Product, "load", on_load)
+    recorded_statements.clear()
+    try:
+        response = client.delete(f"/api/vendors/{vid}", params={"async": "true"})
+    finally:
+        event.remove(Product, "load", on_load)
+    assert response.status_code == 202
+    # Batches of 2 and 2 products, then the vendor with the last one (by the cascade)
+    assert recorded_statements.count("DELETE") == 3
+    assert loaded == []
+    assert _product_count(db_session, vid) == 0
+    assert client.get(f"/api/vendors/{vid}").status_code == 404
+
+
+def test_delete_vendor_async_resumes(client: TestClient, db_session, monkeypatch) -> None:
+    """A batched delete that fails is counted, keeps its committed batches and is resumed at startup."""
+    monkeypatch.setattr(get_settings(), "VENDOR_DELETE_BATCH_SIZE", 2)
+    vid = client.post("/api/vendors/", json={"name": "Big Catalog"}).json()["id"]
+    _add_products(db_session, vid, 5)
+    record = vendors.record_product_deletions
+    calls = []
+
+    def fail_second_batch(db, *criteria):
+        calls.append(criteria)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        record(db, *criteria)
+
+    monkeypatch.setattr(vendors, "record_product_deletions", fail_second_batch)
+    metrics.reset()
+    assert client.delete(f"/api/vendors/{vid}", params={"async": "true"}).status_code == 202
+    assert metrics.counter("vendors.delete.failed") == 1
+    assert _product_count(db_session, vid) == 3
+    assert db_session.get(Vendor, vid).deleting_since is not None
+
+    # Within the lease the job might still be running in another worker
+    assert vendors.resume_vendor_deletes(db_session.get_bind(), 2, lease=300) == 0
+    assert vendors.resume_vendor_deletes(db_session.get_bind(), 2, lease=0) == 1
+    assert _product_count(db_session, vid) == 0
+    assert client.get(f"/api/vendors/{vid}").status_code == 404
+    assert vendors.resume_vendor_deletes(db_session.get_bind(), 2, lease=0) == 0
+
+
+def test_delete_vendor_job_stops_when_taken_over(client: TestClient, db_session) -> None:
+    """A job whose lease was taken over by another job deletes nothing more."""
+    vid = client.post("/api/vendors/", json={"name": "Big Catalog"}).json()["id"]
+    _add_products(db_session, vid, 3)
+    stale = vendors._mark_deleting(db_session, vid)
+    assert vendors._mark_deleting(db_session, vid, stale) is not None  # the new owner
+    db_session.commit()
+    metrics.reset()
+    vendors._delete_vendor_in_batches(vid, db_session.get_bind(), 2, stale)
+    assert metrics.counter("vendors.delete.superseded") == 1
+    assert _product_count(db_session, vid) == 3
+
+
+def test_delete_vendor_async_404(client: TestClient) -> None:
+    """DELETE /api/vendors/{id}?async=true returns 404 when not found."""
+    assert client.delete("/api/vendors/99999", params={"async": "true"}).status_code == 404
@@ -0,0 +1,23 @@
+"""TDD tests for B2Bmarket startup warm-up."""
+from be.tests.conftest import engine
+from be.utils.warmup import precompile_hot_statements, warm_up_pool
+
+
+def test_warm_up_pool_opens_connections(app) -> None:
+    """Warm-up opens the requested connections and returns them to the pool."""
+    engine.dispose()
+    opened = warm_up_pool(engine, 2)
+    assert opened == 2
+    assert engine.pool.checkedin() == 2
+    assert engine.pool.checkedout() == 0
+
+
+def test_warm_up_pool_is_capped_at_pool_size(app) -> None:
+    """Asking for more connections than the pool keeps never opens throwaway overflow ones."""
+    engine.dispose()
+    assert warm_up_pool(engine, 1000) == engine.pool.size()
+
+
+def test_precompile_hot_statements(app) -> None:
+    """Hot route statements compile and execute against an empty schema."""
+    assert precompile_hot_statements(engine) > 0
@@ -0,0 +1,78 @@
+"""TDD tests for the B2Bmarket production worker supervisor."""
+import os
+import time
+
+import pytest
+
+from be.utils import workers
+from be.utils.workers import WorkerSupervisor, max_requests_for_worker, resolve_worker_count
+from config import Settings
+
+
+def test_resolve_worker_count_defaults_to_cpu_count() -> None:
+    """UVICORN_WORKERS=0 means one worker per CPU."""
+    assert resolve_worker_count(0) == (os.cpu_count() or 1)
+    assert resolve_worker_count(3) == 3
+
+
+def test_max_requests_for_worker() -> None:
+    """Recycling is disabled at 0 and jitter stays within bounds."""
+    assert max_requests_for_worker(0, 100) is None
+    assert max_requests_for_worker(1000, 0) == 1000
+    for _ in range(20):
+        assert 1000 <= max_requests_for_worker(1000, 50) <= 1050
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+def test_supervisor_restarts_crashed_worker(monkeypatch) -> None:
+    """A worker exiting with an error is reaped and replaced."""
+    monkeypatch.setattr(workers, "RESPAWN_BACKOFF", 0)
+    supervisor = WorkerSupervisor("main:app", Settings(UVICORN_WORKERS=1))
+    monkeypatch.setattr(supervisor, "_run_worker", lambda: os._exit(1))
+
+    supervisor._spawn_worker()
+    first_pid = next(iter(supervisor.workers))
+    deadline = time.monotonic() + 5
+    while first_pid in supervisor.workers and time.monotonic() < deadline:
+        supervisor._reap_workers()
+        time.sleep(0.05)
+
+    assert first_pid not in supervisor.workers
+    assert len(supervisor.workers) == 1
+
+    supervisor.should_exit = True
+    supervisor._shutdown()
+    assert supervisor.workers == {}
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+def test_supervisor_backs_off_short_lived_workers(monkeypatch) -> None:
+    """A worker that exits at once, even with code 0, is respawned only after RESPAWN_BACKOFF."""
+    sleeps = []
+    monkeypatch.setattr(workers.time, "sleep", sleeps.append)
+    supervisor = WorkerSupervisor("main:app", Settings(UVICORN_WORKERS=1))
+    monkeypatch.setattr(supervisor, "_run_worker", lambda: None)
+
+    supervisor._spawn_worker()
+    first_pid = next(iter(supervisor.workers))
+    deadline = time.monotonic() + 5
+    while first_pid in supervisor.workers and time.monotonic() < deadline:
+        supervisor._reap_workers()
+    assert sleeps == [workers.RESPAWN_BACKOFF]
+
+    supervisor.should_exit = True
+    supervisor._shutdown()
+
+
+def test_worker_exits_with_error_when_startup_fails(monkeypatch) -> None:
+    """uvicorn returns normally when lifespan startup fails; the worker turns that into exit code 1."""
+    from be.database import engine
+
+    supervisor = WorkerSupervisor("main:app", Settings(UVICORN_WORKERS=1))
+    # Keep the test process's signal handlers and connection pool
+    monkeypatch.setattr(workers.signal, "signal", lambda sig, handler: None)
+    monkeypatch.setattr(engine, "dispose", lambda close=True: None)
+    monkeypatch.setattr(workers.uvicorn.Server, "run", lambda self, sockets=None: None)
+    with pytest.raises(SystemExit) as exited:
+        supervisor._run_worker()
+    assert exited.value.code == 1
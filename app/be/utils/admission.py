@@ -0,0 +1,169 @@
+"""Admission control: per-route-class concurrency limits with bounded wait queues.
+
+Without it, an overload queues every request in the anyio threadpool and the DB pool until they
+all time out together. Here each route class (auth / read / write / export) admits at most its
+ADMISSION_*_LIMIT requests at a time; the rest wait in a FIFO of at most ADMISSION_QUEUE_SIZE.
+A request that would not be admitted within ADMISSION_QUEUE_TIMEOUT or its remaining deadline
+(queue full, or its expected wait, from the class's recent service times, is longer) is answered
+503 with Retry-After at once.
+Health, ping, metrics and the SSE change feed are never limited. POST /api/batch is not limited
+as a whole: its sub-requests skip the middleware stack, so the batch admits each one through the
+middleware's limiters by its own route class.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from be.utils.deadline import remaining_time
+from be.utils.metrics import metrics
+from config import get_settings
+
+EXEMPT_PREFIXES = ("/api/health", "/api/ping", "/api/metrics", "/api/changes/stream", "/api/batch")
+
+# The request's AdmissionMiddleware in its ASGI scope, for admitting batch sub-requests
+ADMISSION_SCOPE_KEY = "b2bmarket.admission"
+
+# Weight of the latest request in a class's average service time
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """auth / read / write / export for a request, or None when it is not limited."""
+    if not path.startswith("/api/") or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path.startswith("/api/auth/"):
+        return "auth"
+    if path.rstrip("/") == "/api/products" and method == "GET":
+        return "export"
+    if method in ("GET", "HEAD", "OPTIONS") or path.rstrip("/") == "/api/products/lookup":
+        return "read"
+    return "write"
+
+
+class AdmissionLimiter:
+    """Concurrency limit plus FIFO wait queue for one route class. Used from the event loop only."""
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._service_time: Optional[float] = None
+
+    def expected_wait(self, position: int) -> float:
+        """Seconds until the request at queue `position` (0 = next) is likely admitted."""
+        if self._service_time is None:
+            return 0.0
+        return (position + 1) / self.limit * self._service_time
+
+    async def acquire(self, time_left: Optional[float] = None) -> Optional[float]:
+        """
+        Wait for a slot, at most queue_timeout or the request's `time_left`, whichever is shorter.
+        Returns None once admitted, or a Retry-After in seconds when shed; admitted callers must
+        call release().
+        """
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            metrics.incr(f"admission.{self.name}.admitted")
+            return None
+        queue_timeout = self.queue_timeout if time_left is None else max(min(self.queue_timeout, time_left), 0.0)
+        position = len(self._waiters)
+        expected = self.expected_wait(position)
+        if position >= self.queue_size or expected > queue_timeout:
+            metrics.incr(f"admission.{self.name}.shed")
+            return max(expected, 1.0)
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away while queued; pass on a slot that was handed over meanwhile
+            self._abandon(waiter)
+            raise
+        metrics.observe(f"admission.{self.name}.wait", time.monotonic() - started)
+        if waiter.done():
+            metrics.incr(f"admission.{self.name}.admitted")
+            return None
+        self._abandon(waiter)
+        metrics.incr(f"admission.{self.name}.timeouts")
+        return max(self.expected_wait(len(self._waiters)), 1.0)
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            self.release(None)
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, service_time: Optional[float]) -> None:
+        """Free a slot, handing it straight to the oldest waiter when there is one."""
+        if service_time is not None:
+            if self._service_time is None:
+                self._service_time = service_time
+            else:
+                self._service_time += SERVICE_TIME_SMOOTHING * (service_time - self._service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware: admit, queue or shed each limited request by its route class."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._limiters: Dict[str, Optional[AdmissionLimiter]] = {}
+
+    def _limiter(self, name: str) -> Optional[AdmissionLimiter]:
+        if name not in self._limiters:
+            settings = get_settings()
+            limit = getattr(settings, f"ADMISSION_{name.upper()}_LIMIT")
+            self._limiters[name] = (
+                AdmissionLimiter(name, limit, settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_QUEUE_TIMEOUT)
+                if limit > 0
+                else None
+            )
+        return self._limiters[name]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        scope[ADMISSION_SCOPE_KEY] = self
+        await self.admit(scope, receive, send, self.app)
+
+    async def admit(self, scope: Scope, receive: Receive, send: Send, app: ASGIApp) -> None:
+        """Run `app` for the request once its route class admits it, or answer 503 when it is shed."""
+        name = route_class(scope["method"], scope["path"])
+        limiter = self._limiter(name) if name is not None else None
+        if limiter is None:
+            await app(scope, receive, send)
+            return
+        retry_after = await limiter.acquire(remaining_time())
+        if retry_after is not None:
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+        started = time.monotonic()
+        try:
+            await app(scope, receive, send)
+        finally:
+            limiter.release(time.monotonic() - started)
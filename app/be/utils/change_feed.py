@@ -0,0 +1,178 @@
+"""In-process fan-out of the catalog_changes outbox to Server-Sent Events subscribers.
+
+Each worker runs at most one poller, and only while someone is subscribed: every poll reads the
+new outbox rows once and hands them to all subscribers' queues, so N open streams cost one query
+per CHANGE_FEED_POLL_INTERVAL. Delivery is at-least-once; offsets are usually increasing, but a
+transaction that commits after a later one is delivered when it shows up (within
+CHANGE_FEED_GAP_TIMEOUT), so clients should apply changes idempotently (by version).
+"""
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from be.models.catalog_change import CatalogChange
+from be.utils.metrics import metrics
+from config import get_settings
+
+log = logging.getLogger(__name__)
+
+# Largest run of skipped offsets that is tracked as possibly in-flight (bigger jumps are sequence gaps)
+MAX_TRACKED_GAP = 1000
+
+# Queued for a subscriber that fell CHANGE_FEED_QUEUE_SIZE events behind; its stream then ends
+_OVERFLOW = object()
+
+
+def _change_to_event(change: CatalogChange) -> dict:
+    return {
+        "offset": change.id,
+        "entity": change.entity,
+        "id": change.entity_id,
+        "action": change.action,
+        "version": change.version,
+        "at": change.created_at.isoformat(),
+    }
+
+
+def _last_offset(bind) -> int:
+    with Session(bind=bind) as db:
+        return db.scalar(select(func.max(CatalogChange.id))) or 0
+
+
+def _read_changes(bind, after: int, gaps: List[int], up_to: Optional[int], limit: int) -> List[dict]:
+    """Changes with offset > after (and <= up_to), plus any of the `gaps` offsets now committed."""
+    criteria = CatalogChange.id > after
+    if up_to is not None:
+        criteria = and_(criteria, CatalogChange.id <= up_to)
+    if gaps:
+        criteria = or_(criteria, CatalogChange.id.in_(gaps))
+    with Session(bind=bind) as db:
+        changes = db.scalars(select(CatalogChange).where(criteria).order_by(CatalogChange.id).limit(limit)).all()
+        return [_change_to_event(change) for change in changes]
+
+
+class ChangeFeed:
+    """One catalog_changes poller per process, fanned out to any number of subscribers."""
+
+    def __init__(self):
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._bind = None
+        self._last_id = 0
+        self._gaps: Dict[int, float] = {}  # skipped offset -> when it was first missed
+
+    async def subscribe(self, bind, after: Optional[int] = None) -> AsyncIterator[Optional[dict]]:
+        """
+        Register a subscriber and return its event stream.
+
+        With `after`, changes after that offset are first read from the database (in batches, by
+        this subscriber alone), then the stream continues with the shared live feed. The stream
+        yields None after CHANGE_FEED_HEARTBEAT seconds without events (send a keep-alive) and
+        ends if the subscriber falls too far behind; it must be iterated or closed to unsubscribe.
+        """
+        settings = get_settings()
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CHANGE_FEED_QUEUE_SIZE)
+        async with self._start_lock:
+            if self._task is None or self._task.done():
+                self._bind = bind
+                self._last_id = await run_in_threadpool(_last_offset, bind)
+                self._gaps.clear()
+                self._task = asyncio.create_task(self._run())
+            self._subscribers.add(queue)
+            live_from = self._last_id
+        metrics.incr("changes.feed.subscribes")
+        return self._stream(queue, after, live_from)
+
+    async def _stream(self, queue: asyncio.Queue, after: Optional[int], live_from: int):
+        settings = get_settings()
+        try:
+            # Catch up from the outbox up to where the live feed took over
+            while after is not None and after < live_from:
+                events = await run_in_threadpool(
+                    _read_changes, self._bind, after, [], live_from, settings.CHANGE_FEED_BATCH_SIZE
+                )
+                if not events:
+                    break
+                for event in events:
+                    yield event
+                after = events[-1]["offset"]
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.CHANGE_FEED_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is _OVERFLOW:
+                    log.warning("⚠️ Change feed subscriber fell behind; closing its stream")
+                    return
+                yield event
+        finally:
+            self._subscribers.discard(queue)
+
+    async def _run(self) -> None:
+        """Poll while there are subscribers; exits (without awaiting) as soon as there are none."""
+        settings = get_settings()
+        while self._subscribers:
+            events = []
+            try:
+                events = await run_in_threadpool(
+                    _read_changes, self._bind, self._last_id, list(self._gaps), None, settings.CHANGE_FEED_BATCH_SIZE
+                )
+                metrics.incr("changes.feed.polls")
+                self._advance(events, settings.CHANGE_FEED_GAP_TIMEOUT)
+                self._dispatch(events)
+            except Exception as e:
+                log.error(f"❌ Change feed poll failed: {type(e).__name__}: {str(e)}")
+            if len(events) < settings.CHANGE_FEED_BATCH_SIZE:
+                await asyncio.sleep(settings.CHANGE_FEED_POLL_INTERVAL)
+
+    def _advance(self, events: List[dict], gap_timeout: float) -> None:
+        """Move the read offset past `events`, remembering skipped offsets that may still commit."""
+        now = time.monotonic()
+        for event in events:
+            offset = event["offset"]
+            self._gaps.pop(offset, None)
+            if offset > self._last_id:
+                if offset - self._last_id - 1 <= MAX_TRACKED_GAP:
+                    self._gaps.update((missing, now) for missing in range(self._last_id + 1, offset))
+                self._last_id = offset
+        self._gaps = {offset: seen for offset, seen in self._gaps.items() if now - seen < gap_timeout}
+
+    def _dispatch(self, events: List[dict]) -> None:
+        if not events:
+            return
+        metrics.incr("changes.feed.events", len(events))
+        for queue in list(self._subscribers):
+            for event in events:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Drop what it has not read and end its stream; it resumes from its last offset
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(_OVERFLOW)
+                    self._subscribers.discard(queue)
+                    metrics.incr("changes.feed.overflows")
+                    break
+
+    async def stop(self) -> None:
+        """Cancel the poller (app shutdown)."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._start_lock = None
+
+
+change_feed = ChangeFeed()
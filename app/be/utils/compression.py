@@ -0,0 +1,197 @@
+"""HTTP response compression (gzip, and brotli when the `brotli` package is installed).
+
+CompressionMiddleware compresses complete JSON/text bodies of at least COMPRESSION_MIN_SIZE bytes
+for clients that accept it (Accept-Encoding, with q-values), with the ETag suffixed by the encoding;
+every JSON/text response varies on Accept-Encoding. Streaming responses (e.g. the SSE change feed)
+pass through untouched. Compressed GET bodies are cached by (encoding, body digest)
+up to COMPRESSION_CACHE_MAX_BYTES, so identical payloads (the same listing served again, mostly
+assembled from the response cache) are compressed once rather than on every hit.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from be.utils.etag import encoded_etag
+from be.utils.metrics import metrics
+from config import get_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # fast enough per request, still well ahead of gzip on repetitive JSON
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding allowed by an Accept-Encoding header, or None for identity."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressedCache:
+    """Thread-safe LRU of (encoding, body digest) -> compressed body, bounded by total bytes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+            return compressed
+
+    def put(self, key: Tuple[str, bytes], compressed: bytes) -> None:
+        max_bytes = get_settings().COMPRESSION_CACHE_MAX_BYTES
+        if len(compressed) > max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = compressed
+            self._bytes += len(compressed)
+            while self._bytes > max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+compressed_cache = CompressedCache()
+
+
+async def compress_cached(body: bytes, encoding: str, cacheable: bool) -> bytes:
+    """Compressed `body`: from the cache when `cacheable`, otherwise (and on misses) in the threadpool."""
+    if not cacheable:
+        return await run_in_threadpool(compress, body, encoding)
+    key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+    compressed = compressed_cache.get(key)
+    if compressed is not None:
+        metrics.incr("compression.cache.hits")
+        return compressed
+    metrics.incr("compression.cache.misses")
+    compressed = await run_in_threadpool(compress, body, encoding)
+    compressed_cache.put(key, compressed)
+    return compressed
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware: compress complete, large enough, compressible response bodies."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        start: Optional[Message] = None
+        streaming = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, streaming
+            if streaming:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if message["status"] == 304:
+                    # No body: answer with the tag the client holds, plain or encoded
+                    headers.add_vary_header("Accept-Encoding")
+                    etag = headers.get("etag")
+                    if etag is not None and encoding is not None:
+                        tagged = encoded_etag(etag, encoding)
+                        if tagged.removeprefix("W/") in request_headers.get("if-none-match", ""):
+                            headers["ETag"] = tagged
+                    streaming = True
+                elif "content-length" not in headers or headers.get("content-type", "").startswith(
+                    "text/event-stream"
+                ):
+                    # A stream (SSE, chunked): sent as is, without waiting for its first event
+                    streaming = True
+                if streaming:
+                    await send(message)
+                else:
+                    start = message  # held until the body shows whether to compress
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if message.get("more_body", False):
+                # Streamed with a Content-Length: sent as is
+                streaming = True
+                await send(start)
+                await send(message)
+                return
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                await send(start)
+                await send(message)
+                return
+            # Whether it is compressed depends on Accept-Encoding, even when this body is too small
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is not None and len(body) >= get_settings().COMPRESSION_MIN_SIZE:
+                cacheable = scope["method"] == "GET" and start["status"] == 200
+                compressed = await compress_cached(body, encoding, cacheable)
+                metrics.incr("compression.bytes_in", len(body))
+                metrics.incr("compression.bytes_out", len(compressed))
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                if "etag" in headers:
+                    # A different representation: it must not share the identity body's strong ETag
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                message = {**message, "body": compressed}
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,165 @@
+"""Per-request deadlines, propagated to database statement timeouts.
+
+DeadlineMiddleware gives every API request a deadline: REQUEST_TIMEOUT seconds, or the client's
+X-Request-Timeout (capped at REQUEST_TIMEOUT_MAX). Each database transaction a request starts gets
+the time that is left: `SET LOCAL statement_timeout` on PostgreSQL, a progress handler that
+interrupts the statement on SQLite. A statement cut short (or a transaction started past the
+deadline) raises DeadlineExceeded, a 504, so a pathological query cannot hold a pooled connection
+long after the client gave up.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from be.utils.metrics import metrics
+from config import get_settings
+
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+# Long-lived streams have no deadline
+EXEMPT_PREFIXES = ("/api/changes/stream",)
+
+# The request's Deadline in its ASGI scope, for sub-requests dispatched past this middleware (batch)
+DEADLINE_SCOPE_KEY = "b2bmarket.deadline"
+
+# SQLite virtual machine instructions between deadline checks
+SQLITE_PROGRESS_STEPS = 10000
+
+# PostgreSQL query_canceled (statement_timeout)
+_PG_QUERY_CANCELED = "57014"
+
+
+class Deadline:
+    """A request's deadline (time.monotonic()); `at` is cleared once the response is sent."""
+
+    __slots__ = ("at",)
+
+    def __init__(self, at: float):
+        self.at: Optional[float] = at
+
+    def remaining(self) -> Optional[float]:
+        return None if self.at is None else self.at - time.monotonic()
+
+
+# Shared by reference with the threads and tasks a request starts, so clearing `at` reaches them
+# too (e.g. background tasks that run after the response)
+_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(HTTPException):
+    """The request ran out of time (504)."""
+
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Request deadline exceeded")
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left for the current request, or None outside a request with a deadline."""
+    deadline = _deadline.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+def request_timeout(header: Optional[str]) -> Optional[float]:
+    """Timeout in seconds for a request with this X-Request-Timeout value; None = no deadline."""
+    settings = get_settings()
+    timeout = settings.REQUEST_TIMEOUT
+    if header:
+        try:
+            requested = float(header)
+        except ValueError:
+            requested = 0.0
+        if requested > 0:
+            timeout = min(requested, settings.REQUEST_TIMEOUT_MAX)
+    return timeout if timeout > 0 else None
+
+
+class DeadlineMiddleware:
+    """Pure ASGI middleware: set the request deadline for the duration of the response."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith("/api/") or path.startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        timeout = request_timeout(Headers(scope=scope).get(TIMEOUT_HEADER))
+        if timeout is None:
+            await self.app(scope, receive, send)
+            return
+        deadline = Deadline(time.monotonic() + timeout)
+        scope[DEADLINE_SCOPE_KEY] = deadline
+        token = _deadline.set(deadline)
+
+        async def send_and_clear(message: Message) -> None:
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                deadline.at = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_clear)
+        finally:
+            deadline.at = None
+            _deadline.reset(token)
+
+
+@contextmanager
+def scope_deadline(scope: Scope) -> Iterator[Optional[Deadline]]:
+    """Make the Deadline stored in `scope` (None: no deadline) the current one for the block."""
+    deadline = scope.get(DEADLINE_SCOPE_KEY)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def _apply_deadline(session: Session, transaction, connection) -> None:
+    """Session after_begin: limit the new transaction's statements to the request's remaining time."""
+    deadline = _deadline.get()
+    remaining = deadline.remaining() if deadline is not None else None
+    if remaining is None:
+        return
+    if remaining <= 0:
+        metrics.incr("deadline.exceeded")
+        raise DeadlineExceeded()
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(int(remaining * 1000), 1)}")
+    elif connection.dialect.name == "sqlite":
+        # Reads the shared Deadline, so it goes quiet once the request is done
+        connection.connection.driver_connection.set_progress_handler(
+            lambda: int(deadline.at is not None and time.monotonic() > deadline.at), SQLITE_PROGRESS_STEPS
+        )
+
+
+def _deadline_error(context) -> None:
+    """handle_error: a statement stopped by the request deadline becomes DeadlineExceeded (504)."""
+    original = context.original_exception
+    canceled = getattr(original, "pgcode", None) == _PG_QUERY_CANCELED or (
+        context.dialect is not None and context.dialect.name == "sqlite" and "interrupted" in str(original)
+    )
+    if canceled and _deadline.get() is not None:
+        metrics.incr("deadline.exceeded")
+        raise DeadlineExceeded() from original
+
+
+def enable_request_deadlines(engine: Engine) -> None:
+    """Propagate request deadlines to this engine's statements (call once per engine)."""
+    if not event.contains(Session, "after_begin", _apply_deadline):
+        event.listen(Session, "after_begin", _apply_deadline)
+    event.listen(engine, "handle_error", _deadline_error)
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine, "checkin")
+        def _clear_progress_handler(dbapi_connection, connection_record):
+            if dbapi_connection is not None:
+                dbapi_connection.set_progress_handler(None, 0)
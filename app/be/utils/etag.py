@@ -0,0 +1,82 @@
+"""ETags and conditional requests (If-Match / If-None-Match) for versioned rows.
+
+A row's ETag is its `version` column, bumped by every UPDATE, e.g. `"3"`. A body built from
+several rows is tagged with all their versions, e.g. `"3.7"` for a product (version 3) that
+renders its vendor's name (vendor version 7), so any of those writes changes the ETag. A compressed
+representation gets its own tag with the encoding appended (`"3-gzip"`, see encoded_etag), as
+different representations must not share a strong ETag. Conditional requests compare versions, so
+either tag of a version matches.
+"""
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+# Content codings CompressionMiddleware produces, as they appear in encoded ETags
+ETAG_ENCODINGS = ("gzip", "br")
+
+
+def make_etag(*versions: int) -> str:
+    """Strong ETag for the row version(s) a body was built from."""
+    return '"' + ".".join(map(str, versions)) + '"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """The ETag of `encoding`'s representation: `"3"` -> `"3-gzip"` (W/ kept)."""
+    weak = etag.startswith("W/")
+    opaque = etag[2:] if weak else etag
+    if len(opaque) < 2 or opaque[0] != '"' or opaque[-1] != '"':
+        return etag
+    return f'{"W/" if weak else ""}"{opaque[1:-1]}-{encoding}"'
+
+
+def _parse_etags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _tag_versions(tag: str) -> Optional[Tuple[int, ...]]:
+    """Row versions of a strong tag (`"3"`, `"3.7"` or encoded `"3.7-gzip"`), or None when malformed."""
+    if len(tag) < 3 or tag[0] != '"' or tag[-1] != '"':
+        return None
+    versions, _, encoding = tag[1:-1].partition("-")
+    parts = versions.split(".")
+    if not all(part.isdigit() for part in parts) or (encoding and encoding not in ETAG_ENCODINGS):
+        return None
+    return tuple(map(int, parts))
+
+
+def if_match_versions(if_match: Optional[str]) -> Optional[List[Tuple[int, ...]]]:
+    """
+    Version tuples an If-Match header accepts, or None when any version is fine (header absent or `*`).
+
+    If-Match uses strong comparison, so weak (W/) and malformed tags accept nothing.
+    """
+    if if_match is None:
+        return None
+    tags = _parse_etags(if_match)
+    if "*" in tags:
+        return None
+    # An encoded tag names the same row versions: the write applies to the resource, not to a coding
+    return [versions for versions in map(_tag_versions, tags) if versions is not None]
+
+
+def check_if_match(if_match: Optional[str], *versions: int) -> None:
+    """Raise 412 when If-Match does not accept the current `versions`."""
+    accepted = if_match_versions(if_match)
+    if accepted is not None and versions not in accepted:
+        raise_precondition_failed()
+
+
+def raise_precondition_failed() -> None:
+    """Raise 412 for a write whose If-Match no longer matches the row."""
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Resource was modified; fetch it again and retry with the new ETag",
+    )
+
+
+def not_modified(if_none_match: Optional[str], *versions: int) -> bool:
+    """True when If-None-Match already holds `versions` (weak comparison), so a GET can answer 304."""
+    if if_none_match is None:
+        return False
+    tags = [tag[2:] if tag.startswith("W/") else tag for tag in _parse_etags(if_none_match)]
+    return "*" in tags or versions in map(_tag_versions, tags)
@@ -7,7 +7,6 @@ from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError, HTTPException
 
-settings = get_settings()
 log = logging.getLogger(__name__)
 
 
@@ -50,6 +49,6 @@ def setup_exception_handlers(app):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "detail": "Internal server error",
-                "error": str(exc) if settings.DEBUG else "An error occurred",
+                "error": str(exc) if get_settings().DEBUG else "An error occurred",
             },
         )
@@ -0,0 +1,40 @@
+"""Fast JSON path for listings of trusted database rows.
+
+FastAPI's default path validates a handler's result against response_model, dumps it to JSON-able
+Python objects and then runs json.dumps. Rows read from our own tables already have the response
+types, so list endpoints select exactly the response fields and hand plain dicts to pydantic-core,
+which writes the whole array to bytes in one call (Decimal as string, datetime as ISO 8601: the
+same JSON as the validated path). See scripts/serialization_benchmark.py.
+"""
+from typing import Any, Iterable, Mapping
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+_ANY = TypeAdapter(Any)
+
+
+class RawJSONResponse(Response):
+    """application/json response whose body is already serialized."""
+
+    media_type = "application/json"
+
+
+def dump_rows(rows: Iterable[Mapping[str, Any]]) -> bytes:
+    """Serialize rows (response field name -> DB value, in response field order) as a JSON array."""
+    return _ANY.dump_json([dict(row) for row in rows])
+
+
+def dump(value: Any) -> bytes:
+    """Serialize any JSON-able value (ints, strings, lists, dicts, ...)."""
+    return _ANY.dump_json(value)
+
+
+def dump_row(row: Mapping[str, Any]) -> bytes:
+    """Serialize one row as a JSON object (a cacheable fragment)."""
+    return _ANY.dump_json(dict(row))
+
+
+def join_fragments(fragments: Iterable[bytes]) -> bytes:
+    """JSON array from already serialized objects."""
+    return b"[" + b",".join(fragments) + b"]"
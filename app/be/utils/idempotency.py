@@ -0,0 +1,195 @@
+"""Idempotency-Key support for POST endpoints.
+
+A client that retries a POST (timeout, dropped connection) sends the same Idempotency-Key header
+again. The first request stores its response in idempotency_keys in the same transaction as the
+mutation; a retry within IDEMPOTENCY_TTL gets that response back (with `Idempotent-Replayed: true`)
+without the handler running again, so there is no duplicate row and no second bcrypt hash. The same
+key with a different request body is a client error (422). Two concurrent requests with one key
+both run, but only one commits: the other fails on the unique (scope, key) constraint and replays
+the winner's response. Stored responses are immutable, so each worker also keeps them in memory.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta, timezone
+from typing import NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from be.models.idempotency_key import IdempotencyKey
+from be.models.product import utcnow
+from be.utils.fast_json import RawJSONResponse, dump
+from be.utils.metrics import metrics
+from config import get_settings
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+PURGE_BATCH_SIZE = 100  # expired keys deleted per stored response
+
+
+class IdempotentRequest(NamedTuple):
+    """A POST made with an Idempotency-Key: `scope` names the endpoint and, when authenticated, the caller."""
+
+    scope: str
+    key: str
+    fingerprint: str
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: str
+    status_code: int
+    body: bytes
+    etag: Optional[str]
+
+
+class IdempotencyCache:
+    """Thread-safe LRU of (scope, key) -> stored response, per worker, with entries expiring after IDEMPOTENCY_TTL."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, StoredResponse]]" = OrderedDict()
+
+    def get(self, scope: str, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is not None:
+                self._entries.move_to_end((scope, key))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def put(self, scope: str, key: str, stored: StoredResponse, ttl: Optional[float] = None) -> None:
+        """Cache for `ttl` seconds: what is left of the key's IDEMPOTENCY_TTL (all of it for a new key)."""
+        settings = get_settings()
+        if ttl is None:
+            ttl = settings.IDEMPOTENCY_TTL
+        if settings.IDEMPOTENCY_CACHE_MAX_ENTRIES <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[(scope, key)] = (time.monotonic() + ttl, stored)
+            self._entries.move_to_end((scope, key))
+            while len(self._entries) > settings.IDEMPOTENCY_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+idempotency_cache = IdempotencyCache()
+
+
+def idempotent_request(scope: str, key: Optional[str], body: BaseModel) -> Optional[IdempotentRequest]:
+    """The request's identity for replay, or None when it carries no Idempotency-Key."""
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters",
+        )
+    fingerprint = hashlib.sha256(dump(body.model_dump(mode="json"))).hexdigest()
+    return IdempotentRequest(scope, key, fingerprint)
+
+
+def _load(db: Session, request: IdempotentRequest) -> Optional[StoredResponse]:
+    ttl = timedelta(seconds=get_settings().IDEMPOTENCY_TTL)
+    now = utcnow()
+    row = db.execute(
+        select(
+            IdempotencyKey.fingerprint,
+            IdempotencyKey.status_code,
+            IdempotencyKey.body,
+            IdempotencyKey.etag,
+            IdempotencyKey.created_at,
+        ).where(
+            IdempotencyKey.scope == request.scope,
+            IdempotencyKey.key == request.key,
+            IdempotencyKey.created_at > now - ttl,
+        )
+    ).first()
+    if row is None:
+        return None
+    stored = StoredResponse(row.fingerprint, row.status_code, row.body.encode(), row.etag)
+    created_at = row.created_at if row.created_at.tzinfo is not None else row.created_at.replace(tzinfo=timezone.utc)
+    # Only for what is left of the key's lifetime, which started with the original request
+    idempotency_cache.put(request.scope, request.key, stored, (created_at + ttl - now).total_seconds())
+    return stored
+
+
+def replay_response(db: Session, request: Optional[IdempotentRequest]) -> Optional[RawJSONResponse]:
+    """The stored response for a retried request, or None when the handler has to run."""
+    if request is None:
+        return None
+    stored = idempotency_cache.get(request.scope, request.key) or _load(db, request)
+    if stored is None:
+        return None
+    if stored.fingerprint != request.fingerprint:
+        metrics.incr("idempotency.conflicts")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{IDEMPOTENCY_HEADER} was already used for a different request",
+        )
+    metrics.incr("idempotency.replays")
+    headers = {REPLAYED_HEADER: "true"}
+    if stored.etag is not None:
+        headers["ETag"] = stored.etag
+    return RawJSONResponse(stored.body, status_code=stored.status_code, headers=headers)
+
+
+def save_response(
+    db: Session, request: IdempotentRequest, status_code: int, body: bytes, etag: Optional[str] = None
+) -> RawJSONResponse:
+    """
+    Store the response to `request`; the caller commits it with the mutation and then calls
+    remember_response(). Returns the response to send, which is what replays will send too.
+    """
+    cutoff = utcnow() - timedelta(seconds=get_settings().IDEMPOTENCY_TTL)
+    # An expired use of the same key would otherwise block this one on the unique constraint
+    db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.scope == request.scope,
+            IdempotencyKey.key == request.key,
+            IdempotencyKey.created_at <= cutoff,
+        )
+    )
+    # Every write also purges a few expired keys (created_at index), so the table stays bounded;
+    # rows another write is already purging are skipped rather than waited for
+    expired = (
+        select(IdempotencyKey.id)
+        .where(IdempotencyKey.created_at <= cutoff)
+        .limit(PURGE_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    purged = db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired)).execution_options(synchronize_session=False)
+    ).rowcount
+    if purged > 0:
+        metrics.incr("idempotency.purged", purged)
+    db.add(
+        IdempotencyKey(
+            scope=request.scope,
+            key=request.key,
+            fingerprint=request.fingerprint,
+            status_code=status_code,
+            body=body.decode(),
+            etag=etag,
+        )
+    )
+    headers = {"ETag": etag} if etag is not None else None
+    return RawJSONResponse(body, status_code=status_code, headers=headers)
+
+
+def remember_response(request: IdempotentRequest, response: RawJSONResponse) -> None:
+    """Keep a committed response in this worker's cache."""
+    stored = StoredResponse(request.fingerprint, response.status_code, response.body, response.headers.get("etag"))
+    idempotency_cache.put(request.scope, request.key, stored)
@@ -0,0 +1,232 @@
+"""Cross-worker cache invalidation bus.
+
+Every uvicorn worker keeps its own in-process caches (serialized responses, in-flight reads). A
+write calls invalidation_bus.publish(kind, ids) after commit: the local handlers run right away and
+the message is sent to the other workers, whose handlers run when it arrives.
+
+Backends (INVALIDATION_BUS):
+- postgres: NOTIFY on INVALIDATION_CHANNEL, one LISTEN connection per worker (multi-host)
+- unix: datagrams between the workers of one host through INVALIDATION_SOCKET_DIR (tests, SQLite)
+- none: this worker only
+- auto (default): postgres on PostgreSQL, otherwise none
+
+Delivery is best effort. Whenever a backend may have missed messages (listener (re)connected) every
+kind is invalidated in full, so staleness stays bounded. Propagation delay is recorded as the `invalidation.delay` timing.
+"""
+import json
+import logging
+import os
+import select
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from be.utils.metrics import metrics
+from config import get_settings
+
+log = logging.getLogger(__name__)
+
+# Ids per message: keeps NOTIFY payloads under PostgreSQL's 8000 byte limit
+MESSAGE_MAX_IDS = 500
+
+# Seconds between reconnect attempts of a failed listener
+RECONNECT_DELAY = 1.0
+
+# Handler for one kind: called with the invalidated ids, or None for "everything of this kind"
+Handler = Callable[[Optional[List[int]]], None]
+
+
+class PostgresNotifyBackend:
+    """NOTIFY through a pooled connection; LISTEN on a dedicated connection in a daemon thread."""
+
+    def __init__(self, engine: Engine, channel: str):
+        self._engine = engine
+        self._channel = channel
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def send(self, payload: str) -> None:
+        with self._engine.connect() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"), {"channel": self._channel, "payload": payload}
+            )
+            conn.commit()
+
+    def start(self, receive: Callable[[str], None], resync: Callable[[], None]) -> None:
+        self._thread = threading.Thread(
+            target=self._listen, args=(receive, resync), name="invalidation-listener", daemon=True
+        )
+        self._thread.start()
+
+    def _listen(self, receive: Callable[[str], None], resync: Callable[[], None]) -> None:
+        while not self._stopped.is_set():
+            raw = None
+            try:
+                raw = self._engine.raw_connection()
+                raw.detach()  # never returned to the pool: it stays in LISTEN mode
+                conn = raw.driver_connection
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self._channel}"')
+                # Anything published while we were not listening is lost
+                resync()
+                while not self._stopped.is_set():
+                    if select.select([conn], [], [], 1.0)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            receive(conn.notifies.pop(0).payload)
+            except Exception as e:
+                metrics.incr("invalidation.listen_errors")
+                log.warning(f"⚠️ Invalidation listener failed, reconnecting: {type(e).__name__}: {str(e)}")
+                self._stopped.wait(RECONNECT_DELAY)
+            finally:
+                if raw is not None:
+                    raw.close()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+class UnixSocketBackend:
+    """Datagrams between the workers of one host: each binds <dir>/<origin>.sock and sends to all others."""
+
+    def __init__(self, directory: str, origin: str):
+        self._dir = Path(directory)
+        self._path = self._dir / f"{origin}.sock"
+        self._sock: Optional[socket.socket] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def send(self, payload: str) -> None:
+        data = payload.encode()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            sender.setblocking(False)
+            for path in self._dir.glob("*.sock"):
+                if path == self._path:
+                    continue
+                try:
+                    sender.sendto(data, str(path))
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # A worker that exited without unlinking its socket
+                    path.unlink(missing_ok=True)
+                except BlockingIOError:
+                    metrics.incr("invalidation.dropped")
+
+    def start(self, receive: Callable[[str], None], resync: Callable[[], None]) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._path.unlink(missing_ok=True)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(str(self._path))
+        self._sock.settimeout(1.0)
+        resync()
+        self._thread = threading.Thread(
+            target=self._listen, args=(receive,), name="invalidation-listener", daemon=True
+        )
+        self._thread.start()
+
+    def _listen(self, receive: Callable[[str], None]) -> None:
+        while not self._stopped.is_set():
+            try:
+                data = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            receive(data.decode())
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._sock is not None:
+            self._sock.close()
+        self._path.unlink(missing_ok=True)
+
+
+class InvalidationBus:
+    """Local handler registry plus an optional backend that carries invalidations to other workers."""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self._backend = None
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def subscribe(self, kind: str, handler: Handler) -> None:
+        """Run `handler(ids)` for every invalidation of `kind`, local or from another worker."""
+        self._handlers[kind].append(handler)
+
+    def publish(self, kind: str, ids: Iterable[int]) -> None:
+        """Invalidate `ids` of `kind` in this worker now and in the others as soon as they hear of it."""
+        ids = list(ids)
+        self._apply(kind, ids)
+        metrics.incr("invalidation.published")
+        if self._backend is None:
+            return
+        for start in range(0, max(len(ids), 1), MESSAGE_MAX_IDS):
+            payload = json.dumps(
+                {"origin": self.origin, "kind": kind, "ids": ids[start:start + MESSAGE_MAX_IDS], "at": time.time()}
+            )
+            try:
+                self._backend.send(payload)
+            except Exception as e:
+                metrics.incr("invalidation.publish_errors")
+                log.warning(f"⚠️ Failed to publish {kind} invalidation: {type(e).__name__}: {str(e)}")
+
+    def _apply(self, kind: str, ids: Optional[List[int]]) -> None:
+        for handler in self._handlers.get(kind, ()):
+            try:
+                handler(ids)
+            except Exception as e:
+                log.error(f"❌ Invalidation handler for {kind} failed: {type(e).__name__}: {str(e)}")
+
+    def _receive(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            log.warning(f"⚠️ Ignoring malformed invalidation: {payload[:100]}")
+            return
+        if message.get("origin") == self.origin:
+            return
+        metrics.incr("invalidation.received")
+        metrics.observe("invalidation.delay", max(time.time() - message.get("at", time.time()), 0.0))
+        self._apply(message["kind"], message.get("ids"))
+
+    def _resync(self) -> None:
+        """Invalidate everything: messages may have been missed."""
+        metrics.incr("invalidation.resyncs")
+        for kind in list(self._handlers):
+            self._apply(kind, None)
+
+    def start(self, engine: Engine) -> None:
+        """Start the configured backend (app startup); without one, invalidations stay local."""
+        settings = get_settings()
+        backend = settings.INVALIDATION_BUS
+        if backend == "auto":
+            backend = "postgres" if engine.dialect.name == "postgresql" else "none"
+        if backend == "postgres":
+            self._backend = PostgresNotifyBackend(engine, settings.INVALIDATION_CHANNEL)
+        elif backend == "unix":
+            self._backend = UnixSocketBackend(settings.INVALIDATION_SOCKET_DIR, self.origin)
+        elif backend != "none":
+            raise ValueError(f"Unknown INVALIDATION_BUS: {backend}")
+        if self._backend is not None:
+            self._backend.start(self._receive, self._resync)
+            log.info(f"📣 Invalidation bus started: {backend}")
+
+    def stop(self) -> None:
+        """Stop the backend (app shutdown)."""
+        if self._backend is not None:
+            self._backend.stop()
+        self._backend = None
+
+
+invalidation_bus = InvalidationBus()
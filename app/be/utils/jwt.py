@@ -1,22 +1,29 @@
 """JWT token utilities for B2Bmarket authentication."""
 from datetime import datetime, timedelta
-from typing import Optional
 
 from fastapi import HTTPException, status
-from jose import JWTError, jwt
-from jose.exceptions import ExpiredSignatureError
 
 from config import get_settings
 
-settings = get_settings()
-
 # JWT Configuration
-JWT_SECRET = getattr(settings, "JWT_SECRET", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 15  # 15 minutes
 REFRESH_TOKEN_EXPIRE_DAYS = 7  # 7 days
 
 
+def _jwt_secret() -> str:
+    """JWT signing secret from settings (read at call time, not import time)."""
+    return getattr(get_settings(), "JWT_SECRET", "your-secret-key-change-in-production")
+
+
+def _jose():
+    """Import python-jose on first use; it pulls in cryptography and is slow to import."""
+    from jose import JWTError, jwt
+    from jose.exceptions import ExpiredSignatureError
+
+    return jwt, JWTError, ExpiredSignatureError
+
+
 def create_access_token(data: dict, salt: str) -> str:
     """
     Create an access token with the data and expiration time.
@@ -31,7 +38,8 @@ def create_access_token(data: dict, salt: str) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire, "type": "access", "salt": salt})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET + salt, algorithm=JWT_ALGORITHM)
+    jwt, _, _ = _jose()
+    encoded_jwt = jwt.encode(to_encode, _jwt_secret() + salt, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -49,7 +57,8 @@ def create_refresh_token(data: dict, salt: str) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "type": "refresh", "salt": salt})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET + salt, algorithm=JWT_ALGORITHM)
+    jwt, _, _ = _jose()
+    encoded_jwt = jwt.encode(to_encode, _jwt_secret() + salt, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -73,8 +82,9 @@ def verify_token(token: str, salt: str) -> dict:
             detail="Token not found",
         )
 
+    jwt, JWTError, ExpiredSignatureError = _jose()
     try:
-        payload = jwt.decode(token, JWT_SECRET + salt, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, _jwt_secret() + salt, algorithms=[JWT_ALGORITHM])
         return payload
     except ExpiredSignatureError:
         raise HTTPException(
@@ -105,6 +115,7 @@ def decode_token_without_verification(token: str) -> dict:
             detail="Token not found",
         )
 
+    jwt, JWTError, _ = _jose()
     try:
         decoded_token = jwt.decode(
             token,
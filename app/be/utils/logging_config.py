@@ -3,14 +3,12 @@ import logging
 
 from config import get_settings
 
-settings = get_settings()
-
 
 def setup_logging():
     """Configure logging for the application."""
     # Configure logging with more detail
     logging.basicConfig(
-        level=logging.DEBUG if settings.DEBUG else logging.INFO,
+        level=logging.DEBUG if get_settings().DEBUG else logging.INFO,
         format="%(levelname)s %(asctime)s [%(name)s] - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
@@ -0,0 +1,53 @@
+"""In-process metrics registry for B2Bmarket backend.
+
+Counters and timing summaries are kept per worker process and exposed through
+GET /api/metrics/. Names are dotted, e.g. "db.pool.timeouts".
+"""
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class Metrics:
+    """Thread-safe counters and timing summaries (count / total / max seconds)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increase counter `name` by `value`."""
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record one duration sample for timing `name`."""
+        with self._lock:
+            timing = self._timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            timing["count"] += 1
+            timing["total"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+
+    def counter(self, name: str) -> int:
+        """Current value of counter `name`."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        """Copy of all counters and timings (with average seconds)."""
+        with self._lock:
+            timings = {
+                name: {**t, "avg": t["total"] / t["count"] if t["count"] else 0.0}
+                for name, t in self._timings.items()
+            }
+            return {"counters": dict(self._counters), "timings": timings}
+
+    def reset(self) -> None:
+        """Clear all metrics (tests, benchmarks)."""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
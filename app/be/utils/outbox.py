@@ -0,0 +1,40 @@
+"""Catalog change outbox: mutations append to catalog_changes in their own transaction."""
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import DateTime, insert, literal, select
+from sqlalchemy.orm import Session
+
+from be.models.catalog_change import CatalogChange
+from be.models.product import utcnow
+
+
+def record_change(db: Session, entity: str, entity_id: int, action: str, version: Optional[int] = None) -> None:
+    """Append one change; the caller commits it together with the mutation."""
+    record_changes(db, entity, action, [(entity_id, version)])
+
+
+def record_changes(db: Session, entity: str, action: str, rows: Iterable[Tuple[int, Optional[int]]]) -> None:
+    """Append one change per (entity_id, version) row with a single executemany INSERT."""
+    now = utcnow()
+    params = [
+        {"entity": entity, "entity_id": entity_id, "action": action, "version": version, "created_at": now}
+        for entity_id, version in rows
+    ]
+    if params:
+        db.execute(insert(CatalogChange), params)
+
+
+def record_changes_from(db: Session, entity: str, action: str, model, *criteria) -> None:
+    """Append one change per `model` row matching `criteria` with a single INSERT ... SELECT."""
+    db.execute(
+        insert(CatalogChange).from_select(
+            ["entity", "entity_id", "action", "version", "created_at"],
+            select(
+                literal(entity),
+                model.id,
+                literal(action),
+                model.version,
+                literal(utcnow(), DateTime(timezone=True)),
+            ).where(*criteria),
+        )
+    )
@@ -0,0 +1,85 @@
+"""Keyset (cursor) pagination for newest-first listings ordered by (created_at DESC, id DESC)."""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    values = json.loads(raw)
+    if not isinstance(values, list):
+        raise ValueError("cursor is not a list")
+    return values
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque cursor pointing at the last row of a page."""
+    return _encode([created_at.isoformat(), id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_cursor or raise 400."""
+    try:
+        created_at, id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_change_cursor(changed_at: datetime, id: int, deleted: bool) -> str:
+    """Opaque cursor pointing at the last change of a delta sync page (oldest first)."""
+    return _encode([changed_at.isoformat(), id, int(deleted)])
+
+
+def decode_change_cursor(cursor: str) -> Tuple[datetime, int, int]:
+    """Decode a cursor from encode_change_cursor or raise 400."""
+    try:
+        changed_at, id, deleted = _decode(cursor)
+        return datetime.fromisoformat(changed_at), int(id), int(deleted)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def after_cursor(model, cursor: str):
+    """
+    Filter for rows that come after `cursor` in (created_at DESC, id DESC) order.
+
+    The anchor timestamp is read back from the cursor row itself when it still exists, so ties
+    compare against the exact stored value (SQLite keeps server-default timestamps without
+    microseconds); the timestamp carried in the cursor is the fallback for deleted rows.
+    """
+    created_at, id = decode_cursor(cursor)
+    anchor = select(model.created_at).where(model.id == id).scalar_subquery()
+    return tuple_(model.created_at, model.id) < tuple_(func.coalesce(anchor, created_at), id)
+
+
+def paginate(query: Query, model, limit: int, cursor: Optional[str], response: Response) -> List[Any]:
+    """
+    Apply newest-first keyset pagination to `query` and return one page of rows.
+
+    One extra row is fetched to detect a next page; when there is one, its cursor is set on the
+    X-Next-Cursor response header. Rows may be `model` instances or rows with its created_at and id.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        query = query.filter(after_cursor(model, cursor))
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows
@@ -1,13 +1,21 @@
 """Password hashing and verification utilities."""
 import secrets
 
+from functools import lru_cache
+
 try:
     import bcrypt
     USE_DIRECT_BCRYPT = True
 except ImportError:
     USE_DIRECT_BCRYPT = False
+
+
+@lru_cache()
+def _pwd_context():
+    """passlib fallback context, built on first use so passlib stays off the startup path."""
     from passlib.context import CryptContext
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
@@ -31,7 +39,7 @@ def hash_password(password: str) -> str:
         return hashed.decode('utf-8')
     else:
         # Fallback to passlib
-        return pwd_context.hash(password)
+        return _pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -54,7 +62,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return bcrypt.checkpw(plain_bytes, hashed_bytes)
     else:
         # Fallback to passlib
-        return pwd_context.verify(plain_password, hashed_password)
+        return _pwd_context().verify(plain_password, hashed_password)
 
 
 def generate_salt() -> str:
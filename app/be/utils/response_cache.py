@@ -0,0 +1,99 @@
+"""Per-worker cache of serialized JSON response fragments, keyed by row version.
+
+Each entry is the JSON object for one row (e.g. a ProductResponse) tagged with the versions it
+was built from. A lookup only hits when the caller's tag, read from the database in the same
+request, still matches, so a stale entry can never be served, even after a write in another
+worker. Writes also drop their rows' entries right away, which frees the memory sooner. Lists are
+assembled by joining fragments (be.utils.fast_json.join_fragments).
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from be.utils.metrics import metrics
+from config import get_settings
+
+# Rows loaded per IN query when filling cache misses
+FILL_CHUNK_SIZE = 1000
+
+
+class FragmentCache:
+    """Thread-safe LRU of (kind, id) -> (version tag, JSON bytes)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[Hashable, bytes]]" = OrderedDict()
+
+    def get_many(self, kind: str, tags: Iterable[Tuple[int, Hashable]]) -> Dict[int, bytes]:
+        """Cached fragments for the (id, tag) pairs whose tag matches."""
+        found = {}
+        with self._lock:
+            for id, tag in tags:
+                entry = self._entries.get((kind, id))
+                if entry is not None and entry[0] == tag:
+                    self._entries.move_to_end((kind, id))
+                    found[id] = entry[1]
+        return found
+
+    def put_many(self, kind: str, items: Iterable[Tuple[int, Hashable, bytes]]) -> None:
+        """Store (id, tag, fragment) entries, evicting the least recently used beyond the size limit."""
+        max_entries = get_settings().RESPONSE_CACHE_MAX_ENTRIES
+        if max_entries <= 0:
+            return
+        with self._lock:
+            for id, tag, fragment in items:
+                self._entries[(kind, id)] = (tag, fragment)
+                self._entries.move_to_end((kind, id))
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, kind: str, ids: Optional[Iterable[int]]) -> None:
+        """Drop the entries of written or deleted rows (ids=None: every entry of `kind`)."""
+        with self._lock:
+            if ids is None:
+                ids = [id for entry_kind, id in self._entries if entry_kind == kind]
+            for id in ids:
+                self._entries.pop((kind, id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = FragmentCache()
+
+
+def tagged_fragments(
+    kind: str,
+    tags: List[Tuple[int, Hashable]],
+    load: Callable[[List[int]], Iterable[Tuple[int, Hashable, bytes]]],
+) -> Dict[int, Tuple[Hashable, bytes]]:
+    """
+    (tag, fragment) for (id, current tag) pairs: cache hits first, misses via `load` and stored.
+
+    `load(ids)` returns (id, tag, fragment) for the rows it still finds; rows deleted in between
+    are simply absent from the result. A loaded fragment comes with the tag of the row it was
+    built from, which is newer than the caller's when the row was written in between.
+    """
+    wanted = dict(tags)
+    found = {id: (wanted[id], fragment) for id, fragment in response_cache.get_many(kind, tags).items()}
+    missing = [id for id, _ in tags if id not in found]
+    metrics.incr(f"cache.{kind}.hits", len(found))
+    metrics.incr(f"cache.{kind}.misses", len(missing))
+    for start in range(0, len(missing), FILL_CHUNK_SIZE):
+        loaded = list(load(missing[start:start + FILL_CHUNK_SIZE]))
+        response_cache.put_many(kind, loaded)
+        found.update((id, (tag, fragment)) for id, tag, fragment in loaded)
+    return found
+
+
+def cached_fragments(
+    kind: str,
+    tags: List[Tuple[int, Hashable]],
+    load: Callable[[List[int]], Iterable[Tuple[int, Hashable, bytes]]],
+) -> Dict[int, bytes]:
+    """Fragments for (id, current tag) pairs, as tagged_fragments() without the tags."""
+    return {id: fragment for id, (_, fragment) in tagged_fragments(kind, tags, load).items()}
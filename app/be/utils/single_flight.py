@@ -0,0 +1,89 @@
+"""Request coalescing (single-flight) for identical concurrent reads.
+
+When many identical reads arrive at once (a shared product page, a vendor listing right after its
+cache entries were dropped), the first one runs the fetch and the others wait for its result
+instead of running the same queries. Results are shared as they are, so fetches return immutable
+values (bytes, tuples, Rows). Writes call forget() after commit so that requests arriving later
+never join a fetch that started before the write.
+"""
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from be.utils.metrics import metrics
+from config import get_settings
+
+T = TypeVar("T")
+
+_ALL = object()
+
+
+class _Flight:
+    """One in-flight fetch: its waiters block on `done` and then read `result` / `error`."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe map of (kind, key) -> in-flight fetch, per worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Tuple[str, Hashable], _Flight] = {}
+
+    def do(self, kind: str, key: Hashable, fetch: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """
+        Return fetch(), shared with every concurrent call for the same (kind, key).
+
+        A waiter gives up after `timeout` seconds (default SINGLE_FLIGHT_TIMEOUT) and runs its own
+        fetch, so one slow query cannot hold all of them; 0 disables coalescing. An exception from
+        the shared fetch is raised to all of its waiters.
+        """
+        if timeout is None:
+            timeout = get_settings().SINGLE_FLIGHT_TIMEOUT
+        if timeout <= 0:
+            return fetch()
+        with self._lock:
+            flight = self._flights.get((kind, key))
+            leader = flight is None
+            if leader:
+                flight = self._flights[(kind, key)] = _Flight()
+        if leader:
+            metrics.incr(f"singleflight.{kind}.fetches")
+            try:
+                flight.result = fetch()
+                return flight.result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    if self._flights.get((kind, key)) is flight:
+                        del self._flights[(kind, key)]
+                flight.done.set()
+        if not flight.done.wait(timeout):
+            metrics.incr(f"singleflight.{kind}.timeouts")
+            return fetch()
+        metrics.incr(f"singleflight.{kind}.coalesced")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def forget(self, kind: str, key: Hashable = _ALL) -> None:
+        """Start a new fetch for the next caller of (kind, key), or of every key of `kind`."""
+        with self._lock:
+            if key is not _ALL:
+                self._flights.pop((kind, key), None)
+            else:
+                for flight_key in [k for k in self._flights if k[0] == kind]:
+                    del self._flights[flight_key]
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,24 @@
+"""Product tombstones: deletions recorded for delta sync (GET /api/products/changes)."""
+from sqlalchemy import DateTime, insert, literal, select
+from sqlalchemy.orm import Session
+
+from be.models.product import Product, utcnow
+from be.models.product_tombstone import ProductTombstone
+from be.utils.outbox import record_changes_from
+
+
+def record_product_deletions(db: Session, *criteria) -> None:
+    """
+    Insert a tombstone and a catalog_changes entry for every product matching `criteria`, in the
+    caller's transaction.
+
+    Call it right before the products are deleted (including vendor deletes that remove them by
+    ON DELETE CASCADE); it is two INSERT ... SELECTs, so no product is loaded.
+    """
+    db.execute(
+        insert(ProductTombstone).from_select(
+            ["product_id", "vendor_id", "deleted_at"],
+            select(Product.id, Product.vendor_id, literal(utcnow(), DateTime(timezone=True))).where(*criteria),
+        )
+    )
+    record_changes_from(db, "product", "deleted", Product, *criteria)
@@ -0,0 +1,99 @@
+"""Startup warm-up for B2Bmarket: pooled connections, hot statements and lazy caches."""
+import logging
+
+from sqlalchemy import Select, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, configure_mappers
+from sqlalchemy.pool import QueuePool
+
+log = logging.getLogger(__name__)
+
+
+def warm_up_pool(engine: Engine, connections: int) -> int:
+    """
+    Open up to `connections` pooled connections so the first requests skip TCP/auth handshakes.
+
+    Connections are held simultaneously so the pool really creates distinct ones, then returned.
+    The count is capped at the pool size: overflow connections would be discarded on check-in.
+
+    Returns:
+        Number of connections opened
+    """
+    if isinstance(engine.pool, QueuePool):
+        connections = min(connections, engine.pool.size())
+    opened = []
+    try:
+        for _ in range(max(connections, 0)):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+def _hot_queries(session: Session) -> list:
+    """
+    ORM queries / selects with the same shape as the busiest routes, so their SQL lands in the
+    compiled cache.
+    """
+    from be.models.product import Product
+    from be.models.user import User
+    from be.models.vendor import Vendor
+    from be.routers.products import PRODUCT_CACHE_KEY_COLUMNS, WITH_VENDOR_NAME, _product_keys
+    from be.routers.vendors import VENDOR_KEY_COLUMNS, VENDOR_LIST_COLUMNS
+
+    product_keys = _product_keys(select(*PRODUCT_CACHE_KEY_COLUMNS))
+    newest_products = product_keys.order_by(Product.created_at.desc(), Product.id.desc())
+    return [
+        session.query(Product).options(WITH_VENDOR_NAME).filter(Product.id == 0).limit(1),
+        session.query(Product).filter(Product.id == 0).limit(1),
+        newest_products,
+        newest_products.where(Product.vendor_id == 0),
+        product_keys.where(Product.id == 0),
+        session.query(Vendor).filter(Vendor.id == 0).limit(1),
+        select(*VENDOR_KEY_COLUMNS).where(Vendor.id == 0),
+        session.query(*VENDOR_KEY_COLUMNS).order_by(Vendor.created_at.desc(), Vendor.id.desc()).limit(1),
+        select(*VENDOR_LIST_COLUMNS).where(Vendor.id.in_([0])),
+        session.query(User).filter(User.id == 0).limit(1),
+    ]
+
+
+def precompile_hot_statements(engine: Engine) -> int:
+    """
+    Execute the hot route queries once so SQLAlchemy caches their compiled SQL.
+
+    At most one row is fetched per query (streamed with yield_per, then closed), so this
+    stays cheap on large tables. Execution options are not part of the cache key, so the
+    cached entries are reused by the routes' own `.all()` / `.first()` calls.
+
+    Returns:
+        Number of statements compiled
+    """
+    import be.models  # noqa: F401 - register all mappers before configuring them
+
+    configure_mappers()
+    with Session(bind=engine) as session:
+        queries = _hot_queries(session)
+        for query in queries:
+            if isinstance(query, Select):
+                result = session.execute(query, execution_options={"yield_per": 1})
+                result.fetchone()
+                result.close()
+            else:
+                rows = iter(query.yield_per(1))
+                next(rows, None)
+                rows.close()
+        session.rollback()
+    return len(queries)
+
+
+def warm_up(engine: Engine, connections: int) -> None:
+    """Run all startup warm-up steps; failures are logged, never fatal, so the app still starts."""
+    try:
+        opened = warm_up_pool(engine, connections)
+        compiled = precompile_hot_statements(engine)
+        log.info(f"🔥 Warm-up complete: {opened} pooled connection(s), {compiled} statement(s) compiled")
+    except Exception as e:
+        log.warning(f"⚠️ Warm-up failed, continuing cold: {type(e).__name__}: {str(e)}")
@@ -0,0 +1,184 @@
+"""Pre-fork multi-worker supervisor for running B2Bmarket in production.
+
+The master process imports the app and binds the listening socket once, then
+forks N uvicorn workers that share the imported code copy-on-write. Crashed or
+recycled workers are replaced; SIGTERM/SIGINT drain all workers gracefully.
+"""
+import logging
+import os
+import random
+import signal
+import sys
+import time
+from typing import Dict, Optional
+
+import uvicorn
+
+from config import Settings
+
+log = logging.getLogger(__name__)
+
+# Workers that die faster than this are considered crash-looping and respawned with a delay
+MIN_WORKER_LIFETIME = 1.0
+RESPAWN_BACKOFF = 1.0
+POLL_INTERVAL = 0.5
+
+
+def resolve_worker_count(configured: int) -> int:
+    """Return the number of workers to run: the configured value, or one per CPU when 0."""
+    if configured > 0:
+        return configured
+    return os.cpu_count() or 1
+
+
+def max_requests_for_worker(max_requests: int, jitter: int) -> Optional[int]:
+    """
+    Per-worker request limit before recycling.
+
+    A random jitter is added so that workers started together don't all restart at once.
+    Returns None when recycling is disabled.
+    """
+    if max_requests <= 0:
+        return None
+    return max_requests + (random.randint(0, jitter) if jitter > 0 else 0)
+
+
+class WorkerSupervisor:
+    """Fork, monitor and restart uvicorn worker processes sharing one listening socket."""
+
+    def __init__(self, app: str, settings: Settings):
+        self.settings = settings
+        self.num_workers = resolve_worker_count(settings.UVICORN_WORKERS)
+        self.config = uvicorn.Config(
+            app,
+            host=settings.UVICORN_HOST,
+            port=int(settings.UVICORN_PORT),
+            log_level="info",
+            timeout_graceful_shutdown=settings.UVICORN_GRACEFUL_TIMEOUT,
+        )
+        self.workers: Dict[int, float] = {}  # pid -> start time
+        self.should_exit = False
+        self.socket = None
+
+    def run(self) -> None:
+        """Import the app, bind the socket, fork workers and supervise them until shutdown."""
+        # Import the app in the master so forked workers share its memory copy-on-write
+        self.config.load()
+        self.socket = self.config.bind_socket()
+
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self._handle_exit)
+
+        log.info(f"🚀 Starting {self.num_workers} worker(s), master pid={os.getpid()}")
+        for _ in range(self.num_workers):
+            self._spawn_worker()
+
+        while not self.should_exit:
+            self._reap_workers()
+            time.sleep(POLL_INTERVAL)
+
+        self._shutdown()
+
+    def _handle_exit(self, sig: int, frame) -> None:
+        log.info(f"🛑 Received signal {signal.Signals(sig).name}, draining workers")
+        self.should_exit = True
+
+    def _spawn_worker(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self._run_worker()
+            except BaseException:
+                log.error(f"❌ Worker crashed: pid={os.getpid()}", exc_info=True)
+                exit_code = 1
+            finally:
+                # Never fall back into the master's supervision loop
+                os._exit(exit_code)
+        self.workers[pid] = time.monotonic()
+        log.info(f"👷 Worker started: pid={pid}")
+
+    def _run_worker(self) -> None:
+        """Worker process body: serve requests on the inherited socket until told to stop."""
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, signal.SIG_DFL)
+        # Pooled connections must never be shared across a fork
+        from be.database import engine
+
+        engine.dispose(close=False)
+        self.config.limit_max_requests = max_requests_for_worker(
+            self.settings.UVICORN_MAX_REQUESTS, self.settings.UVICORN_MAX_REQUESTS_JITTER
+        )
+        server = uvicorn.Server(self.config)
+        server.run(sockets=[self.socket])
+        if not server.started:
+            # Lifespan startup failed (e.g. bad DATABASE_URL): uvicorn returns normally, but this is a crash
+            sys.exit(1)
+
+    def _reap_workers(self) -> None:
+        """Collect exited workers and replace them while the supervisor is running."""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            started = self.workers.pop(pid, None)
+            if started is None:
+                continue
+            exit_code = os.waitstatus_to_exitcode(status)
+            if self.should_exit:
+                continue
+            if exit_code == 0:
+                log.info(f"♻️ Worker recycled: pid={pid}")
+            else:
+                log.warning(f"⚠️ Worker died: pid={pid}, exit_code={exit_code}, restarting")
+            # Whatever the exit code: a worker that cannot stay up must not be forked in a tight loop
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(RESPAWN_BACKOFF)
+            self._spawn_worker()
+
+    def _shutdown(self) -> None:
+        """Ask workers to finish in-flight requests, then kill any that outlive the grace period."""
+        for pid in list(self.workers):
+            self._signal_worker(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.settings.UVICORN_GRACEFUL_TIMEOUT + 5
+        while self.workers and time.monotonic() < deadline:
+            self._reap_workers()
+            time.sleep(0.1)
+
+        for pid in list(self.workers):
+            log.warning(f"⚠️ Worker did not exit in time, killing: pid={pid}")
+            self._signal_worker(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.workers.clear()
+        if self.socket is not None:
+            self.socket.close()
+        log.info("✅ All workers stopped")
+
+    def _signal_worker(self, pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            self.workers.pop(pid, None)
+
+
+def run_production(app: str, settings: Settings) -> None:
+    """Run the app with the pre-fork supervisor, or uvicorn's own process manager without fork()."""
+    if not hasattr(os, "fork"):
+        uvicorn.run(
+            app,
+            host=settings.UVICORN_HOST,
+            port=int(settings.UVICORN_PORT),
+            workers=resolve_worker_count(settings.UVICORN_WORKERS),
+            limit_max_requests=max_requests_for_worker(settings.UVICORN_MAX_REQUESTS, 0),
+            timeout_graceful_shutdown=settings.UVICORN_GRACEFUL_TIMEOUT,
+            log_level="info",
+        )
+        return
+    WorkerSupervisor(app, settings).run()
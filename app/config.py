@@ -23,9 +23,59 @@ class Settings(BaseSettings):
     APP_URL: str = "http://localhost:3000"
     DATABASE_URL: str = "postgresql://localhost/b2bmarket"
     DATABASE_UT_URL: str = "sqlite:///./test_b2bmarket.db"
+    # Connection pool (be/database.py); pool wait time and timeouts are reported at /api/metrics/
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced; -1 = never
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 5  # pooled connections opened at startup (capped at the pool size)
+    # Worker threads for sync handlers; 0 = DB_POOL_SIZE + DB_MAX_OVERFLOW so requests wait for a
+    # thread instead of holding one while blocked on pool_timeout
+    THREADPOOL_SIZE: int = 0
     FRONTEND_URL: str = "http://localhost:3000"
     UVICORN_PORT: str = "8210"
+    UVICORN_HOST: str = "127.0.0.1"
+    # Production launcher (python run.py --prod)
+    UVICORN_PRODUCTION: bool = False
+    UVICORN_WORKERS: int = 0  # 0 = one worker per CPU
+    UVICORN_MAX_REQUESTS: int = 0  # recycle a worker after N requests; 0 = never
+    UVICORN_MAX_REQUESTS_JITTER: int = 0  # random extra requests so workers don't recycle together
+    UVICORN_GRACEFUL_TIMEOUT: int = 30  # seconds to drain in-flight requests on SIGTERM
     DEBUG: bool = False
+    VENDOR_DELETE_BATCH_SIZE: int = 1000  # products per transaction for DELETE /api/vendors/{id}?async=true
+    VENDOR_DELETE_LEASE: float = 300.0  # seconds without a batch before startup resumes a vendor delete
+    RESPONSE_CACHE_MAX_ENTRIES: int = 50000  # serialized product/vendor bodies kept per worker; 0 = off
+    SINGLE_FLIGHT_TIMEOUT: float = 5.0  # seconds a coalesced read waits for the shared fetch; 0 = off
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller response bodies are sent uncompressed
+    COMPRESSION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # compressed GET bodies kept per worker
+    INVALIDATION_BUS: str = "auto"  # auto | postgres | unix | none: how workers tell each other about writes
+    INVALIDATION_CHANNEL: str = "b2bmarket_invalidate"  # LISTEN/NOTIFY channel (postgres)
+    INVALIDATION_SOCKET_DIR: str = "/tmp/b2bmarket-invalidation"  # one datagram socket per worker (unix)
+    REQUEST_TIMEOUT: float = 30.0  # seconds per API request, applied to its DB statements (504 when hit); 0 = off
+    REQUEST_TIMEOUT_MAX: float = 120.0  # cap for a client's X-Request-Timeout header
+    # Admission control (be/utils/admission.py): concurrent requests per route class; 0 = unlimited
+    ADMISSION_AUTH_LIMIT: int = 2  # login / refresh / verify (bcrypt is CPU-bound)
+    ADMISSION_READ_LIMIT: int = 8
+    ADMISSION_WRITE_LIMIT: int = 4
+    ADMISSION_EXPORT_LIMIT: int = 2  # full catalog listings (GET /api/products/)
+    ADMISSION_QUEUE_SIZE: int = 50  # requests waiting per route class; more are shed with 503
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0  # seconds a request may wait for admission before 503
+    BATCH_MAX_REQUESTS: int = 20  # sub-requests per POST /api/batch
+    BATCH_MAX_CONCURRENCY: int = 4  # reads of one batch dispatched at once; 1 = one after another
+    IDEMPOTENCY_TTL: float = 86400.0  # seconds a POST response is replayed for a reused Idempotency-Key
+    IDEMPOTENCY_CACHE_MAX_ENTRIES: int = 10000  # stored responses also kept in memory per worker; 0 = off
+    PRODUCT_BATCH_MAX_IDS: int = 1000  # ids per GET or POST /api/products/lookup
+    BULK_PRICE_MAX_ITEMS: int = 10000  # entries accepted by one PATCH /api/products/prices request
+    BULK_PRICE_BATCH_SIZE: int = 500  # rows per UPDATE statement for PATCH /api/products/prices
+    DELTA_SYNC_SAFETY_LAG: float = 5.0  # seconds; GET /api/products/changes serves only older changes
+    # GET /api/changes/stream: one catalog_changes poller per worker, fanned out to all subscribers
+    CHANGE_FEED_POLL_INTERVAL: float = 1.0  # seconds between polls while anyone is subscribed
+    CHANGE_FEED_BATCH_SIZE: int = 500  # changes read per poll / per catch-up query
+    CHANGE_FEED_QUEUE_SIZE: int = 1000  # undelivered events per subscriber before it is disconnected
+    CHANGE_FEED_HEARTBEAT: float = 15.0  # seconds of silence before a keep-alive comment
+    CHANGE_FEED_GAP_TIMEOUT: float = 10.0  # seconds to wait for a skipped offset to commit
+    ORM_LAZY_LOAD_GUARD: bool = False  # raise on any relationship lazy load (always on in tests)
     JWT_SECRET: str = "your-secret-key-change-in-production-use-openssl-rand-hex-32"
 
     # Automatically load from .env file
@@ -1,40 +1,93 @@
 """B2Bmarket B2B marketplace portal - FastAPI backend."""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from config import get_settings
 from fastapi import FastAPI
+from anyio import to_thread
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from be.routers import auth, health, ping, vendors, products
+from be.database import engine
+from be.routers import auth, batch, changes, health, metrics, ping, vendors, products
+from be.utils.admission import AdmissionMiddleware
+from be.utils.change_feed import change_feed
+from be.utils.compression import CompressionMiddleware
+from be.utils.deadline import DeadlineMiddleware
+from be.utils.invalidation import invalidation_bus
 from be.utils.logging_config import setup_logging
 from be.utils.middleware import LoggingMiddleware
+from be.utils.pagination import NEXT_CURSOR_HEADER
+from be.utils.warmup import warm_up
 from be.utils.exception_handlers import setup_exception_handlers
 
 settings = get_settings()
 
 # Setup logging configuration
 setup_logging()
+log = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm the DB pool and compiled-statement cache and start the invalidation bus before serving,
+    and resume unfinished batched vendor deletes in the background; stop the bus and the change
+    feed and dispose the engine on shutdown.
+    """
+    # Size the sync-handler threadpool to the DB pool so requests don't block invisibly on pool_timeout
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.THREADPOOL_SIZE or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
+    await run_in_threadpool(warm_up, engine, settings.DB_POOL_WARMUP)
+    invalidation_bus.start(engine)
+    resuming = asyncio.create_task(
+        run_in_threadpool(
+            vendors.resume_vendor_deletes, engine, settings.VENDOR_DELETE_BATCH_SIZE, settings.VENDOR_DELETE_LEASE
+        )
+    )
+    yield
+    if not resuming.done():
+        log.warning("⚠️ Shutting down with vendor deletes still running; they resume at the next startup")
+    invalidation_bus.stop()
+    await change_feed.stop()
+    engine.dispose()
+    log.info("🔌 Database engine disposed")
+
 
 app = FastAPI(
     title="B2Bmarket API",
     description="B2B marketplace portal backend",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add middleware
+app.add_middleware(CompressionMiddleware)
+# Inside logging and CORS, so shed requests are logged and carry CORS headers
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(LoggingMiddleware)
+# Outside admission control, so time spent queued counts against the request deadline
+app.add_middleware(DeadlineMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[settings.FRONTEND_URL, "http://localhost:3000"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Register routers
 app.include_router(ping.router, prefix="/api")
 app.include_router(health.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(vendors.router, prefix="/api")
 app.include_router(products.router, prefix="/api")
+app.include_router(changes.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
 
 # Setup exception handlers
 setup_exception_handlers(app)
@@ -0,0 +1,46 @@
+"""Add composite indexes for newest-first product and vendor listings
+
+Revision ID: 007
+Revises: 006
+Create Date: B2Bmarket listing indexes
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # id breaks created_at ties so pagination order is stable and fully index-ordered
+    op.create_index(
+        "ix_products_vendor_id_created_at_id",
+        "products",
+        ["vendor_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_products_created_at_id",
+        "products",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_vendors_created_at_id",
+        "vendors",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    # vendor_id is the leading column of the composite index, which also serves the FK cascade
+    op.drop_index(op.f("ix_products_vendor_id"), table_name="products")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_products_vendor_id"), "products", ["vendor_id"], unique=False)
+    op.drop_index("ix_vendors_created_at_id", table_name="vendors")
+    op.drop_index("ix_products_created_at_id", table_name="products")
+    op.drop_index("ix_products_vendor_id_created_at_id", table_name="products")
@@ -0,0 +1,30 @@
+"""Add prefix-search indexes on lower(name) / lower(email) for vendors
+
+Revision ID: 008
+Revises: 007
+Create Date: B2Bmarket vendor search
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /api/vendors?q= filters with lower(col) LIKE 'prefix%'; pattern ops let Postgres use a
+    # btree range scan regardless of collation. Other databases keep the plain indexes.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE INDEX ix_vendors_name_lower_prefix ON vendors (lower(name) varchar_pattern_ops)")
+    op.execute("CREATE INDEX ix_vendors_email_lower_prefix ON vendors (lower(email) varchar_pattern_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX ix_vendors_email_lower_prefix")
+    op.execute("DROP INDEX ix_vendors_name_lower_prefix")
@@ -0,0 +1,34 @@
+"""Add version and updated_at to products and vendors (optimistic concurrency, ETags)
+
+Revision ID: 009
+Revises: 008
+Create Date: B2Bmarket optimistic concurrency
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("products", "vendors"):
+        op.add_column(table, sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False))
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False
+            ),
+        )
+        # Existing rows were last written when they were created
+        op.execute(f"UPDATE {table} SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    for table in ("vendors", "products"):
+        op.drop_column(table, "updated_at")
+        op.drop_column(table, "version")
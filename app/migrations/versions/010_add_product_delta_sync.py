@@ -0,0 +1,40 @@
+"""Add updated_at index and product tombstones for delta sync
+
+Revision ID: 010
+Revises: 009
+Create Date: B2Bmarket delta sync
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /api/products?updated_since= walks (updated_at, id) in index order
+    op.create_index("ix_products_updated_at_id", "products", ["updated_at", "id"], unique=False)
+    op.create_table(
+        "product_tombstones",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("vendor_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_product_tombstones_deleted_at_product_id",
+        "product_tombstones",
+        ["deleted_at", "product_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_tombstones_deleted_at_product_id", table_name="product_tombstones")
+    op.drop_table("product_tombstones")
+    op.drop_index("ix_products_updated_at_id", table_name="products")
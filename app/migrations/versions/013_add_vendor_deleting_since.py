@@ -0,0 +1,23 @@
+"""Add deleting_since to vendors (resumable batched vendor deletes)
+
+Revision ID: 013
+Revises: 012
+Create Date: B2Bmarket resumable vendor deletes
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "013"
+down_revision = "012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("vendors", sa.Column("deleting_since", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("vendors", "deleting_since")
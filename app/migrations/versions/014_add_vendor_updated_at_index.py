@@ -0,0 +1,23 @@
+"""Add updated_at index to vendors for delta sync
+
+Revision ID: 014
+Revises: 013
+Create Date: B2Bmarket delta sync of vendor changes
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "014"
+down_revision = "013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /api/products/changes reports the products of vendors changed since the cursor
+    op.create_index("ix_vendors_updated_at", "vendors", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vendors_updated_at", table_name="vendors")
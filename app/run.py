@@ -1,29 +1,48 @@
 """Startup script for B2Bmarket backend server.
 
-This script reads the port configuration from .env file (UVICORN_PORT)
+This script reads the server configuration from .env file (UVICORN_*)
 and starts the FastAPI application using uvicorn.
 
 Usage:
-    python run.py
+    python run.py          # development: single process with auto-reload
+    python run.py --prod   # production: pre-forked workers (see be/utils/workers.py)
 
 The port can be configured in .env file:
     UVICORN_PORT=8210
+
+Production mode is also enabled with UVICORN_PRODUCTION=true and is tuned with
+UVICORN_WORKERS, UVICORN_MAX_REQUESTS, UVICORN_MAX_REQUESTS_JITTER and
+UVICORN_GRACEFUL_TIMEOUT.
 """
+import argparse
+
 import uvicorn
 
 from config import get_settings
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start the B2Bmarket backend")
+    parser.add_argument("--prod", action="store_true", help="Run pre-forked production workers")
+    args = parser.parse_args()
+
     settings = get_settings()
+    host = settings.UVICORN_HOST
     port = int(settings.UVICORN_PORT)
-    
-    print(f"Starting B2Bmarket backend on http://127.0.0.1:{port}")
-    print(f"API docs available at http://127.0.0.1:{port}/docs")
-    
-    uvicorn.run(
-        "main:app",
-        host="127.0.0.1",
-        port=port,
-        reload=True,
-        log_level="info",
-    )
+
+    print(f"Starting B2Bmarket backend on http://{host}:{port}")
+    print(f"API docs available at http://{host}:{port}/docs")
+
+    if args.prod or settings.UVICORN_PRODUCTION:
+        from be.utils.logging_config import setup_logging
+        from be.utils.workers import run_production
+
+        setup_logging()
+        run_production("main:app", settings)
+    else:
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            reload=True,
+            log_level="info",
+        )
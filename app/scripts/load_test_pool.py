@@ -0,0 +1,99 @@
+"""Load test for DB connection pool sizing.
+
+Runs a fixed number of concurrent worker threads (like the anyio threadpool running
+sync handlers) against engines built with different pool sizes, and prints the
+throughput curve together with pool wait time and timeouts for each setting.
+
+Usage:
+    python scripts/load_test_pool.py [--url URL] [--threads 40] [--duration 5]
+                                     [--query-ms 5] [--pool-sizes 2,5,10,20,40]
+                                     [--max-overflow 5] [--pool-timeout 2]
+
+Each request holds its connection for --query-ms (pg_sleep on Postgres, a Python
+sleep on other databases) to simulate handler DB work.
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, exc, text
+
+from be.database import InstrumentedQueuePool
+from be.utils.metrics import metrics
+from config import get_settings
+
+
+def run_setting(url: str, pool_size: int, args) -> dict:
+    """Drive one engine configuration for args.duration seconds and collect its numbers."""
+    metrics.reset()
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=args.max_overflow,
+        pool_timeout=args.pool_timeout,
+    )
+    is_postgres = engine.dialect.name == "postgresql"
+    sleep_s = args.query_ms / 1000.0
+    deadline = time.perf_counter() + args.duration
+    completed = [0] * args.threads
+
+    def worker(i: int) -> None:
+        while time.perf_counter() < deadline:
+            try:
+                with engine.connect() as conn:
+                    if is_postgres:
+                        conn.execute(text("SELECT pg_sleep(:s)"), {"s": sleep_s})
+                    else:
+                        conn.execute(text("SELECT 1"))
+                        time.sleep(sleep_s)
+                completed[i] += 1
+            except exc.TimeoutError:
+                pass
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    snapshot = metrics.snapshot()
+    wait = snapshot["timings"].get("db.pool.wait", {"avg": 0.0, "max": 0.0})
+    return {
+        "pool_size": pool_size,
+        "rps": sum(completed) / args.duration,
+        "wait_avg_ms": wait["avg"] * 1000,
+        "wait_max_ms": wait["max"] * 1000,
+        "timeouts": snapshot["counters"].get("db.pool.timeouts", 0),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=get_settings().DATABASE_URL, help="Database URL")
+    parser.add_argument("--threads", type=int, default=40, help="Concurrent handler threads")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per setting")
+    parser.add_argument("--query-ms", type=float, default=5.0, help="DB time per request in ms")
+    parser.add_argument("--pool-sizes", default="2,5,10,20,40", help="Comma-separated pool sizes")
+    parser.add_argument("--max-overflow", type=int, default=5, help="max_overflow for every setting")
+    parser.add_argument("--pool-timeout", type=float, default=2.0, help="pool_timeout in seconds")
+    args = parser.parse_args()
+
+    print(f"threads={args.threads} query={args.query_ms}ms overflow={args.max_overflow} timeout={args.pool_timeout}s")
+    print(f"{'pool_size':>9} {'req/s':>10} {'wait avg ms':>12} {'wait max ms':>12} {'timeouts':>9}")
+    for pool_size in (int(s) for s in args.pool_sizes.split(",")):
+        r = run_setting(args.url, pool_size, args)
+        print(
+            f"{r['pool_size']:>9} {r['rps']:>10.1f} {r['wait_avg_ms']:>12.2f} "
+            f"{r['wait_max_ms']:>12.2f} {r['timeouts']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
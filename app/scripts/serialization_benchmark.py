@@ -0,0 +1,136 @@
+"""Serialization benchmark for product listings.
+
+Fills a scratch SQLite database with --rows products and compares the CPU time per
+GET of the full listing through:
+- validated: ORM objects -> _product_to_response -> response_model validation -> json.dumps
+  (how GET /api/products/ worked before the fast JSON path)
+- fast: GET /api/products/ with the response cache off (plain rows -> pydantic-core -> bytes)
+- cached: GET /api/products/ as it is now (cache keys read per row, bodies from the response cache)
+
+All go through the same FastAPI app and TestClient, so the difference is the handler's
+load + serialize work.
+
+Usage:
+    python scripts/serialization_benchmark.py [--rows 10000] [--requests 20]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+import be.models  # noqa: F401 - register all tables
+from be.database import Base, get_db
+from be.models.product import Product
+from be.models.vendor import Vendor
+from be.routers import products
+from be.routers.products import WITH_VENDOR_NAME, _product_to_response
+from be.schemas.product import ProductResponse
+from be.utils.response_cache import response_cache
+from config import get_settings
+
+
+def build_app(url: str) -> FastAPI:
+    """Products router plus the pre-fast-path listing handler, on a scratch database."""
+    engine = create_engine(url)
+    SessionLocal = sessionmaker(bind=engine)
+
+    def _get_db():
+        with SessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(products.router, prefix="/api")
+    app.dependency_overrides[get_db] = _get_db
+
+    @app.get("/validated/products", response_model=List[ProductResponse])
+    def list_products_validated(db: Session = Depends(get_db)) -> List[ProductResponse]:
+        q = db.query(Product).options(WITH_VENDOR_NAME).order_by(Product.created_at.desc(), Product.id.desc())
+        return [_product_to_response(p) for p in q.all()]
+
+    return app
+
+
+def fill(url: str, rows: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        vendor = Vendor(name="Benchmark Vendor", email="bench@example.com")
+        db.add(vendor)
+        db.flush()
+        db.execute(
+            insert(Product),
+            [
+                {
+                    "name": f"Product {i}",
+                    "sku": f"SKU-{i:06d}",
+                    "description": "A reasonably sized product description for the listing benchmark.",
+                    "price": Decimal("19.99") + i,
+                    "vendor_id": vendor.id,
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+    engine.dispose()
+
+
+def measure(client: TestClient, path: str, requests: int) -> dict:
+    """CPU and wall ms per request (after one warm-up request) and the parsed body of the last one."""
+    client.get(path)
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path)
+    return {
+        "cpu_ms": (time.process_time() - cpu_started) / requests * 1000,
+        "wall_ms": (time.perf_counter() - wall_started) / requests * 1000,
+        "bytes": len(response.content),
+        "body": response.json(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="Products in the listing")
+    parser.add_argument("--requests", type=int, default=20, help="Timed requests per path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{tmp}/serialization_benchmark.db"
+        fill(url, args.rows)
+        with TestClient(build_app(url)) as client:
+            validated = measure(client, "/validated/products", args.requests)
+            settings = get_settings()
+            max_entries, settings.RESPONSE_CACHE_MAX_ENTRIES = settings.RESPONSE_CACHE_MAX_ENTRIES, 0
+            fast = measure(client, "/api/products/", args.requests)
+            settings.RESPONSE_CACHE_MAX_ENTRIES = max(max_entries, args.rows)
+            cached = measure(client, "/api/products/", args.requests)
+            settings.RESPONSE_CACHE_MAX_ENTRIES = max_entries
+            response_cache.clear()
+
+    expected = json.dumps(validated["body"], sort_keys=True)
+    same = all(json.dumps(r["body"], sort_keys=True) == expected for r in (fast, cached))
+    print(f"rows={args.rows} requests={args.requests}  identical JSON: {same}")
+    print(f"{'path':>10} {'cpu ms/req':>11} {'wall ms/req':>12} {'bytes':>10}")
+    for name, r in (("validated", validated), ("fast", fast), ("cached", cached)):
+        print(f"{name:>10} {r['cpu_ms']:>11.1f} {r['wall_ms']:>12.1f} {r['bytes']:>10}")
+    print()
+    for name, r in (("fast", fast), ("cached", cached)):
+        saved = validated["cpu_ms"] - r["cpu_ms"]
+        print(f"CPU saved per request ({name}): {saved:.1f} ms ({saved / validated['cpu_ms'] * 100:.0f}%)")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Cold-start benchmark for B2Bmarket backend.
+
+Starts several fresh interpreters and reports, for `main:app`:
+- `python -X importtime` cumulative import time of `main`, plus the slowest modules
+- time-to-first-response: app imported, lifespan (pool warm-up) run, first GET /api/ping/ answered
+
+Exits with status 1 when a median exceeds its budget, so CI catches cold-start regressions.
+
+Usage:
+    python scripts/startup_benchmark.py [--runs 5] [--top 15]
+                                        [--import-budget-ms 2500] [--first-response-budget-ms 4000]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_BUDGET_MS = 2500
+FIRST_RESPONSE_BUDGET_MS = 4000
+
+# Runs in the child interpreter; TestClient's own import time is excluded from the numbers
+CHILD_CODE = """
+import json, time
+t0 = time.perf_counter()
+import main
+t_imported = time.perf_counter()
+from fastapi.testclient import TestClient
+t_client = time.perf_counter()
+with TestClient(main.app) as client:
+    status = client.get("/api/ping/").status_code
+t_done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t_imported - t0) * 1000,
+    "first_response_ms": (t_done - t0 - (t_client - t_imported)) * 1000,
+    "status": status,
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Map module name -> (self_us, cumulative_us) from `-X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_once() -> dict:
+    """Measure one cold start in a fresh interpreter."""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"Startup failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    modules = parse_importtime(proc.stderr)
+    result["importtime_main_ms"] = modules.get("main", (0, 0))[1] / 1000
+    result["process_ms"] = wall_ms
+    result["modules"] = modules
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list (by self time)")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--first-response-budget-ms", type=float, default=FIRST_RESPONSE_BUDGET_MS)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    importtime_ms = statistics.median(r["importtime_main_ms"] for r in runs)
+    first_response_ms = statistics.median(r["first_response_ms"] for r in runs)
+    process_ms = statistics.median(r["process_ms"] for r in runs)
+
+    print(f"runs: {args.runs}")
+    print(f"import main (-X importtime, cumulative): {importtime_ms:8.1f} ms  (budget {args.import_budget_ms:.0f})")
+    print(f"time to first response:                  {first_response_ms:8.1f} ms  (budget {args.first_response_budget_ms:.0f})")
+    print(f"whole process incl. interpreter:         {process_ms:8.1f} ms")
+    print(f"\nslowest modules (self time, last run):")
+    slowest = sorted(runs[-1]["modules"].items(), key=lambda m: m[1][0], reverse=True)[: args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {self_us / 1000:8.1f} ms  (cumulative {cumulative_us / 1000:8.1f} ms)  {name}")
+
+    over_budget = importtime_ms > args.import_budget_ms or first_response_ms > args.first_response_budget_ms
+    if over_budget:
+        print("\n❌ Cold start is over budget")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())